@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+TermTweet Benchmarks - Time the CLI and client against the local mock API server
+
+Usage:
+  python benchmarks/bench.py                          # print results as JSON
+  python benchmarks/bench.py --output bench.json      # save them
+  python benchmarks/bench.py --compare baseline.json  # exit 1 on a regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from termtweet.mockserver import MockAPIServer  # noqa: E402
+
+CREDS = ('a' * 25, 'b' * 50, '1000-benchmark', 'c' * 45, 'bearer')
+CREDENTIAL_KEYS = ('TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN',
+                   'TWITTER_ACCESS_TOKEN_SECRET', 'TWITTER_BEARER_TOKEN')
+
+def summarize(samples, total_seconds=None):
+    """Reduce per-operation timings (seconds) to percentiles in ms and throughput."""
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 3)
+
+    total = total_seconds if total_seconds is not None else sum(samples)
+    return {
+        'n': len(samples),
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p99_ms': percentile(99),
+        'mean_ms': round(statistics.mean(samples) * 1000, 3),
+        'throughput_per_sec': round(len(samples) / total, 2) if total > 0 else None,
+    }
+
+def run_cli(env, *args):
+    """Run the CLI once in a fresh interpreter and return its wall time."""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-m', 'termtweet.cli'] + list(args),
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"termtweet {' '.join(args)} failed:\n{result.stdout}{result.stderr}")
+    return elapsed
+
+def bench_cold_start(env, runs):
+    return summarize([run_cli(env, '--version') for _ in range(runs)])
+
+def bench_validate(drafts):
+    from termtweet.text import validate_many
+
+    texts = [f"Release {i}: faster uploads, see https://example.com/notes/{i} 🎉" for i in range(drafts)]
+    started = time.perf_counter()
+    validate_many(texts)
+    elapsed = time.perf_counter() - started
+    return {'n': drafts, 'throughput_per_sec': round(drafts / elapsed, 2)}
+
+def bench_single_post(env, runs):
+    return summarize([run_cli(env, f"Benchmark post {i}", '--no-daemon') for i in range(runs)])
+
+def bench_image_post(env, runs, directory):
+    samples = []
+    for i in range(runs):
+        # New contents each run, so the media cache never short-circuits the upload
+        image = os.path.join(directory, f'bench-{i}.png')
+        with open(image, 'wb') as f:
+            f.write(os.urandom(200 * 1024))
+        samples.append(run_cli(env, f"Benchmark image {i}", '--image', image, '--no-daemon'))
+    return summarize(samples)
+
+def bench_bulk_post(posts, concurrency):
+    from termtweet.batch import post_batch
+
+    records = [{'text': f"Bulk benchmark {i}", 'images': []} for i in range(posts)]
+    started = time.perf_counter()
+    results = post_batch(records, concurrency, creds=CREDS)
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for result in results if result['error'])
+    if failed:
+        raise RuntimeError(f"{failed} bulk posts failed: {results[0]['error']}")
+    return summarize([result['seconds'] for result in results], elapsed)
+
+def compare(results, baseline, tolerance):
+    """Return a list of metrics that got worse than the baseline by more than tolerance."""
+    regressions = []
+    for name, current in results['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p90_ms'):
+            if metric in current and metric in previous and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {previous[metric]} -> {current[metric]}")
+        metric = 'throughput_per_sec'
+        if current.get(metric) and previous.get(metric) and current[metric] < previous[metric] * (1 - tolerance):
+            regressions.append(f"{name}.{metric}: {previous[metric]} -> {current[metric]}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TermTweet against a local mock API")
+    parser.add_argument('--runs', type=int, default=10, help='CLI runs per scenario (default: 10)')
+    parser.add_argument('--posts', type=int, default=200, help='Posts in the bulk scenario (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Bulk posting concurrency (default: 8)')
+    parser.add_argument('--drafts', type=int, default=100_000, help='Drafts in the validation scenario')
+    parser.add_argument('--latency', type=float, default=0.02, help='Mock API latency in seconds (default: 0.02)')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before --compare fails (default: 0.25)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home, MockAPIServer(latency=args.latency) as server:
+        # Everything, including the in-process scenarios, talks to the mock server
+        os.environ.update({'TERMTWEET_HOME': home, 'TERMTWEET_API_BASE': server.url})
+        env = dict(os.environ, **dict(zip(CREDENTIAL_KEYS, CREDS)))
+
+        results = {
+            'cold_start': bench_cold_start(env, args.runs),
+            'validate': bench_validate(args.drafts),
+            'single_post': bench_single_post(env, args.runs),
+            'image_post': bench_image_post(env, args.runs, home),
+            'bulk_post': bench_bulk_post(args.posts, args.concurrency),
+        }
+        requests_served = dict(server.requests)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'runs': args.runs, 'posts': args.posts, 'concurrency': args.concurrency,
+                   'drafts': args.drafts, 'latency_ms': args.latency * 1000},
+        'results': results,
+        'requests': requests_served,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -4,4 +4,11 @@ TermTweet - Tweet from your terminal
 
 __version__ = "1.0.0"
 __author__ = "TermTweet"
-__description__ = "A simple CLI tool to tweet from your terminal"
\ No newline at end of file
+__description__ = "A simple CLI tool to tweet from your terminal"
+
+def __getattr__(name):
+    """Expose TermTweetClient without importing tweepy on 'import termtweet'."""
+    if name == 'TermTweetClient':
+        from termtweet.client import TermTweetClient
+        return TermTweetClient
+    raise AttributeError(f"module 'termtweet' has no attribute '{name}'")
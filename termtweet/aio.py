@@ -0,0 +1,255 @@
+"""
+TermTweet Async - asyncio counterparts of tweet, post_tweet and upload_media
+"""
+
+import asyncio
+import os
+from urllib.parse import urlencode
+
+try:
+    import aiohttp
+    from oauthlib.oauth1 import Client as OAuthClient
+    from tweepy.asynchronous import AsyncClient
+except ImportError:
+    raise ImportError("termtweet.aio requires aiohttp and async-lru. "
+                      "Install them with: pip install 'termtweet[async]'")
+
+from termtweet import metrics
+from termtweet.client import TweetResult
+from termtweet.core import load_credentials, media_paths, media_type
+from termtweet.ratelimit import RateLimitExceeded, MAX_WAIT, account_key, endpoint_key, record_many, try_acquire
+from termtweet.text import MAX_TWEET_LENGTH, weighted_length
+from termtweet.upload import (CHUNK_SIZE, DEFAULT_WORKERS, PROCESSING_TIMEOUT, UploadError, category_for,
+                              check_delay, chunk_size_for, needs_chunked_upload, processing, processing_error)
+
+UPLOAD_URL = 'https://upload.twitter.com/1.1/media/upload.json'
+DEFAULT_CONCURRENCY = 50
+
+class _Recorder:
+    """Write responses to the shared rate-limit state off the event loop, a batch per write.
+
+    Responses that arrive while a write is running are saved together in the next one.
+    """
+
+    def __init__(self, account):
+        self.account = account
+        self._pending = []
+        self._writing = None
+
+    async def add(self, endpoint, status, headers):
+        self._pending.append((endpoint, status, headers))
+        if self._writing is None:
+            self._writing = asyncio.ensure_future(self._write())
+        # Shielded so a cancelled request does not abandon other requests' responses
+        await asyncio.shield(self._writing)
+
+    async def _write(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                await loop.run_in_executor(None, record_many, self.account, batch)
+        finally:
+            self._writing = None
+
+def _rate_limit_hooks(account):
+    """Build aiohttp trace hooks that route every request through the shared rate limiter.
+
+    The limiter's file lock and JSON state are handled in the default executor,
+    so waiting for another process never blocks the event loop.
+    """
+    recorder = _Recorder(account)
+
+    async def on_request_start(session, context, params):
+        endpoint = endpoint_key(params.method, str(params.url))
+        loop = asyncio.get_running_loop()
+        while True:
+            wait = await loop.run_in_executor(None, try_acquire, account, endpoint)
+            if wait <= 0:
+                metrics.IN_FLIGHT.inc()
+                return
+            if wait > MAX_WAIT:
+                raise RateLimitExceeded(endpoint, wait)
+            await asyncio.sleep(wait)
+
+    async def on_request_end(session, context, params):
+        metrics.IN_FLIGHT.dec()
+        endpoint = endpoint_key(params.method, str(params.url))
+        await recorder.add(endpoint, params.response.status, params.response.headers)
+
+    async def on_request_exception(session, context, params):
+        metrics.IN_FLIGHT.dec()
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
+
+def create_session(access_token=None, concurrency=DEFAULT_CONCURRENCY):
+    """Create a pooled aiohttp session for one account. Call from inside a running event loop."""
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    return aiohttp.ClientSession(connector=connector, trace_configs=[_rate_limit_hooks(account_key(access_token))])
+
+def authenticate_twitter(api_key, api_secret, access_token, access_token_secret, bearer_token, session=None):
+    """Build a tweepy AsyncClient, optionally sharing an existing aiohttp session."""
+    client = AsyncClient(
+        consumer_key=api_key,
+        consumer_secret=api_secret,
+        access_token=access_token,
+        access_token_secret=access_token_secret,
+        bearer_token=bearer_token
+    )
+    client.session = session
+    return client
+
+async def _upload_request(session, oauth, method, fields=None, media=None):
+    """Send one signed request to the v1.1 media upload endpoint and return its JSON."""
+    fields = {key: str(value) for key, value in (fields or {}).items()}
+    if media is not None:
+        # Multipart bodies are not part of the OAuth 1.0a signature
+        _, headers, _ = oauth.sign(UPLOAD_URL, 'POST')
+        data = aiohttp.FormData(fields)
+        data.add_field('media', media[1], filename=media[0])
+        request = session.post(UPLOAD_URL, data=data, headers=headers)
+    elif method == 'GET':
+        url, headers, _ = oauth.sign(f"{UPLOAD_URL}?{urlencode(sorted(fields.items()))}", 'GET')
+        request = session.get(url, headers=headers)
+    else:
+        body = urlencode(fields)
+        _, headers, body = oauth.sign(UPLOAD_URL, 'POST', body=body,
+                                      headers={'Content-Type': 'application/x-www-form-urlencoded'})
+        request = session.post(UPLOAD_URL, data=body, headers=headers)
+
+    async with request as response:
+        if not 200 <= response.status < 300:
+            raise UploadError(f"{response.status} {await response.text()}")
+        return await response.json() if response.content_length != 0 else {}
+
+def _read(path, offset=0, size=-1):
+    """Read size bytes of a file from offset (all of the rest by default)."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return f.read(size)
+
+async def _chunked_upload(session, oauth, image_path, workers=DEFAULT_WORKERS):
+    """Upload with INIT/APPEND/FINALIZE, sending several segments at once."""
+    total = os.path.getsize(image_path)
+    size = chunk_size_for(total, CHUNK_SIZE)
+    init = await _upload_request(session, oauth, 'POST', {
+        'command': 'INIT', 'total_bytes': total, 'media_type': media_type(image_path),
+        'media_category': category_for(image_path)})
+    media_id = init['media_id_string']
+    name = os.path.basename(image_path)
+    limit = asyncio.Semaphore(workers)
+    loop = asyncio.get_running_loop()
+
+    async def append(index):
+        async with limit:
+            # Disk reads run in the default executor so they never stall the event loop
+            data = await loop.run_in_executor(None, _read, image_path, index * size, size)
+            await _upload_request(session, oauth, 'POST', {
+                'command': 'APPEND', 'media_id': media_id, 'segment_index': index}, media=(name, data))
+
+    await asyncio.gather(*(append(index) for index in range(-(-total // size))))
+    media = await _upload_request(session, oauth, 'POST', {'command': 'FINALIZE', 'media_id': media_id})
+
+    info = media.get('processing_info')
+    deadline = asyncio.get_running_loop().time() + PROCESSING_TIMEOUT
+    checks = 0
+    while processing(info):
+        delay = check_delay(info, checks)
+        if asyncio.get_running_loop().time() + delay > deadline:
+            raise UploadError(f"Media still processing after {PROCESSING_TIMEOUT}s")
+        await asyncio.sleep(delay)
+        checks += 1
+        media = await _upload_request(session, oauth, 'GET', {'command': 'STATUS', 'media_id': media_id})
+        info = media.get('processing_info')
+    if processing_error(info):
+        raise UploadError(processing_error(info))
+    return media_id
+
+async def upload_media(session, api_key, api_secret, access_token, access_token_secret, image_path):
+    """Upload a media file and return its media ID, or None on failure."""
+    oauth = OAuthClient(api_key, api_secret, access_token, access_token_secret)
+    try:
+        with metrics.UPLOAD_SECONDS.time():
+            if needs_chunked_upload(image_path):
+                media_id = await _chunked_upload(session, oauth, image_path)
+            else:
+                data = await asyncio.get_running_loop().run_in_executor(None, _read, image_path)
+                media = await _upload_request(session, oauth, 'POST', media=(os.path.basename(image_path), data))
+                media_id = media['media_id_string']
+    except Exception as e:
+        metrics.UPLOADS.inc(result='failed')
+        metrics.failure('upload', e)
+        return None
+    metrics.UPLOADS.inc(result='ok')
+    return media_id
+
+async def post_tweet(client, text, media_ids=None, in_reply_to=None):
+    """Post a tweet with an AsyncClient and return its ID, or None on failure."""
+    if weighted_length(text) > MAX_TWEET_LENGTH:
+        metrics.POSTS.inc(result='failed')
+        metrics.failure('post', 'invalid')
+        return None
+    params = {'text': text}
+    if media_ids:
+        params['media_ids'] = list(media_ids)
+    if in_reply_to:
+        params['in_reply_to_tweet_id'] = in_reply_to
+    try:
+        with metrics.POST_SECONDS.time():
+            response = await client.create_tweet(**params)
+    except Exception as e:
+        metrics.POSTS.inc(result='failed')
+        metrics.failure('post', e)
+        return None
+    metrics.POSTS.inc(result='ok')
+    return response.data['id']
+
+async def _tweet(client, session, creds, text, image_paths):
+    """Upload attachments concurrently, then post; shared by tweet() and tweet_many()."""
+    paths = media_paths(image_paths)
+    media_ids = await asyncio.gather(*(upload_media(session, *creds[:4], path) for path in paths))
+    for path, media_id in zip(paths, media_ids):
+        if not media_id:
+            return TweetResult(text, error=f"Failed to upload {path}")
+    tweet_id = await post_tweet(client, text, media_ids)
+    if not tweet_id:
+        return TweetResult(text, media_ids=list(media_ids), error="Failed to post tweet.")
+    return TweetResult(text, tweet_id=tweet_id, media_ids=list(media_ids))
+
+async def tweet(text, image_path=None, creds=None, session=None):
+    """Post one tweet with optional attachments and return a TweetResult."""
+    creds = creds or load_credentials()
+    if not creds:
+        return TweetResult(text, error="No credentials found. Run 'termtweet --setup' to configure.")
+    owns_session = session is None
+    session = session or create_session(creds[2])
+    try:
+        client = authenticate_twitter(*creds, session=session)
+        return await _tweet(client, session, creds, text, image_path)
+    finally:
+        if owns_session:
+            await session.close()
+
+async def tweet_many(drafts, concurrency=DEFAULT_CONCURRENCY, creds=None):
+    """Post many (text, image_paths) drafts on one session with at most `concurrency` in flight.
+
+    Returns TweetResults in input order.
+    """
+    creds = creds or load_credentials()
+    if not creds:
+        error = "No credentials found. Run 'termtweet --setup' to configure."
+        return [TweetResult(text, error=error) for text, _ in drafts]
+
+    limit = asyncio.Semaphore(concurrency)
+    async with create_session(creds[2], concurrency) as session:
+        client = authenticate_twitter(*creds, session=session)
+
+        async def post_one(text, image_paths):
+            async with limit:
+                return await _tweet(client, session, creds, text, image_paths)
+
+        return await asyncio.gather(*(post_one(text, images) for text, images in drafts))
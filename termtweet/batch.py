@@ -0,0 +1,156 @@
+"""
+TermTweet Batch - Post many tweets from a JSONL or CSV file
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from termtweet.core import media_paths, validate_media
+from termtweet.dedupe import allowed, normalize
+from termtweet.text import validate_many
+
+DEFAULT_CONCURRENCY = 4
+
+def make_record(data, base_dir):
+    """Normalize a raw row into a {text, images} record.
+
+    A row whose fields have the wrong type gets an 'error' instead of raising,
+    so it is reported with the other invalid records.
+    """
+    text = data.get('text') or ''
+    images = data.get('images') or data.get('image')
+    if not isinstance(text, str):
+        return {'text': '', 'images': [], 'error': "'text' must be a string."}
+    if not isinstance(images, (str, list, type(None))) or (
+            isinstance(images, list) and not all(isinstance(image, str) for image in images)):
+        return {'text': text.strip(), 'images': [], 'error': "'image' must be a path or a list of paths."}
+    # Relative image paths are resolved against the batch file's directory
+    images = [os.path.join(base_dir, image.strip()) for image in media_paths(images) if image.strip()]
+    return {'text': text.strip(), 'images': images}
+
+def read_rows(path):
+    """Yield the raw rows of a JSONL or CSV file as dicts, one at a time."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            yield from csv.DictReader(f)
+            return
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Line {line_no}: invalid JSON ({e})")
+            if not isinstance(data, dict):
+                raise ValueError(f"Line {line_no}: expected an object with 'text' and 'image'")
+            yield data
+
+def load_records(path):
+    """Load {text, images} records from a JSONL or CSV file.
+
+    JSONL rows may give "image" as a path or a list of paths; CSV rows take one
+    "image" column.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return [make_record(row, base_dir) for row in read_rows(path)]
+
+def validate_records(records, allow_duplicates=False):
+    """Validate all records up front and return a list of (index, error) pairs."""
+    problems = [(index, error) for index, error in validate_many(record['text'] for record in records)
+                if 'error' not in records[index - 1]]
+    first_seen = {}
+    for index, record in enumerate(records, 1):
+        if 'error' in record:
+            problems.append((index, record['error']))
+            continue
+        if record['images']:
+            problems.extend((index, error) for error in validate_media(record['images']))
+        if not allow_duplicates and record['text']:
+            first = first_seen.setdefault(normalize(record['text']), index)
+            if first != index:
+                problems.append((index, f"Same text as record {first}; the second post would be rejected."))
+    return sorted(problems, key=lambda problem: problem[0])
+
+def post_batch(records, concurrency=DEFAULT_CONCURRENCY, creds=None):
+    """Post records through a bounded worker pool sharing one authenticated client.
+
+    Returns a list of result dicts (index, text, tweet_id, error, seconds) in input order,
+    or None if no credentials are configured.
+    """
+    # Imported here so that validating a batch (--dry-run) never loads tweepy
+    from termtweet.client import TermTweetClient
+
+    client = TermTweetClient.from_credentials(creds, pool_size=max(1, concurrency))
+    if not client:
+        return None
+
+    def worker(index, record):
+        started = time.perf_counter()
+        posted = client.tweet(record['text'], record['images'])
+        return {
+            'index': index,
+            'text': record['text'],
+            'tweet_id': posted.tweet_id,
+            'error': posted.error,
+            'seconds': time.perf_counter() - started,
+        }
+
+    with client, ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(worker, index, record) for index, record in enumerate(records, 1)]
+        return [future.result() for future in futures]
+
+def run_batch(path, concurrency=DEFAULT_CONCURRENCY, dry_run=False, optimize=False):
+    """Load, validate and post a batch file, printing a per-record summary.
+
+    With optimize, every image in the file is shrunk up front, spread over all CPU cores.
+    """
+    try:
+        records = load_records(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read batch file '{path}': {e}")
+        return False
+
+    if not records:
+        print(f"❌ Batch file '{path}' contains no posts.")
+        return False
+
+    print(f"📦 Loaded {len(records)} posts from {path}")
+    if optimize:
+        from termtweet.imaging import optimize_for_cli
+        images = [image for record in records for image in record['images']]
+        optimized = iter(optimize_for_cli(images))
+        for record in records:
+            record['images'] = [next(optimized) for _ in record['images']]
+    problems = validate_records(records, allow_duplicates=allowed())
+    if problems:
+        for index, error in problems:
+            print(f"❌ [{index}] {error}")
+        print("Batch validation failed. Nothing was posted.")
+        return False
+
+    if dry_run:
+        print("[DRY RUN] All posts are valid. Use without --dry-run to actually post.")
+        return True
+
+    started = time.perf_counter()
+    results = post_batch(records, concurrency)
+    if results is None:
+        print("❌ No credentials found. Run 'termtweet --setup' to configure.")
+        return False
+    elapsed = time.perf_counter() - started
+
+    posted = 0
+    for result in results:
+        if result['error']:
+            print(f"❌ [{result['index']}] {result['error']} ({result['seconds']:.2f}s)")
+        else:
+            posted += 1
+            print(f"✅ [{result['index']}] {result['tweet_id']} ({result['seconds']:.2f}s)")
+
+    rate = posted / elapsed if elapsed > 0 else 0.0
+    print(f"Posted {posted}/{len(results)} in {elapsed:.1f}s ({rate:.1f} posts/sec, concurrency {concurrency})")
+    return posted == len(results)
@@ -5,13 +5,15 @@ TermTweet CLI - Command Line Interface for tweeting from terminal
 
 import os
 import sys
+import time
 import argparse
 from pathlib import Path
 
 # Add parent directory to path so we can import termtweet modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from termtweet.core import tweet, setup_credentials, test_credentials
+# Core functions are imported inside main() so that --help and --version never
+# load more than argparse, and only posting paths pull in tweepy.
 
 def create_parser():
     """Create argument parser for CLI."""
@@ -22,6 +24,24 @@ def create_parser():
 Examples:
   termtweet "Hello from terminal! #coding"
   termtweet "Check this out!" --image screenshot.png
+  termtweet "Release 2.0" --image before.png --image after.png
+  termtweet "New dashboard" --image huge-screenshot.png --optimize
+  termtweet --batch posts.jsonl --concurrency 8
+  tail -F deploys.log | termtweet --stdin
+  termtweet --thread --file CHANGELOG.md
+  termtweet --thread --file launch.md --image hero.png --image 3:chart.png
+  termtweet "Deployed v2.1" --enqueue
+  termtweet "Launch day!" --at 2026-10-20T09:00Z
+  termtweet --schedule campaign.jsonl
+  termtweet --scheduler --follow
+  termtweet --export posts.jsonl
+  termtweet --delete ids.txt
+  termtweet --delete-matching "test post" --delete-after 2026-10-01 --dry-run
+  termtweet --worker --follow
+  termtweet --worker --follow --metrics 9464
+  termtweet --daemon
+  termtweet --setup --profile brand
+  termtweet "Release 2.0 is out" --all-profiles
   termtweet --setup
   termtweet --test
         """
@@ -36,7 +56,142 @@ Examples:
     parser.add_argument(
         '--image', '-i',
         type=str,
-        help='Path to image file to attach'
+        action='append',
+        help='Path to an image, GIF or video to attach (repeat for up to 4 images; '
+             'with --thread, N:path attaches it to tweet N)'
+    )
+
+    parser.add_argument(
+        '--optimize', '-o',
+        action='store_true',
+        help='Resize, re-encode and strip metadata from images before upload (needs Pillow)'
+    )
+
+    parser.add_argument(
+        '--thread',
+        action='store_true',
+        help='Split long text into a numbered thread of replies'
+    )
+
+    parser.add_argument(
+        '--file', '-f',
+        metavar='PATH',
+        help="Read the tweet text from a file ('-' for stdin)"
+    )
+
+    parser.add_argument(
+        '--batch', '-b',
+        metavar='FILE',
+        help='Post every {text, image} record in a JSONL or CSV file'
+    )
+
+    parser.add_argument(
+        '--stdin',
+        action='store_true',
+        help='Post each line (text or a JSON record) read from stdin as it arrives'
+    )
+
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=4,
+        help='Number of posts (or deletes) in flight at once in batch, stdin and delete mode (default: 4)'
+    )
+
+    parser.add_argument(
+        '--export',
+        metavar='FILE',
+        help="Append your account's posts and metrics to a JSONL file (only new posts after the first run)"
+    )
+
+    parser.add_argument(
+        '--delete',
+        metavar='FILE',
+        help="Delete the posts whose IDs are listed in FILE ('-' for stdin; an --export file works too)"
+    )
+
+    parser.add_argument(
+        '--delete-matching',
+        metavar='TEXT',
+        help='Delete your posts whose text contains TEXT (case-insensitive)'
+    )
+
+    parser.add_argument(
+        '--delete-before',
+        metavar='DATE',
+        help='Delete your posts published before DATE (ISO 8601)'
+    )
+
+    parser.add_argument(
+        '--delete-after',
+        metavar='DATE',
+        help='Delete your posts published after DATE (ISO 8601)'
+    )
+
+    parser.add_argument(
+        '--enqueue', '-q',
+        action='store_true',
+        help='Add the tweet to the local outbox instead of posting it now'
+    )
+
+    parser.add_argument(
+        '--at',
+        metavar='TIME',
+        help="Schedule the tweet for TIME (ISO 8601 like 2026-10-20T09:00Z, or relative like +30m)"
+    )
+
+    parser.add_argument(
+        '--schedule',
+        metavar='FILE',
+        help='Schedule every {text, image, at} record in a JSONL or CSV file'
+    )
+
+    parser.add_argument(
+        '--scheduler',
+        action='store_true',
+        help='Post scheduled tweets as they fall due'
+    )
+
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help='Post everything in the local outbox, in order'
+    )
+
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='With --worker or --scheduler, keep running and post new items as they are queued'
+    )
+
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run a background daemon that keeps an authenticated client warm'
+    )
+
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Post in this process even if a daemon is running'
+    )
+
+    parser.add_argument(
+        '--allow-duplicate',
+        action='store_true',
+        help='Post even if this account posted the same text in the last 24 hours'
+    )
+
+    parser.add_argument(
+        '--profile', '-p',
+        metavar='NAME',
+        help='Use the credentials of a named profile (default: $TERMTWEET_PROFILE or "default")'
+    )
+
+    parser.add_argument(
+        '--all-profiles',
+        action='store_true',
+        help='Post the tweet from every configured profile at once'
     )
 
     parser.add_argument(
@@ -48,7 +203,13 @@ Examples:
     parser.add_argument(
         '--test', '-t',
         action='store_true',
-        help='Test if credentials are configured correctly'
+        help='Check the credentials with the API (a successful check is reused for 24 hours)'
+    )
+
+    parser.add_argument(
+        '--recheck',
+        action='store_true',
+        help='With --test, ask the API again instead of reusing the last successful check'
     )
 
     parser.add_argument(
@@ -57,6 +218,21 @@ Examples:
         help='Validate tweet without actually posting (safe testing)'
     )
 
+    parser.add_argument(
+        '--trace',
+        nargs='?',
+        const='-',
+        metavar='FILE',
+        help='Write per-phase timing spans as JSON lines to FILE (default: stderr)'
+    )
+
+    parser.add_argument(
+        '--metrics',
+        metavar='TARGET',
+        help='Expose Prometheus metrics: a port or host:port serves /metrics, '
+             'anything else is a textfile path (default: $TERMTWEET_METRICS)'
+    )
+
     parser.add_argument(
         '--version', '-v',
         action='version',
@@ -67,11 +243,49 @@ Examples:
 
 def main():
     """Main CLI entry point."""
+    started = time.perf_counter()
     parser = create_parser()
     args = parser.parse_args()
 
+    if args.trace:
+        # Also picked up by a daemon or worker started from this command
+        os.environ['TERMTWEET_TRACE'] = args.trace
+    from termtweet import trace
+    if args.trace:
+        trace.configure(args.trace)
+    metrics_target = args.metrics or os.environ.get('TERMTWEET_METRICS')
+    if metrics_target:
+        from termtweet import metrics
+        try:
+            metrics.configure(metrics_target)
+        except OSError as e:
+            print(f"❌ Could not expose metrics at {metrics_target}: {e}")
+            sys.exit(1)
+    if os.environ.get('TERMTWEET_API_BASE'):
+        from termtweet.ratelimit import api_base
+        try:
+            api_base()
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    with trace.span('cli', argv=sys.argv[1:]) as span:
+        span.set(startup_ms=round((time.perf_counter() - started) * 1000, 3))
+        _run(parser, args)
+
+def _run(parser, args):
+    """Dispatch to the mode selected on the command line."""
+    # Select the profile for everything below, including the daemon and worker
+    if args.profile:
+        if not args.profile.replace('-', '').replace('_', '').isalnum():
+            print("❌ Profile names may only contain letters, digits, '-' and '_'.")
+            sys.exit(1)
+        os.environ['TERMTWEET_PROFILE'] = args.profile
+    if args.allow_duplicate:
+        os.environ['TERMTWEET_ALLOW_DUPLICATES'] = '1'
+
     # Handle setup mode
     if args.setup:
+        from termtweet.core import setup_credentials
         print("=== TermTweet Setup ===")
         success = setup_credentials()
         if success:
@@ -84,8 +298,9 @@ def main():
 
     # Handle test mode
     if args.test:
+        from termtweet.core import test_credentials
         print("Testing TermTweet configuration...")
-        success = test_credentials()
+        success = test_credentials(refresh=args.recheck)
         if success:
             print("TermTweet is properly configured!")
         else:
@@ -94,37 +309,172 @@ def main():
             sys.exit(1)
         return
 
+    # Handle daemon mode
+    if args.daemon:
+        from termtweet.daemon import serve
+        if not serve():
+            sys.exit(1)
+        return
+
+    # Handle outbox worker mode
+    if args.worker:
+        from termtweet.outbox import run_worker
+        if not run_worker(follow=args.follow):
+            sys.exit(1)
+        return
+
+    # Handle scheduler mode
+    if args.scheduler:
+        from termtweet.scheduler import run_scheduler
+        if not run_scheduler(follow=args.follow):
+            sys.exit(1)
+        return
+
+    # Handle timeline export
+    if args.export:
+        from termtweet.export import run_export
+        if not run_export(args.export):
+            sys.exit(1)
+        return
+
+    deleting = args.delete or args.delete_matching or args.delete_before or args.delete_after
+    if (args.batch or args.stdin or deleting) and args.concurrency < 1:
+        print("❌ --concurrency must be at least 1.")
+        sys.exit(1)
+
+    # Handle bulk delete
+    if deleting:
+        from termtweet.delete import run_delete
+        from termtweet.scheduler import parse_time
+        if args.delete and (args.delete_matching or args.delete_before or args.delete_after):
+            print("❌ Use either --delete FILE or the --delete-* filters, not both.")
+            sys.exit(1)
+        try:
+            before = parse_time(args.delete_before) if args.delete_before else None
+            after = parse_time(args.delete_after) if args.delete_after else None
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        if not run_delete(args.delete, before, after, args.delete_matching,
+                          concurrency=args.concurrency, dry_run=args.dry_run):
+            sys.exit(1)
+        return
+
+    # Handle batch mode
+    if args.batch:
+        from termtweet.batch import run_batch
+        if not run_batch(args.batch, args.concurrency, dry_run=args.dry_run, optimize=args.optimize):
+            sys.exit(1)
+        return
+
+    # Handle schedule files
+    if args.schedule:
+        from termtweet.scheduler import schedule_file
+        if not schedule_file(args.schedule, dry_run=args.dry_run):
+            sys.exit(1)
+        return
+
+    # Handle streaming mode
+    if args.stdin:
+        from termtweet.stream import run_stream
+        if not run_stream(concurrency=args.concurrency, dry_run=args.dry_run):
+            sys.exit(1)
+        return
+
     # Handle tweet mode
+    if args.file:
+        try:
+            if args.file == '-':
+                args.text = sys.stdin.read()
+            else:
+                with open(args.file, encoding='utf-8') as f:
+                    args.text = f.read()
+        except OSError as e:
+            print(f"❌ Could not read '{args.file}': {e}")
+            sys.exit(1)
+
     if not args.text:
         parser.print_help()
         return
 
-    # Validate tweet length
-    if len(args.text) > 280:
-        print(f"❌ Tweet text is {len(args.text)} characters long. Maximum is 280 characters.")
+    if args.at and (args.thread or args.all_profiles):
+        print("❌ --at cannot be combined with --thread or --all-profiles.")
         sys.exit(1)
 
-    # Validate image if provided
-    if args.image:
-        if not os.path.exists(args.image):
-            print(f"❌ Image file '{args.image}' not found.")
-            sys.exit(1)
-        # Check file size (Twitter limit is 5MB)
-        file_size = os.path.getsize(args.image)
-        if file_size > 5 * 1024 * 1024:  # 5MB
-            print(f"❌ Image file is too large ({file_size / (1024*1024):.1f}MB). Maximum is 5MB.")
+    # Handle thread mode
+    if args.thread:
+        from termtweet.thread import run_thread
+        if not run_thread(args.text, args.image, dry_run=args.dry_run, optimize=args.optimize):
             sys.exit(1)
+        return
+
+    # Shrink images before they are validated against the size limits
+    if args.optimize and args.image:
+        from termtweet.imaging import optimize_for_cli
+        args.image = optimize_for_cli(args.image)
+
+    # Validate tweet text and image
+    from termtweet.core import validate_tweet
+    from termtweet.text import MAX_TWEET_LENGTH, weighted_length
+    errors = validate_tweet(args.text, args.image)
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        if weighted_length(args.text) > MAX_TWEET_LENGTH:
+            print("Use --thread to post long text as a numbered thread.")
+        sys.exit(1)
 
     # Handle dry run
     if args.dry_run:
         print("[DRY RUN] Validating tweet without posting...")
-        print("Tweet text ({} chars): {}".format(len(args.text), args.text))
-        if args.image:
-            print("Image: {}".format(args.image))
+        print("Tweet text ({} chars): {}".format(weighted_length(args.text), args.text))
+        for image in args.image or []:
+            print("Image: {}".format(image))
         print("Validation successful! Use without --dry-run to actually post.")
         return
 
+    # Post from every profile concurrently
+    if args.all_profiles and not args.enqueue:
+        from termtweet.profiles import run_fanout
+        if not run_fanout(args.text, args.image):
+            sys.exit(1)
+        return
+
+    # Schedule the tweet for later
+    if args.at:
+        from termtweet.scheduler import schedule_post
+        if not schedule_post(args.text, args.image, args.at):
+            sys.exit(1)
+        return
+
+    # Queue the tweet for the outbox worker
+    if args.enqueue:
+        from termtweet.outbox import Outbox
+        from termtweet.profiles import list_profiles
+        profiles = list_profiles() if args.all_profiles else [None]
+        if not profiles:
+            print("❌ No profiles found. Run 'termtweet --setup --profile NAME' to add one.")
+            sys.exit(1)
+        with Outbox() as outbox:
+            item_ids = [outbox.enqueue(args.text, args.image, profile) for profile in profiles]
+        queued = ', '.join(f"#{item_id}" for item_id in item_ids)
+        print(f"📥 Queued as {queued}. Run 'termtweet --worker' to post.")
+        return
+
+    # Hand the tweet to a running daemon, falling back to posting in-process
+    if not args.no_daemon:
+        from termtweet.daemon import forward_tweet
+        reply = forward_tweet(args.text, args.image, allow_duplicate=args.allow_duplicate)
+        if reply is not None:
+            if reply['ok']:
+                print("Tweet posted successfully!")
+                return
+            print(f"❌ {reply['error']}")
+            print("Failed to post tweet.")
+            sys.exit(1)
+
     # Post the tweet
+    from termtweet.core import tweet
     success = tweet(args.text, args.image)
     if success:
         print("Tweet posted successfully!")
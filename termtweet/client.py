@@ -0,0 +1,334 @@
+"""
+TermTweet Client - Reusable authenticated client with a shared connection pool
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from requests.adapters import HTTPAdapter
+import tweepy
+
+from termtweet import metrics, trace
+from termtweet.core import load_credentials, media_paths
+from termtweet.dedupe import DUPLICATE_ERROR, DedupeIndex, allowed
+from termtweet.mediacache import MediaCache
+from termtweet.ratelimit import RateLimitedSession, account_key
+from termtweet.retry import FATAL, CircuitBreaker, RetryPolicy, classify, status_code
+from termtweet.text import MAX_TWEET_LENGTH, weighted_length
+from termtweet.upload import needs_chunked_upload, upload_chunks, wait_for_processing
+from termtweet.verify import rejected, rejects_credentials, store
+
+DEFAULT_POOL_SIZE = 10
+TIMELINE_PAGE_SIZE = 100
+TWEET_FIELDS = ('created_at', 'public_metrics', 'conversation_id', 'in_reply_to_user_id', 'lang')
+
+@dataclass
+class MediaResult:
+    """Outcome of a single media upload."""
+    path: str
+    media_id: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+    # Error class of a failure, as counted in termtweet_failures_total
+    kind: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.media_id is not None
+
+@dataclass
+class TweetResult:
+    """Outcome of posting a single tweet."""
+    text: str
+    tweet_id: Optional[str] = None
+    media_ids: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    # Error class of a failure: retry.TRANSIENT, RATE_LIMITED or FATAL, 'duplicate', 'invalid' or 'processing'
+    kind: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.tweet_id is not None
+
+def _post_failed(error):
+    """Count a post that failed, by error class (an exception or a kind string)."""
+    metrics.POSTS.inc(result='failed')
+    metrics.failure('post', error)
+
+class _SharedSession(RateLimitedSession):
+    """Session that stays open when tweepy.API closes it after every request."""
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        super().close()
+
+class TermTweetClient:
+    """Authenticate once and post through one pooled, keep-alive HTTP session.
+
+    The v2 client used for posting and the v1.1 API used for media uploads share
+    the same session, so repeated calls reuse open TCP/TLS connections. Every
+    request goes through the host-wide rate limiter. Files uploaded earlier are
+    looked up in the media cache and not sent again while their ID is still live,
+    and text the account already posted is refused without an API call. Server
+    errors are retried with backoff, and one circuit breaker per client stops
+    every caller once the API keeps failing. Credentials that 'termtweet --test'
+    (or an earlier 401) found bad make every post fail at once.
+    """
+
+    def __init__(self, api_key, api_secret, access_token, access_token_secret, bearer_token,
+                 pool_size=DEFAULT_POOL_SIZE, media_cache=True, dedupe=True, retry=None):
+        self.account = account_key(access_token)
+        self._creds = (api_key, api_secret, access_token, access_token_secret, bearer_token)
+        self.rejected = rejected(self._creds)
+        self.retry = retry or RetryPolicy(breaker=CircuitBreaker())
+        self.media_cache = MediaCache() if media_cache else None
+        self.dedupe = DedupeIndex() if dedupe else None
+        self.session = _SharedSession(self.account)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+
+        self.client = tweepy.Client(
+            consumer_key=api_key,
+            consumer_secret=api_secret,
+            access_token=access_token,
+            access_token_secret=access_token_secret,
+            bearer_token=bearer_token
+        )
+        self.client.session = self.session
+
+        auth = tweepy.OAuth1UserHandler(api_key, api_secret, access_token, access_token_secret)
+        self.api = tweepy.API(auth)
+        self.api.session = self.session
+
+    @classmethod
+    def from_credentials(cls, creds=None, **kwargs):
+        """Build a client from explicit or configured credentials, or return None."""
+        creds = creds or load_credentials()
+        if not creds:
+            return None
+        return cls(*creds, **kwargs)
+
+    def upload_media(self, path):
+        """Upload a media file and return a MediaResult once it is ready to attach.
+
+        GIFs, videos and larger images use the chunked, resumable upload path.
+        A file whose contents were uploaded recently reuses the earlier media ID.
+        """
+        return self._await_processing([self._send_media(path)])[0]
+
+    def _send_media(self, path):
+        """Upload a media file and return (MediaResult, processing_info) without waiting for processing."""
+        with trace.span('upload_media', path=str(path)) as span:
+            try:
+                if self.media_cache is not None:
+                    media_id = self.media_cache.get(self.account, path)
+                    if media_id:
+                        span.set(cached=True)
+                        metrics.UPLOADS.inc(result='cached')
+                        return MediaResult(path, media_id=media_id, cached=True), None
+                span.set(bytes=os.path.getsize(path))
+                info, expires_after = None, None
+                with metrics.UPLOAD_SECONDS.time():
+                    if needs_chunked_upload(path):
+                        media_id, info = upload_chunks(self.api, path, retry=self.retry)
+                    else:
+                        media = self.retry.call(self.api.media_upload, path)
+                        media_id, expires_after = media.media_id_string, getattr(media, 'expires_after_secs', None)
+                if info is None:
+                    self._uploaded(path, media_id, expires_after)
+                return MediaResult(path, media_id=media_id), info
+            except Exception as e:
+                span.error(e)
+                metrics.UPLOADS.inc(result='failed')
+                metrics.failure('upload', e)
+                self._check_rejected(e)
+                return MediaResult(path, error=f"Failed to upload {path}: {e}", kind=classify(e)), None
+
+    def _uploaded(self, path, media_id, expires_after=None):
+        """Record media that is ready to attach."""
+        if self.media_cache is not None:
+            self.media_cache.put(self.account, path, media_id, expires_after)
+        metrics.UPLOADS.inc(result='ok')
+
+    def _await_processing(self, sent):
+        """Wait for every (MediaResult, processing_info) the server is still processing, together.
+
+        Returns the MediaResults, with an error on any whose processing failed.
+        """
+        pending = {result.media_id: info for result, info in sent if info}
+        failures = {}
+        if pending:
+            with trace.span('media_processing', media=len(pending)) as span:
+                failures = wait_for_processing(self.api, pending, retry=self.retry)
+                if failures:
+                    span.error(next(iter(failures.values())))
+        results = []
+        for result, info in sent:
+            if info:
+                error = failures.get(result.media_id)
+                if error:
+                    metrics.UPLOADS.inc(result='failed')
+                    metrics.failure('upload', 'processing')
+                    result = MediaResult(result.path, error=f"Failed to process {result.path}: {error}",
+                                         kind='processing')
+                else:
+                    self._uploaded(result.path, result.media_id)
+            results.append(result)
+        return results
+
+    def _check_rejected(self, error):
+        """Remember credentials the API just refused, so later posts fail without a call."""
+        if rejects_credentials(error):
+            self.rejected = store(self._creds, False, error=f"Credentials rejected: {error}")['error']
+
+    def _rejected_result(self, text, media_ids=None):
+        _post_failed('fatal')
+        return TweetResult(text, media_ids=list(media_ids or []),
+                           error=f"{self.rejected}. Fix them and run 'termtweet --test'.", kind=FATAL)
+
+    def duplicate(self, text, allow_duplicate=None):
+        """Return True if this account already posted text and duplicates are not allowed."""
+        return self.dedupe is not None and not allowed(allow_duplicate) and self.dedupe.seen(self.account, text)
+
+    def post(self, text, media_ids=None, in_reply_to=None, allow_duplicate=None):
+        """Post a tweet with already-uploaded media and return a TweetResult.
+
+        Pass in_reply_to with a tweet ID to post as a reply (used for threads).
+        """
+        if self.rejected:
+            return self._rejected_result(text, media_ids)
+        if self.duplicate(text, allow_duplicate):
+            _post_failed('duplicate')
+            return TweetResult(text, media_ids=list(media_ids or []), error=DUPLICATE_ERROR, kind='duplicate')
+        return self._post(text, media_ids, in_reply_to)
+
+    def _post(self, text, media_ids=None, in_reply_to=None):
+        """Body of post(), after the duplicate check."""
+        media_ids = list(media_ids or [])
+        length = weighted_length(text)
+        if length > MAX_TWEET_LENGTH:
+            # Rejected before spending a rate-limited call on it
+            _post_failed('invalid')
+            return TweetResult(text, media_ids=media_ids, kind='invalid',
+                               error=f"Tweet text is {length} characters long. Maximum is {MAX_TWEET_LENGTH} characters.")
+        params = {'text': text}
+        if media_ids:
+            params['media_ids'] = media_ids
+        if in_reply_to:
+            params['in_reply_to_tweet_id'] = in_reply_to
+        with trace.span('post_tweet', media=len(media_ids), length=length) as span:
+            try:
+                with metrics.POST_SECONDS.time():
+                    response = self.retry.call_once(self.client.create_tweet, **params)
+                span.set(tweet_id=response.data['id'])
+            except Exception as e:
+                span.error(e)
+                duplicate = 'duplicate content' in str(e).lower()
+                kind = 'duplicate' if duplicate else classify(e)
+                _post_failed(kind)
+                self._check_rejected(e)
+                if self.dedupe is not None and duplicate:
+                    # Posted from somewhere else; remember it so the next attempt stays local
+                    self.dedupe.add(self.account, text)
+                return TweetResult(text, media_ids=media_ids, error=f"Failed to post tweet: {e}", kind=kind)
+        if self.dedupe is not None:
+            self.dedupe.add(self.account, text)
+        metrics.POSTS.inc(result='ok')
+        return TweetResult(text, tweet_id=response.data['id'], media_ids=media_ids)
+
+    def user_id(self):
+        """Return the account's user ID, read from the access token when it carries one."""
+        if self.account.isdigit():
+            return self.account
+        return str(self.retry.call(self.client.get_me, user_auth=True).data.id)
+
+    def timeline_page(self, since_id=None, pagination_token=None, max_results=TIMELINE_PAGE_SIZE,
+                      tweet_fields=TWEET_FIELDS):
+        """Fetch one page of the account's own posts, newest first.
+
+        Returns (list of tweet dicts as the API sent them, meta dict with next_token, newest_id, ...).
+        """
+        params = {'max_results': max_results, 'tweet_fields': list(tweet_fields)}
+        if since_id:
+            params['since_id'] = since_id
+        if pagination_token:
+            params['pagination_token'] = pagination_token
+        with trace.span('timeline_page', since_id=since_id) as span:
+            response = self.retry.call(self.client.get_users_tweets, self.user_id(), user_auth=True, **params)
+            tweets = [tweet.data for tweet in response.data or []]
+            span.set(count=len(tweets))
+            return tweets, response.meta or {}
+
+    def delete(self, tweet_id, text=None):
+        """Delete one of the account's posts and return a TweetResult.
+
+        A post that is already gone counts as deleted. Pass its text to drop it
+        from the duplicate index, so the same text can be posted again.
+        """
+        with trace.span('delete_tweet', tweet_id=tweet_id) as span:
+            try:
+                self.retry.call(self.client.delete_tweet, tweet_id)
+            except Exception as e:
+                if status_code(e) != 404:
+                    span.error(e)
+                    metrics.failure('delete', e)
+                    return TweetResult(text or '', error=f"Failed to delete {tweet_id}: {e}", kind=classify(e))
+        if text and self.dedupe is not None:
+            self.dedupe.forget(self.account, text)
+        return TweetResult(text or '', tweet_id=tweet_id)
+
+    def upload_all(self, image_paths):
+        """Upload several media files concurrently and return MediaResults in order.
+
+        Processing of GIFs and videos is awaited for all of them in one polling
+        loop, so the results come back as soon as the slowest is ready.
+        """
+        paths = media_paths(image_paths)
+        if len(paths) <= 1:
+            sent = [self._send_media(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+                sent = list(pool.map(trace.wrap(self._send_media), paths))
+        return self._await_processing(sent)
+
+    def tweet(self, text, image_path=None, allow_duplicate=None):
+        """Upload any attachments (one path or a list), post the tweet and return a TweetResult.
+
+        Text this account already posted is refused before anything is uploaded,
+        unless allow_duplicate (or $TERMTWEET_ALLOW_DUPLICATES) says otherwise.
+        """
+        with trace.span('tweet', media=len(media_paths(image_path))):
+            if self.rejected:
+                return self._rejected_result(text)
+            if self.duplicate(text, allow_duplicate):
+                _post_failed('duplicate')
+                return TweetResult(text, error=DUPLICATE_ERROR, kind='duplicate')
+            media = self.upload_all(image_path)
+            failed = [result for result in media if not result.ok]
+            if failed:
+                metrics.POSTS.inc(result='failed')
+                return TweetResult(text, error=failed[0].error, kind=failed[0].kind)
+            result = self._post(text, [result.media_id for result in media])
+            cached = [item.media_id for item in media if item.cached]
+            if not result.ok and cached:
+                # The server may have dropped them early; upload afresh next time
+                self.media_cache.discard(self.account, cached)
+            return result
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.shutdown()
+        if self.media_cache is not None:
+            self.media_cache.close()
+        if self.dedupe is not None:
+            self.dedupe.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
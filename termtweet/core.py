@@ -2,109 +2,216 @@
 TermTweet Core - Core functionality for tweeting
 """
 
+import importlib
+import mimetypes
 import os
 import sys
+import time
 from pathlib import Path
-import tweepy
-from dotenv import load_dotenv
-
-def load_credentials():
-    """Load Twitter API credentials from environment variables."""
-    # Priority order: environment variables > ~/.termtweet/.env > current directory .env
-    # This allows overriding with env vars for CI/CD or different profiles
-
-    # First, try loading from user's home directory
-    env_file = Path.home() / '.termtweet' / '.env'
-    if env_file.exists():
-        load_dotenv(env_file)
-    else:
-        # Fallback to current directory
-        load_dotenv()
 
-    # Allow environment variables to override file values
-    api_key = os.getenv('TWITTER_API_KEY')
-    api_secret = os.getenv('TWITTER_API_SECRET')
-    access_token = os.getenv('TWITTER_ACCESS_TOKEN')
-    access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
-    bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
+from termtweet import trace
+from termtweet.text import MAX_TWEET_LENGTH, weighted_length
 
-    if not all([api_key, api_secret, access_token, access_token_secret, bearer_token]):
-        return None
+MAX_IMAGE_SIZE = 5 * 1024 * 1024  # Twitter limit is 5MB
+MAX_GIF_SIZE = 15 * 1024 * 1024
+MAX_VIDEO_SIZE = 512 * 1024 * 1024
+MAX_MEDIA_PER_TWEET = 4
 
-    return api_key, api_secret, access_token, access_token_secret, bearer_token
+DEFAULT_PROFILE = 'default'
+CREDENTIAL_KEYS = (
+    'TWITTER_API_KEY',
+    'TWITTER_API_SECRET',
+    'TWITTER_ACCESS_TOKEN',
+    'TWITTER_ACCESS_TOKEN_SECRET',
+    'TWITTER_BEARER_TOKEN',
+)
 
-def authenticate_twitter(api_key, api_secret, access_token, access_token_secret, bearer_token):
-    """Authenticate with Twitter API."""
-    try:
-        client = tweepy.Client(
-            consumer_key=api_key,
-            consumer_secret=api_secret,
-            access_token=access_token,
-            access_token_secret=access_token_secret,
-            bearer_token=bearer_token
-        )
-        return client
-    except Exception:
-        return None
-
-def upload_media(api_key, api_secret, access_token, access_token_secret, image_path):
-    """Upload image to Twitter and return media ID."""
-    try:
-        auth = tweepy.OAuth1UserHandler(api_key, api_secret, access_token, access_token_secret)
-        api = tweepy.API(auth)
-        media = api.media_upload(image_path)
-        return media.media_id_string
-    except Exception:
-        return None
-
-def post_tweet(client, text, media_id=None):
-    """Post a tweet with optional media."""
+# Parsed .env files keyed by path, as (mtime_ns, values)
+_env_cache = {}
+
+# tweepy (and the requests/oauthlib stack behind it) and dotenv are imported on
+# first use, so --help, --version and --dry-run never pay for them.
+_LAZY_IMPORTS = {
+    'tweepy': ('tweepy', None),
+    'dotenv_values': ('dotenv', 'dotenv_values'),
+}
+
+def __getattr__(name):
+    """Import heavy dependencies on first attribute access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    with trace.span('import', module=module_name):
+        value = importlib.import_module(module_name)
+    if attribute:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+def _lazy(name):
+    """Return a lazily imported dependency, honouring any patched module attribute."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+def state_dir():
+    """Return the directory for TermTweet's local state (TERMTWEET_HOME or ~/.termtweet)."""
+    return Path(os.environ.get('TERMTWEET_HOME') or Path.home() / '.termtweet')
+
+def media_type(path):
+    """Guess the MIME type of a media file."""
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+def media_limit(path):
+    """Return a (label, max bytes) pair for a media file based on its type."""
+    mime = media_type(path)
+    if mime == 'image/gif':
+        return 'GIF', MAX_GIF_SIZE
+    if mime.startswith('video/'):
+        return 'Video', MAX_VIDEO_SIZE
+    return 'Image', MAX_IMAGE_SIZE
+
+def media_paths(image_paths):
+    """Normalize None, a single path or a list of paths into a list."""
+    if not image_paths:
+        return []
+    if isinstance(image_paths, (str, os.PathLike)):
+        return [image_paths]
+    return list(image_paths)
+
+def active_profile():
+    """Return the profile selected with --profile / TERMTWEET_PROFILE."""
+    return os.environ.get('TERMTWEET_PROFILE') or DEFAULT_PROFILE
+
+def profile_path(profile):
+    """Return the credentials file for a named profile."""
+    if profile == DEFAULT_PROFILE:
+        return state_dir() / '.env'
+    return state_dir() / 'profiles' / f'{profile}.env'
+
+def read_env_file(path):
+    """Parse a .env file, re-reading it only when its modification time changes."""
     try:
-        if media_id:
-            response = client.create_tweet(text=text, media_ids=[media_id])
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _env_cache.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+    values = dict(_lazy('dotenv_values')(path))
+    _env_cache[str(path)] = (mtime, values)
+    return values
+
+def load_credentials(profile=None):
+    """Load Twitter API credentials for a profile without touching os.environ."""
+    profile = profile or active_profile()
+    with trace.span('load_credentials', profile=profile) as span:
+        if profile == DEFAULT_PROFILE:
+            # Priority order: environment variables > ~/.termtweet/.env > current directory .env
+            # This allows overriding with env vars for CI/CD
+            env_file = profile_path(DEFAULT_PROFILE)
+            values = dict(read_env_file(env_file if env_file.exists() else Path('.env')))
+            values.update({key: os.environ[key] for key in CREDENTIAL_KEYS if os.environ.get(key)})
         else:
-            response = client.create_tweet(text=text)
-        return response.data['id']
-    except Exception:
-        return None
+            # Named profiles come only from their own file, so one set of env vars
+            # cannot silently turn every profile into the same account
+            values = read_env_file(profile_path(profile))
+
+        creds = tuple(values.get(key) for key in CREDENTIAL_KEYS)
+        if not all(creds):
+            span.error("Missing credentials")
+            return None
+
+        return creds
+
+def authenticate_twitter(api_key, api_secret, access_token, access_token_secret, bearer_token):
+    """Authenticate with Twitter API and return a TermTweetClient, or None."""
+    from termtweet.client import TermTweetClient
+
+    with trace.span('authenticate_twitter') as span:
+        try:
+            return TermTweetClient(api_key, api_secret, access_token, access_token_secret, bearer_token)
+        except Exception as e:
+            span.error(e)
+            return None
+
+def upload_media(api_key, api_secret, access_token, access_token_secret, image_path, bearer_token=None):
+    """Upload image to Twitter and return media ID, reusing a cached one for known files."""
+    from termtweet.client import TermTweetClient
+
+    with TermTweetClient(api_key, api_secret, access_token, access_token_secret, bearer_token,
+                         dedupe=False) as client:
+        return client.upload_media(image_path).media_id
+
+def post_tweet(client, text, media_id=None, media_ids=None):
+    """Post a tweet with optional media (one media_id or a list of media_ids) through a TermTweetClient.
+
+    Returns the new tweet's ID, or None after printing why it failed.
+    """
+    media_ids = list(media_ids or []) + ([media_id] if media_id else [])
+    result = client.post(text, media_ids)
+    if not result.ok:
+        print(f"❌ {result.error}")
+    return result.tweet_id
+
+def validate_tweet(text, image_paths=None):
+    """Check tweet text and media against Twitter limits and return a list of problems."""
+    errors = []
+    length = weighted_length(text)
+    if length > MAX_TWEET_LENGTH:
+        errors.append(f"Tweet text is {length} characters long. Maximum is {MAX_TWEET_LENGTH} characters.")
+    elif not text.strip():
+        errors.append("Tweet text is empty.")
+    return errors + validate_media(image_paths)
+
+def validate_media(image_paths):
+    """Check attachments against Twitter limits and return a list of problems."""
+    errors = []
+    paths = media_paths(image_paths)
+    if len(paths) > MAX_MEDIA_PER_TWEET:
+        errors.append(f"Too many attachments ({len(paths)}). Maximum is {MAX_MEDIA_PER_TWEET} per tweet.")
+    labels = [media_limit(path)[0] for path in paths]
+    if len(paths) > 1 and ('GIF' in labels or 'Video' in labels):
+        errors.append("A GIF or video must be the only attachment on a tweet.")
+
+    for image_path in paths:
+        if not os.path.exists(image_path):
+            errors.append(f"Image file '{image_path}' not found.")
+            continue
+        file_size = os.path.getsize(image_path)
+        label, limit = media_limit(image_path)
+        if file_size > limit:
+            errors.append(f"{label} file is too large ({file_size / (1024*1024):.1f}MB). "
+                          f"Maximum is {limit // (1024*1024)}MB.")
+
+    return errors
 
 def tweet(text, image_path=None):
-    """Main tweet function."""
+    """Main tweet function. image_path may be a single path or a list of up to four."""
     # Load credentials
     creds = load_credentials()
     if not creds:
         print("❌ No credentials found. Run 'termtweet --setup' to configure.")
         return False
 
-    api_key, api_secret, access_token, access_token_secret, bearer_token = creds
-
     # Authenticate
-    client = authenticate_twitter(api_key, api_secret, access_token, access_token_secret, bearer_token)
+    client = authenticate_twitter(*creds)
     if not client:
         print("❌ Authentication failed. Check your credentials.")
         return False
 
-    # Handle image upload if provided
-    media_id = None
-    if image_path:
-        print(f"📤 Uploading image: {image_path}")
-        media_id = upload_media(api_key, api_secret, access_token, access_token_secret, image_path)
-        if not media_id:
-            print("❌ Failed to upload image.")
-            return False
-        print("✅ Image uploaded successfully!")
-
-    # Post the tweet
+    paths = media_paths(image_path)
+    for path in paths:
+        print(f"📤 Uploading {media_limit(path)[0].lower()}: {path}")
     print("Posting tweet...")
-    tweet_id = post_tweet(client, text, media_id)
-    if tweet_id:
+    with client:
+        result = client.tweet(text, paths)
+    if result.ok:
         print("Tweet posted successfully!")
         return True
-    else:
-        print("Failed to post tweet.")
-        return False
+    print(f"❌ {result.error}")
+    print("Failed to post tweet.")
+    return False
 
-def setup_credentials():
+def setup_credentials(profile=None):
     """Interactive setup for credentials."""
     print("🔧 Let's set up your Twitter API credentials.")
     print("📋 Get these from: https://developer.twitter.com/en/portal/dashboard")
@@ -143,9 +250,8 @@ TWITTER_BEARER_TOKEN={bearer_token}
 """
 
     # Ensure .env directory exists
-    env_dir = Path.home() / '.termtweet'
-    env_dir.mkdir(exist_ok=True)
-    env_file = env_dir / '.env'
+    env_file = profile_path(profile or active_profile())
+    env_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Write to .env file
     try:
@@ -158,8 +264,10 @@ TWITTER_BEARER_TOKEN={bearer_token}
         print(f"❌ Error saving credentials: {e}")
         return False
 
-def test_credentials():
-    """Test if credentials are configured correctly."""
+def test_credentials(refresh=False):
+    """Test credentials with a real API call, reusing a recent successful check unless refresh is set."""
+    from termtweet.verify import verify
+
     print("Testing TermTweet configuration...")
 
     creds = load_credentials()
@@ -184,13 +292,28 @@ def test_credentials():
             print("   - {}".format(issue))
 
     print("Testing Twitter API connection...")
-    client = authenticate_twitter(api_key, api_secret, access_token, access_token_secret, bearer_token)
+    result = verify(creds, refresh=refresh)
 
-    if client is None:
-        print("Authentication failed. Check your credentials and app permissions.")
+    if not result['ok']:
+        print(f"Authentication failed: {result['error']}")
         print("Make sure your Twitter app has 'Read and Write' permissions.")
         return False
 
-    print("Authentication successful!")
+    who = f"@{result['username']}" if result['username'] else f"user {result['user_id']}"
+    if result['cached']:
+        print(f"Authentication successful as {who} (checked {_ago(result['checked_at'])}; "
+              "use --recheck to ask the API again)")
+    else:
+        print(f"Authentication successful as {who}!")
+    if result['access_level']:
+        print(f"Access level: {result['access_level']}")
     print("TermTweet is ready to use!")
-    return True
\ No newline at end of file
+    return True
+
+def _ago(timestamp):
+    """Describe how long ago a Unix timestamp was, e.g. '5 minutes ago'."""
+    minutes = int(max(0, time.time() - timestamp) // 60)
+    if minutes < 60:
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    hours = minutes // 60
+    return f"{hours} hour{'s' if hours != 1 else ''} ago"
@@ -0,0 +1,131 @@
+"""
+TermTweet Daemon - Keep a warm, authenticated client behind a Unix socket
+"""
+
+import json
+import os
+import socket
+import socketserver
+
+from termtweet.core import DEFAULT_PROFILE, active_profile, state_dir, media_paths
+
+# Time allowed for the daemon to upload and post before the CLI gives up waiting
+FORWARD_TIMEOUT = 120.0
+
+def socket_path(profile=None):
+    """Return the path of the daemon's Unix domain socket; each profile has its own."""
+    profile = profile or active_profile()
+    if profile == DEFAULT_PROFILE:
+        return str(state_dir() / 'daemon.sock')
+    return str(state_dir() / f'daemon-{profile}.sock')
+
+def _available():
+    return hasattr(socket, 'AF_UNIX')
+
+def send(request, path=None, timeout=FORWARD_TIMEOUT):
+    """Send one JSON request to the daemon and return its reply, or None if it is not running."""
+    path = path or socket_path()
+    if not _available() or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except OSError:
+            return None
+        # Once connected the daemon may already be posting, so errors are reported
+        # rather than returning None, which would make the caller post a second time
+        try:
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as reply:
+                line = reply.readline()
+            return json.loads(line)
+        except (OSError, ValueError) as e:
+            return {'ok': False, 'error': f"No reply from the TermTweet daemon: {e or 'connection closed'}"}
+    finally:
+        sock.close()
+
+def forward_tweet(text, image_paths=None, path=None, allow_duplicate=None):
+    """Ask a running daemon to post a tweet. Returns its reply dict, or None to post in-process."""
+    images = [os.path.abspath(image) for image in media_paths(image_paths)]
+    return send({'op': 'tweet', 'text': text, 'images': images, 'allow_duplicate': allow_duplicate}, path)
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handle one newline-delimited JSON request per connection."""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            reply = self.server.dispatch(request)
+        except ValueError as e:
+            reply = {'ok': False, 'error': f"Invalid request: {e}"}
+        except Exception as e:
+            # Always answer, so the CLI reports the failure instead of waiting for a reply
+            reply = {'ok': False, 'error': f"Daemon error: {e}"}
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server that posts through one shared TermTweetClient."""
+
+    daemon_threads = True
+
+    def __init__(self, path, client):
+        self.client = client
+        super().__init__(path, _Handler)
+
+    def server_bind(self):
+        # Create the socket owner-only, so no other user can connect before it is locked down
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def dispatch(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("expected a JSON object")
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True}
+        if op == 'tweet':
+            text, images = request.get('text'), request.get('images')
+            if not isinstance(text, str):
+                raise ValueError("'text' must be a string")
+            if images is not None and not (isinstance(images, list)
+                                           and all(isinstance(image, str) for image in images)):
+                raise ValueError("'images' must be a list of paths")
+            result = self.client.tweet(text, images, allow_duplicate=request.get('allow_duplicate'))
+            return {'ok': result.ok, 'tweet_id': result.tweet_id, 'error': result.error}
+        return {'ok': False, 'error': f"Unknown operation: {op}"}
+
+def serve(path=None):
+    """Run the daemon in the foreground until interrupted."""
+    if not _available():
+        print("❌ The daemon needs Unix domain sockets, which this platform does not support.")
+        return False
+
+    path = path or socket_path()
+    if os.path.exists(path):
+        if send({'op': 'ping'}, path, timeout=2) is not None:
+            print(f"❌ A TermTweet daemon is already listening on {path}")
+            return False
+        os.unlink(path)  # left behind by a daemon that did not shut down cleanly
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    from termtweet.client import TermTweetClient
+
+    client = TermTweetClient.from_credentials()
+    if not client:
+        print("❌ No credentials found. Run 'termtweet --setup' to configure.")
+        return False
+
+    with client, DaemonServer(path, client) as server:
+        print(f"🟢 TermTweet daemon listening on {path} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Daemon stopped.")
+        finally:
+            os.unlink(path)
+    return True
@@ -0,0 +1,228 @@
+"""
+TermTweet Dedupe - Remember what each account posted, so duplicates are caught locally
+"""
+
+import hashlib
+import os
+import threading
+import time
+import unicodedata
+
+from termtweet.core import state_dir
+from termtweet.storage import SQLiteStore
+
+DUPLICATE_ERROR = ("Duplicate: this account recently posted the same text "
+                   "(use --allow-duplicate to post it anyway)")
+
+# Text may be posted again this long after it was last posted (TERMTWEET_DEDUPE_HOURS overrides)
+RETENTION = 24 * 60 * 60
+# How often a long-lived index deletes posts older than the retention window
+PRUNE_INTERVAL = 60 * 60
+
+# About 10 bits and 7 probes per entry gives a false-positive rate under 1%
+BITS_PER_ENTRY = 10
+HASHES = 7
+MIN_BITS = 1 << 13
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    account TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    posted_at REAL NOT NULL,
+    PRIMARY KEY (account, digest)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS accounts (
+    account TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    entries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blooms (
+    account TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    bits BLOB NOT NULL
+);
+"""
+
+def allowed(allow_duplicate=None):
+    """Return True if duplicate posts were allowed explicitly or via TERMTWEET_ALLOW_DUPLICATES."""
+    if allow_duplicate is not None:
+        return allow_duplicate
+    return os.environ.get('TERMTWEET_ALLOW_DUPLICATES', '') not in ('', '0')
+
+def retention_window():
+    """Return the dedupe window in seconds, from TERMTWEET_DEDUPE_HOURS or RETENTION."""
+    try:
+        hours = float(os.environ['TERMTWEET_DEDUPE_HOURS'])
+    except (KeyError, ValueError):
+        return RETENTION
+    return hours * 60 * 60 if hours > 0 else RETENTION
+
+def normalize(text):
+    """Reduce text to the form compared for duplicates: NFC, whitespace collapsed."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+def text_digest(text):
+    """Return a 16-byte digest of the normalized text."""
+    return hashlib.sha256(normalize(text).encode('utf-8')).digest()[:16]
+
+class BloomFilter:
+    """Bloom filter over text digests; a power-of-two number of bits."""
+
+    def __init__(self, size, bits=None):
+        self.size = size
+        self.bits = bytearray(bits) if bits is not None else bytearray(size // 8)
+
+    @classmethod
+    def for_capacity(cls, entries):
+        size = MIN_BITS
+        while size < entries * BITS_PER_ENTRY:
+            size <<= 1
+        return cls(size)
+
+    @property
+    def capacity(self):
+        return self.size // BITS_PER_ENTRY
+
+    def _positions(self, digest):
+        # Double hashing: the digest already holds two independent 64-bit values
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        mask = self.size - 1
+        return [(h1 + i * h2) & mask for i in range(HASHES)]
+
+    def add(self, digest):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+class DedupeIndex(SQLiteStore):
+    """Per-account set of recently posted text digests in SQLite, with a Bloom filter in front.
+
+    Text counts as a duplicate for `retention` seconds after it was last posted;
+    older rows are pruned. Most lookups are for new text and are answered by the
+    in-memory filter alone; only possible duplicates are checked against the
+    table. Each account's filter is saved with the generation of the set it was
+    built from and rebuilt when another process has added posts since, including
+    while this index is open. Safe to share between threads.
+    """
+
+    def __init__(self, path=None, retention=None):
+        super().__init__(path or state_dir() / 'posted.db', _SCHEMA, check_same_thread=False)
+        self.retention = retention or retention_window()
+        self._pruned_at = 0
+        self.lock = threading.Lock()
+        # account -> [BloomFilter, generation it reflects, changed since loaded]
+        self._blooms = {}
+
+    def _counters(self, account):
+        row = self.conn.execute('SELECT generation, entries FROM accounts WHERE account = ?',
+                                (account,)).fetchone()
+        return row or (0, 0)
+
+    def _bloom(self, account):
+        """Return the account's current filter, loading the saved one or rebuilding it from the table."""
+        generation, entries = self._counters(account)
+        cached = self._blooms.get(account)
+        if cached is not None and cached[1] == generation:
+            return cached[0]
+        row = self.conn.execute('SELECT generation, bits FROM blooms WHERE account = ?', (account,)).fetchone()
+        if row is not None and row[0] == generation:
+            bloom, dirty = BloomFilter(len(row[1]) * 8, row[1]), False
+        else:
+            bloom, dirty = BloomFilter.for_capacity(2 * entries), True
+            for (digest,) in self.conn.execute('SELECT digest FROM posts WHERE account = ?', (account,)):
+                bloom.add(digest)
+        self._blooms[account] = [bloom, generation, dirty]
+        return bloom
+
+    def seen(self, account, text, now=None):
+        """Return True if this account posted the same (normalized) text within the retention window."""
+        digest = text_digest(text)
+        since = (time.time() if now is None else now) - self.retention
+        with self.lock:
+            if digest not in self._bloom(account):
+                return False
+            return self.conn.execute('SELECT 1 FROM posts WHERE account = ? AND digest = ? AND posted_at > ?',
+                                     (account, digest, since)).fetchone() is not None
+
+    def add(self, account, text, now=None):
+        """Record that this account posted text, restarting its retention window."""
+        digest = text_digest(text)
+        now = time.time() if now is None else now
+        if now - self._pruned_at >= PRUNE_INTERVAL:
+            self.prune(now)
+        with self.lock:
+            bloom = self._bloom(account)
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                inserted = self.conn.execute('INSERT OR IGNORE INTO posts VALUES (?, ?, ?)',
+                                             (account, digest, now)).rowcount
+                if not inserted:
+                    self.conn.execute('UPDATE posts SET posted_at = ? WHERE account = ? AND digest = ?',
+                                      (now, account, digest))
+                else:
+                    self.conn.execute(
+                        'INSERT INTO accounts VALUES (?, 1, 1) ON CONFLICT(account) DO UPDATE '
+                        'SET generation = generation + 1, entries = entries + 1', (account,))
+                generation, entries = self._counters(account)
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            if not inserted:
+                return
+            cached = self._blooms[account]
+            if generation != cached[1] + 1 or entries > bloom.capacity:
+                # Someone else added posts too, or the filter is full: rebuild on next use
+                del self._blooms[account]
+                return
+            bloom.add(digest)
+            cached[1], cached[2] = generation, True
+
+    def forget(self, account, text):
+        """Drop text from the account's history, e.g. after the post was deleted.
+
+        The filter keeps the stale bits; they only cost an extra table lookup.
+        """
+        with self.lock:
+            deleted = self.conn.execute('DELETE FROM posts WHERE account = ? AND digest = ?',
+                                        (account, text_digest(text))).rowcount
+            if deleted:
+                self.conn.execute('UPDATE accounts SET entries = entries - 1 WHERE account = ?', (account,))
+
+    def prune(self, now=None):
+        """Delete posts older than the retention window, marking the affected filters stale."""
+        now = time.time() if now is None else now
+        cutoff = now - self.retention
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                expired = self.conn.execute('SELECT account, COUNT(*) FROM posts WHERE posted_at <= ? '
+                                            'GROUP BY account', (cutoff,)).fetchall()
+                self.conn.execute('DELETE FROM posts WHERE posted_at <= ?', (cutoff,))
+                for account, count in expired:
+                    # A new generation makes every process rebuild the filter without the old posts
+                    self.conn.execute('UPDATE accounts SET generation = generation + 1, entries = entries - ? '
+                                      'WHERE account = ?', (count, account))
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self._pruned_at = now
+        return sum(count for _, count in expired)
+
+    def save(self):
+        """Persist filters that changed, unless another process has moved the set on since."""
+        with self.lock:
+            for account, (bloom, generation, dirty) in self._blooms.items():
+                if dirty and self._counters(account)[0] == generation:
+                    self.conn.execute('INSERT OR REPLACE INTO blooms VALUES (?, ?, ?)',
+                                      (account, generation, bytes(bloom.bits)))
+                    self._blooms[account][2] = False
+
+    def close(self):
+        self.save()
+        super().close()
@@ -0,0 +1,196 @@
+"""
+TermTweet Delete - Bulk-delete posts by ID or by a filter over the timeline
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from termtweet.core import state_dir
+
+DEFAULT_CONCURRENCY = 4
+
+class PostIDError(ValueError):
+    """Raised when a list of post IDs cannot be read or parsed."""
+
+def _parse_id(line):
+    """Return (tweet_id, text) for one line of an ID list."""
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+            return str(record['id']), record.get('text')
+        except (ValueError, KeyError, TypeError) as e:
+            raise PostIDError(f"Not a post record: {line[:40]}") from e
+    if line.isdigit():
+        return line, None
+    raise PostIDError(f"Not a post ID: {line[:40]}")
+
+def read_ids(lines):
+    """Yield (tweet_id, text) from lines of bare IDs or JSON records with an "id" (e.g. an export).
+
+    Blank lines and lines starting with '#' are skipped; text is None unless the
+    record has one. Unreadable input raises PostIDError.
+    """
+    try:
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield _parse_id(line)
+    except OSError as e:
+        raise PostIDError(str(e)) from e
+
+def select_from_timeline(client, before=None, after=None, matching=None):
+    """Yield (tweet_id, text) for the account's posts matching every given filter.
+
+    before and after are Unix timestamps on created_at; matching is a
+    case-insensitive substring of the text. Pages are fetched lazily, newest
+    first, and paging stops once posts are older than after.
+    """
+    from termtweet.scheduler import parse_time
+
+    needle = matching.casefold() if matching else None
+    token = None
+    while True:
+        tweets, meta = client.timeline_page(pagination_token=token)
+        for tweet in tweets:
+            created = parse_time(tweet['created_at']) if tweet.get('created_at') else None
+            if after is not None and created is not None and created < after:
+                return
+            if before is not None and (created is None or created >= before):
+                continue
+            if needle and needle not in tweet['text'].casefold():
+                continue
+            yield tweet['id'], tweet['text']
+        token = meta.get('next_token')
+        if not token:
+            return
+
+class Checkpoint:
+    """Append-only log of post IDs already deleted from an account, for resuming a run."""
+
+    def __init__(self, account, path=None):
+        self.path = str(path or state_dir() / 'deleted' / f"{account}.log")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.done = {line.strip() for line in f if line.strip()}
+        except OSError:
+            self.done = set()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def __contains__(self, tweet_id):
+        return tweet_id in self.done
+
+    def add(self, tweet_id):
+        with self._lock:
+            self.done.add(tweet_id)
+            self._file.write(tweet_id + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _report(tweet_id, error):
+    if error:
+        print(f"❌ {error}", flush=True)
+    else:
+        print(f"🗑️  Deleted {tweet_id}", flush=True)
+
+def delete_posts(client, targets, checkpoint, concurrency=DEFAULT_CONCURRENCY, report=_report):
+    """Delete (tweet_id, text) targets through a bounded pool sharing one client.
+
+    Targets are consumed lazily and at most concurrency deletes are in flight;
+    the client's rate-limited session spaces the calls out as the window's
+    remaining calls run low. IDs in the checkpoint are skipped and each success
+    is added to it. Returns a dict of counts.
+    """
+    stats = {'deleted': 0, 'failed': 0, 'skipped': 0}
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(concurrency)
+
+    def done(tweet_id, future):
+        try:
+            result = future.result()
+            error = result.error
+        except Exception as e:
+            error = f"Failed to delete {tweet_id}: {e}"
+        if not error:
+            checkpoint.add(tweet_id)
+        with lock:
+            stats['failed' if error else 'deleted'] += 1
+            report(tweet_id, error)
+        slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for tweet_id, text in targets:
+            if tweet_id in checkpoint:
+                stats['skipped'] += 1
+                continue
+            slots.acquire()
+            future = pool.submit(client.delete, tweet_id, text)
+            future.add_done_callback(functools.partial(done, tweet_id))
+    return stats
+
+def run_delete(source=None, before=None, after=None, matching=None, concurrency=DEFAULT_CONCURRENCY,
+               dry_run=False):
+    """Delete posts listed in source (a file, or '-' for stdin) or selected by filters, from the CLI."""
+    from termtweet.client import TermTweetClient
+
+    client = TermTweetClient.from_credentials(pool_size=max(1, concurrency), media_cache=False)
+    if not client:
+        print("❌ No credentials found. Run 'termtweet --setup' to configure.")
+        return False
+
+    stream = None
+    try:
+        with client, Checkpoint(client.account) as checkpoint:
+            if source:
+                try:
+                    stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+                except OSError as e:
+                    raise PostIDError(str(e)) from e
+                targets = read_ids(stream)
+            else:
+                targets = select_from_timeline(client, before, after, matching)
+
+            if dry_run:
+                count = 0
+                for tweet_id, text in targets:
+                    if tweet_id not in checkpoint:
+                        count += 1
+                        print(f"[DRY RUN] Would delete {tweet_id}" + (f": {text}" if text else ""))
+                print(f"[DRY RUN] {count} posts would be deleted.")
+                return True
+
+            try:
+                stats = delete_posts(client, targets, checkpoint, concurrency)
+            except KeyboardInterrupt:
+                print("Delete interrupted. Run the same command again to resume.")
+                return False
+    except PostIDError as e:
+        print(f"❌ Could not read post IDs: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Could not {'delete' if source else 'list'} posts: {e}")
+        return False
+    finally:
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+
+    summary = f"Deleted {stats['deleted']} posts"
+    if stats['skipped']:
+        summary += f", skipped {stats['skipped']} deleted by an earlier run"
+    if stats['failed']:
+        summary += f", {stats['failed']} failed"
+    print(summary)
+    return stats['failed'] == 0
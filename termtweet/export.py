@@ -0,0 +1,81 @@
+"""
+TermTweet Export - Archive an account's own posts and metrics to JSONL, incrementally
+"""
+
+import hashlib
+import json
+import os
+
+from termtweet.core import state_dir
+from termtweet.storage import load_json, save_json_atomic
+
+def cursor_path(account, output):
+    """Locate the export cursor for this account and output file."""
+    key = f"{account}|{os.path.abspath(output)}"
+    return state_dir() / 'exports' / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+def load_cursor(path):
+    return load_json(path, {})
+
+def save_cursor(path, cursor):
+    """Atomically write the cursor so a crash never leaves a torn file."""
+    save_json_atomic(path, cursor)
+
+def export_timeline(client, output, on_page=None):
+    """Append the account's posts newer than the last export to output as JSON lines.
+
+    Pages are written as they arrive, newest first. The cursor holds since_id
+    (the newest post already exported) and, during a run, the next page token,
+    so an interrupted export resumes where it stopped and a finished one only
+    fetches posts published since. A crash between writing a page and saving the
+    cursor can repeat that page, so readers should key records by "id". Returns
+    the number of posts written.
+    """
+    path = cursor_path(client.account, output)
+    cursor = load_cursor(path)
+    since_id = cursor.get('since_id')
+    token = cursor.get('pagination_token')
+    newest = cursor.get('newest_id')
+    written = 0
+
+    with open(output, 'a', encoding='utf-8') as f:
+        while True:
+            tweets, meta = client.timeline_page(since_id=since_id, pagination_token=token)
+            for tweet in tweets:
+                f.write(json.dumps(tweet, ensure_ascii=False) + '\n')
+            f.flush()
+            written += len(tweets)
+            # The first page of a run starts with the newest post
+            newest = newest or meta.get('newest_id')
+            token = meta.get('next_token')
+            if on_page:
+                on_page(written)
+            if not token:
+                break
+            save_cursor(path, {'since_id': since_id, 'pagination_token': token, 'newest_id': newest})
+
+    save_cursor(path, {'since_id': newest or since_id})
+    return written
+
+def run_export(output):
+    """Export the active profile's timeline from the CLI."""
+    from termtweet.client import TermTweetClient
+
+    client = TermTweetClient.from_credentials(media_cache=False, dedupe=False)
+    if not client:
+        print("❌ No credentials found. Run 'termtweet --setup' to configure.")
+        return False
+
+    with client:
+        try:
+            written = export_timeline(client, output,
+                                      on_page=lambda count: print(f"📥 {count} posts so far...", flush=True))
+        except KeyboardInterrupt:
+            print("Export interrupted. Run the same command again to resume.")
+            return False
+        except Exception as e:
+            print(f"❌ Export failed: {e}")
+            print("Run the same command again to resume.")
+            return False
+    print(f"✅ Exported {written} new posts to {output}")
+    return True
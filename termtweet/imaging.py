@@ -0,0 +1,161 @@
+"""
+TermTweet Imaging - Shrink images before upload (optional, needs Pillow)
+"""
+
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from termtweet.core import media_type, state_dir
+from termtweet.storage import write_atomic
+
+# Larger images are scaled down by the platform anyway
+MAX_DIMENSION = 4096
+JPEG_QUALITY = 85
+WEBP_QUALITY = 85
+# Bumped whenever the encoding settings change, so old outputs are not reused
+PIPELINE_VERSION = 2
+
+_OPTIMIZABLE = ('image/png', 'image/jpeg', 'image/webp', 'image/bmp', 'image/tiff')
+# JPEG segments that only carry metadata: APP1 (Exif, XMP), APP13 (IPTC) and comments
+_JPEG_METADATA = (0xE1, 0xED, 0xFE)
+_EXIF_ORIENTATION = 0x0112
+
+def available():
+    """Return True if Pillow is installed."""
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _encode(image, fmt, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+def _strip_jpeg(data):
+    """Return a JPEG without its metadata segments, leaving the compressed image data untouched."""
+    if data[:2] != b'\xff\xd8':
+        raise ValueError("Not a JPEG file")
+    parts = [data[:2]]
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("Corrupt JPEG marker")
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            pos += 1
+            continue
+        if marker == 0xDA:
+            # Start of scan: everything from here on is image data
+            parts.append(data[pos:])
+            return b''.join(parts)
+        end = pos + 2 + int.from_bytes(data[pos + 2:pos + 4], 'big')
+        if marker not in _JPEG_METADATA:
+            parts.append(data[pos:end])
+        pos = end
+    raise ValueError("Truncated JPEG file")
+
+def _candidates(image, source_format):
+    """Yield (extension, bytes) encodings of an image without metadata."""
+    if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        yield '.png', _encode(image, 'PNG', optimize=True)
+    else:
+        image = image.convert('RGB')
+        if source_format != 'JPEG':
+            # Lossless is sometimes smallest for flat screenshots
+            yield '.png', _encode(image, 'PNG', optimize=True)
+        yield '.jpg', _encode(image, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    yield '.webp', _encode(image, 'WEBP', quality=WEBP_QUALITY, method=4)
+
+def optimize_image(path, directory=None):
+    """Return the path of a smaller, metadata-free copy of an image, or path itself.
+
+    The image is rotated upright, scaled to fit MAX_DIMENSION and re-encoded in
+    whichever supported format is smallest; an upright JPEG may instead just lose
+    its metadata segments. An image that needs no scaling is returned unchanged
+    unless the result is strictly smaller, so optimizing never makes a file
+    bigger. GIFs, videos, and files Pillow cannot read are returned unchanged.
+    Outputs are named by content hash, so optimizing the same file again reuses
+    the earlier result.
+    """
+    if media_type(path) not in _OPTIMIZABLE:
+        return path
+
+    from PIL import Image, ImageOps
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data + f"|{PIPELINE_VERSION}|{MAX_DIMENSION}".encode()).hexdigest()
+    directory = directory or str(state_dir() / 'optimized')
+    for ext in ('.jpg', '.png', '.webp'):
+        existing = os.path.join(directory, digest + ext)
+        if os.path.exists(existing):
+            return existing
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            source_format = image.format
+            if getattr(image, 'is_animated', False):
+                return path
+            upright = image.getexif().get(_EXIF_ORIENTATION, 1) == 1
+            resized = ImageOps.exif_transpose(image)
+            resized.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.LANCZOS)
+            scaled = resized.size not in (image.size, image.size[::-1])
+            candidates = list(_candidates(resized, source_format))
+            if source_format == 'JPEG' and upright and not scaled:
+                candidates.append(('.jpg', _strip_jpeg(data)))
+            ext, best = min(candidates, key=lambda candidate: len(candidate[1]))
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return path
+    if not scaled and len(best) >= len(data):
+        return path
+
+    output = os.path.join(directory, digest + ext)
+    write_atomic(output, best)
+    return output
+
+def optimize_all(image_paths, workers=None):
+    """Optimize several images across CPU cores and return the new paths in order.
+
+    A single image is processed in this process, which is faster than starting a pool.
+    """
+    paths = list(image_paths)
+    todo = sorted({path for path in paths if media_type(path) in _OPTIMIZABLE})
+    if not todo:
+        return paths
+    directory = str(state_dir() / 'optimized')
+    if len(todo) == 1:
+        optimized = {todo[0]: optimize_image(todo[0], directory)}
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            optimized = dict(zip(todo, pool.map(optimize_image, todo, [directory] * len(todo))))
+    return [optimized.get(path, path) for path in paths]
+
+def _size(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024*1024):.1f}MB"
+    return f"{size / 1024:.0f}KB"
+
+def optimize_for_cli(image_paths):
+    """Optimize images from the CLI, reporting the savings; returns the paths to upload."""
+    paths = list(image_paths or [])
+    if not paths:
+        return paths
+    if not available():
+        print("⚠️  --optimize needs Pillow: pip install 'termtweet[images]'. Uploading originals.")
+        return paths
+
+    existing = [path for path in paths if os.path.exists(path)]
+    optimized = dict(zip(existing, optimize_all(existing)))
+    for path in existing:
+        new_path = optimized[path]
+        if new_path != path:
+            before, after = os.path.getsize(path), os.path.getsize(new_path)
+            print(f"🖼️  Optimized {os.path.basename(path)}: {_size(before)} -> {_size(after)}")
+    return [optimized.get(path, path) for path in paths]
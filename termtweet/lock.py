@@ -0,0 +1,55 @@
+"""
+TermTweet Lock - Cross-process file locks for shared state under ~/.termtweet
+"""
+
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class LockUnavailable(Exception):
+    """Raised when a non-blocking lock is already held by another process."""
+
+class FileLock:
+    """Exclusive advisory lock on a file, released when the context exits."""
+
+    def __init__(self, path, blocking=True):
+        self.path = path
+        self.blocking = blocking
+        self._fd = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl:
+                flags = fcntl.LOCK_EX if self.blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                fcntl.flock(fd, flags)
+            else:
+                mode = msvcrt.LK_LOCK if self.blocking else msvcrt.LK_NBLCK
+                msvcrt.locking(fd, mode, 1)
+        except OSError:
+            os.close(fd)
+            raise LockUnavailable(self.path)
+        self._fd = fd
+        return self
+
+    def release(self):
+        if self._fd is None:
+            return
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,102 @@
+"""
+TermTweet Media Cache - Reuse media IDs for files that were already uploaded
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from termtweet.core import state_dir
+from termtweet.storage import SQLiteStore
+
+# Uploaded media can be attached for 24 hours unless the server says otherwise
+MEDIA_LIFETIME = 24 * 60 * 60
+# Stop handing out an ID this long before it expires, so the post still finds it alive
+EXPIRY_MARGIN = 60 * 60
+MAX_ENTRIES = 1000
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    account TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    media_id TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (account, digest)
+);
+CREATE INDEX IF NOT EXISTS media_last_used ON media (last_used);
+"""
+
+# Content hashes keyed by (path, size, mtime_ns), so unchanged files are read once per process
+_digests = {}
+
+def file_digest(path):
+    """Return the SHA-256 of a file's contents."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _digests.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                sha.update(chunk)
+        digest = _digests[key] = sha.hexdigest()
+    return digest
+
+class MediaCache(SQLiteStore):
+    """SQLite map from (account, content hash) to a live media ID, with LRU eviction.
+
+    Media IDs belong to the account that uploaded them, so the same file uploaded
+    from two profiles is cached twice. Safe to share between threads; several
+    processes may use the same file at once (WAL mode).
+    """
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        super().__init__(path or state_dir() / 'media.db', _SCHEMA, check_same_thread=False)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+    def get(self, account, path):
+        """Return the cached media ID for this file's contents, or None."""
+        digest = file_digest(path)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT media_id, expires_at FROM media WHERE account = ? AND digest = ?',
+                (account, digest)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] - EXPIRY_MARGIN <= now:
+                self.conn.execute('DELETE FROM media WHERE account = ? AND digest = ?', (account, digest))
+                return None
+            self.conn.execute('UPDATE media SET last_used = ? WHERE account = ? AND digest = ?',
+                              (now, account, digest))
+            return row[0]
+
+    def put(self, account, path, media_id, expires_after=None):
+        """Remember the media ID returned for this file, evicting the least recently used entries."""
+        digest = file_digest(path)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?)',
+                (account, digest, media_id, now + (expires_after or MEDIA_LIFETIME), now)
+            )
+            self.conn.execute(
+                'DELETE FROM media WHERE expires_at <= ? OR rowid NOT IN '
+                '(SELECT rowid FROM media ORDER BY last_used DESC LIMIT ?)',
+                (now, self.max_entries)
+            )
+
+    def discard(self, account, media_ids):
+        """Forget media IDs the server rejected."""
+        with self.lock:
+            self.conn.executemany('DELETE FROM media WHERE account = ? AND media_id = ?',
+                                  [(account, media_id) for media_id in media_ids])
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM media').fetchone()[0]
@@ -0,0 +1,256 @@
+"""
+TermTweet Metrics - In-process counters, histograms and gauges in Prometheus text format
+
+Metrics are always collected, at the cost of a lock and a dict update per
+event. They are exposed only when TERMTWEET_METRICS (or the --metrics flag)
+names a target: a port or host:port serves GET /metrics over HTTP, and
+anything else is a textfile rewritten every few seconds and at exit, for
+node_exporter's textfile collector.
+"""
+
+import atexit
+import bisect
+import os
+import re
+import threading
+import time
+
+from termtweet.storage import write_atomic
+
+# Upload and post latencies run from a cached lookup to a slow chunked video
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TEXTFILE_INTERVAL = 15.0
+DEFAULT_HOST = '127.0.0.1'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class _Metric:
+    """A named family of samples, one per combination of label values."""
+
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def value(self, **labels):
+        """Return the current value for these label values (0 if never set)."""
+        return self._values.get(self._key(labels), 0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            samples = sorted(self._values.items())
+        for key, value in samples:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. posts sent."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """A value that goes up and down, e.g. requests in flight."""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+class _Timer:
+    """Context manager that observes its elapsed time into a histogram."""
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self._started, **self.labels)
+        return False
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, e.g. seconds per upload."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            state['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            state['sum'] += value
+
+    def time(self, **labels):
+        """Time a block: with UPLOAD_SECONDS.time(): ..."""
+        return _Timer(self, labels)
+
+    def value(self, **labels):
+        """Return (count, sum) for these label values."""
+        state = self._values.get(self._key(labels))
+        return (sum(state['counts']), state['sum']) if state else (0, 0.0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            samples = sorted((key, list(state['counts']), state['sum']) for key, state in self._values.items())
+        for key, counts, total in samples:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labels, key, [('le', _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    """The set of metrics exposed together."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        for metric in self._metrics:
+            metric.reset()
+
+REGISTRY = Registry()
+
+POSTS = REGISTRY.register(Counter(
+    'termtweet_posts_total', "Posts attempted, by result (ok or failed).", ('result',)))
+UPLOADS = REGISTRY.register(Counter(
+    'termtweet_uploads_total', "Media uploads, by result (ok, cached or failed).", ('result',)))
+FAILURES = REGISTRY.register(Counter(
+    'termtweet_failures_total',
+    "Failed posts, uploads and deletes, by operation and error class "
+    "(transient, rate_limited, fatal, duplicate, invalid, processing).", ('operation', 'kind')))
+HTTP_RESPONSES = REGISTRY.register(Counter(
+    'termtweet_http_responses_total', "API responses, by endpoint and status code.", ('endpoint', 'code')))
+POST_SECONDS = REGISTRY.register(Histogram(
+    'termtweet_post_seconds', "Time to post a tweet, including retries."))
+UPLOAD_SECONDS = REGISTRY.register(Histogram(
+    'termtweet_upload_seconds', "Time to upload one media file, including retries."))
+RATE_LIMIT_REMAINING = REGISTRY.register(Gauge(
+    'termtweet_rate_limit_remaining', "Calls left in the current rate-limit window, by endpoint.",
+    ('endpoint',)))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    'termtweet_requests_in_flight', "API requests sent and not yet answered."))
+
+def failure(operation, error):
+    """Count a failed operation under its error class (an exception, or a kind string)."""
+    if isinstance(error, BaseException):
+        from termtweet.retry import classify
+        error = classify(error)
+    FAILURES.inc(operation=operation, kind=error)
+
+def write_textfile(path, registry=REGISTRY):
+    """Atomically write the registry to path, so a collector never reads a torn file."""
+    write_atomic(path, registry.render())
+
+def serve(host=DEFAULT_HOST, port=0, registry=REGISTRY):
+    """Serve the registry at http://host:port/metrics from a daemon thread and return the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='termtweet-metrics').start()
+    return server
+
+def _write_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_textfile(path)
+        except OSError:
+            pass
+
+def configure(target, interval=TEXTFILE_INTERVAL):
+    """Expose metrics at target: '9464', ':9464' or 'host:port' for HTTP, else a textfile path.
+
+    Raises OSError if the port cannot be bound or the textfile cannot be written.
+    """
+    match = re.fullmatch(r'(?:([\w.-]*):)?(\d+)', target)
+    if match:
+        return serve(match.group(1) or DEFAULT_HOST, int(match.group(2)))
+    path = os.path.abspath(target)
+    write_textfile(path)
+    atexit.register(write_textfile, path)
+    threading.Thread(target=_write_periodically, args=(path, interval), daemon=True,
+                     name='termtweet-metrics').start()
+    return path
@@ -0,0 +1,279 @@
+"""
+TermTweet Mock Server - Local stand-in for the tweet and media upload endpoints
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_RATE_WINDOW = 15 * 60
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answer the handful of endpoints TermTweet calls, in the shapes the real API uses."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None, endpoint=None, headers=None):
+        server = self.server
+        headers = dict(server.rate_limit_headers(endpoint) if endpoint else {}, **(headers or {}))
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, str(value))
+        if data:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method):
+        path = urlsplit(self.path).path
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        endpoint = f"{method} {path}"
+        self.server.count(endpoint)
+        self.server.delay()
+
+        if self.server.reject_credentials:
+            return self._reply(401, {'title': 'Unauthorized', 'status': 401, 'detail': 'Unauthorized'}, endpoint)
+        if self.server.exhausted(endpoint):
+            return self._reply(429, {'title': 'Too Many Requests', 'status': 429}, endpoint)
+        if random.random() < self.server.error_rate:
+            return self._reply(503, {'title': 'Service Unavailable', 'status': 503}, endpoint)
+
+        if endpoint == 'POST /2/tweets':
+            text = json.loads(body or b'{}').get('text', '')
+            return self._reply(201, {'data': self.server.add_tweet(text)}, endpoint)
+        if method == 'DELETE' and path.startswith('/2/tweets/'):
+            deleted = self.server.delete_tweet(path.rsplit('/', 1)[-1])
+            return self._reply(200, {'data': {'deleted': deleted}}, endpoint)
+        if method == 'GET' and re.fullmatch(r'/2/users/\w+/tweets', path):
+            return self._reply(200, self.server.timeline(parse_qs(urlsplit(self.path).query)), endpoint)
+        if endpoint == 'GET /2/users/me':
+            return self._reply(200, {'data': {'id': '1', 'name': 'Mock', 'username': 'mock'}}, endpoint,
+                               headers={'x-access-level': self.server.access_level})
+        if path == '/1.1/media/upload.json':
+            return self._media(method, body, endpoint)
+        return self._reply(404, {'title': 'Not Found', 'status': 404})
+
+    def _media(self, method, body, endpoint):
+        content_type = self.headers.get('Content-Type', '')
+        if method == 'GET':
+            fields = parse_qs(urlsplit(self.path).query)
+        elif content_type.startswith('application/x-www-form-urlencoded'):
+            fields = parse_qs(body.decode('utf-8'))
+        else:
+            # Multipart: either a simple upload or an APPEND segment
+            fields = {'command': ['APPEND']} if b'name="command"' in body else {}
+        command = fields.get('command', [None])[0]
+        media_id = fields.get('media_id', [None])[0]
+
+        if command == 'APPEND':
+            return self._reply(204, endpoint=endpoint)
+        if command in ('FINALIZE', 'STATUS'):
+            media = {'media_id': int(media_id), 'media_id_string': media_id, 'expires_after_secs': 86400}
+            info = self.server.process(media_id, checked=command == 'STATUS')
+            if info:
+                media['processing_info'] = info
+            return self._reply(200, media, endpoint)
+        media_id = self.server.next_id()
+        if command == 'INIT':
+            self.server.init_media(media_id, fields.get('media_category', [None])[0])
+        return self._reply(200 if command != 'INIT' else 202, {
+            'media_id': int(media_id), 'media_id_string': media_id,
+            'size': len(body), 'expires_after_secs': 86400,
+        }, endpoint)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+class MockAPIServer(ThreadingHTTPServer):
+    """Threaded HTTP server emulating api.twitter.com and upload.twitter.com.
+
+    latency adds a delay (seconds, +/- jitter) to every response, error_rate is
+    the fraction of requests answered with 503, and rate_limit caps calls per
+    endpoint per window, with x-rate-limit-* headers and 429s like the real API.
+    GIFs and videos uploaded with a tweet_gif/tweet_video media_category report
+    processing_checks STATUS polls as in progress (asking for check_after_secs)
+    before they succeed. reject_credentials answers every call with 401, and
+    access_level is reported by GET /2/users/me like the real API does.
+    Posted tweets are kept in .tweets and served back, newest first, by the
+    user timeline endpoint. Point TermTweet at it with TERMTWEET_API_BASE=server.url.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limit=None, rate_window=DEFAULT_RATE_WINDOW, processing_checks=0, check_after_secs=1,
+                 reject_credentials=False, access_level='read-write'):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.processing_checks = processing_checks
+        self.check_after_secs = check_after_secs
+        self.reject_credentials = reject_credentials
+        self.access_level = access_level
+        self.requests = {}
+        self.tweets = {}
+        self.media = {}
+        self._ids = itertools.count(1_000_000_000_000_000_000)
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_id(self):
+        with self._lock:
+            return str(next(self._ids))
+
+    def add_tweet(self, text, created_at=None):
+        """Store a tweet as if it had been posted and return its API representation."""
+        tweet_id = self.next_id()
+        tweet = {
+            'id': tweet_id,
+            'text': text,
+            'edit_history_tweet_ids': [tweet_id],
+            'created_at': datetime.fromtimestamp(created_at or time.time(), timezone.utc)
+                          .strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'public_metrics': {'retweet_count': 0, 'reply_count': 0, 'like_count': 0, 'quote_count': 0},
+        }
+        with self._lock:
+            self.tweets[tweet['id']] = tweet
+        return {'id': tweet_id, 'text': text, 'edit_history_tweet_ids': [tweet_id]}
+
+    def delete_tweet(self, tweet_id):
+        with self._lock:
+            return self.tweets.pop(tweet_id, None) is not None
+
+    def timeline(self, query):
+        """Answer a user timeline request: newest first, since_id, max_results and next_token."""
+        since_id = int(query.get('since_id', ['0'])[0])
+        # Tokens name the last ID returned, so deleting posts between pages skips nothing
+        below = int(query.get('pagination_token', [str(2 ** 63)])[0])
+        limit = int(query.get('max_results', ['10'])[0])
+        with self._lock:
+            ids = sorted((int(tweet_id) for tweet_id in self.tweets if since_id < int(tweet_id) < below),
+                         reverse=True)
+            page = [self.tweets[str(tweet_id)] for tweet_id in ids[:limit]]
+        meta = {'result_count': len(page)}
+        if page:
+            meta.update(newest_id=page[0]['id'], oldest_id=page[-1]['id'])
+        if len(ids) > limit:
+            meta['next_token'] = page[-1]['id']
+        return {'data': page, 'meta': meta} if page else {'meta': meta}
+
+    def init_media(self, media_id, category):
+        with self._lock:
+            self.media[media_id] = {'category': category, 'checks_left': self.processing_checks}
+
+    def process(self, media_id, checked):
+        """Return the processing_info for a FINALIZE or STATUS call, or None if there is none."""
+        with self._lock:
+            media = self.media.get(media_id)
+            if not media or media['category'] not in ('tweet_gif', 'tweet_video'):
+                return {'state': 'succeeded', 'progress_percent': 100} if checked else None
+            if checked and media['checks_left'] > 0:
+                media['checks_left'] -= 1
+            if media['checks_left'] <= 0 and (checked or not self.processing_checks):
+                return {'state': 'succeeded', 'progress_percent': 100}
+            done = self.processing_checks - media['checks_left']
+            return {'state': 'in_progress' if checked else 'pending', 'check_after_secs': self.check_after_secs,
+                    'progress_percent': 100 * done // max(1, self.processing_checks)}
+
+    def count(self, endpoint):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def delay(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+    def exhausted(self, endpoint):
+        """Spend one call from the endpoint's window; True if none were left."""
+        if self.rate_limit is None:
+            return False
+        with self._lock:
+            now = time.time()
+            reset, used = self._windows.get(endpoint, (0, 0))
+            if reset <= now:
+                reset, used = int(now + self.rate_window), 0
+            self._windows[endpoint] = (reset, used + 1)
+            return used >= self.rate_limit
+
+    def rate_limit_headers(self, endpoint):
+        if self.rate_limit is None:
+            return {}
+        with self._lock:
+            reset, used = self._windows.get(endpoint, (int(time.time() + self.rate_window), 0))
+        return {
+            'x-rate-limit-limit': self.rate_limit,
+            'x-rate-limit-remaining': max(0, self.rate_limit - used),
+            'x-rate-limit-reset': reset,
+        }
+
+    def start(self):
+        """Serve in a background thread and return self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def main():
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local mock of the X API endpoints TermTweet uses")
+    parser.add_argument('--port', type=int, default=8123)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds on top of --latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail with 503')
+    parser.add_argument('--rate-limit', type=int, help='Calls allowed per endpoint per window')
+    parser.add_argument('--rate-window', type=int, default=DEFAULT_RATE_WINDOW, help='Window length in seconds')
+    parser.add_argument('--processing-checks', type=int, default=0,
+                        help='STATUS polls before an uploaded GIF or video is ready')
+    args = parser.parse_args()
+
+    server = MockAPIServer(port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           rate_limit=args.rate_limit, rate_window=args.rate_window,
+                           processing_checks=args.processing_checks)
+    print(f"Mock API listening on {server.url}")
+    print(f"Run TermTweet against it with: TERMTWEET_API_BASE={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
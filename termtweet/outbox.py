@@ -0,0 +1,192 @@
+"""
+TermTweet Outbox - Durable on-disk queue of posts and the worker that drains it
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from termtweet.core import DEFAULT_PROFILE, active_profile, media_paths, state_dir
+from termtweet.lock import FileLock, LockUnavailable
+from termtweet.retry import FATAL
+from termtweet.storage import SQLiteStore
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 5.0
+MAX_RETRY_DELAY = 300.0
+POLL_INTERVAL = 2.0
+# Error classes that fail the same way on every attempt
+PERMANENT = (FATAL, 'duplicate', 'invalid')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile TEXT NOT NULL DEFAULT 'default',
+    text TEXT NOT NULL,
+    images TEXT NOT NULL DEFAULT '[]',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    tweet_id TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id);
+"""
+
+class Outbox(SQLiteStore):
+    """SQLite-backed queue of posts (WAL mode) under the TermTweet state directory.
+
+    Items move pending -> sending -> done (or failed). Each transition is a single
+    transaction, so a crash leaves every item in a well-defined state. Delivery is
+    at-least-once: a worker killed between posting and mark_done() retries that post.
+    Each item remembers the profile it was queued from.
+    """
+
+    def __init__(self, path=None):
+        super().__init__(path or state_dir() / 'outbox.db', _SCHEMA)
+        self.conn.row_factory = sqlite3.Row
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(outbox)')}
+        if 'profile' not in columns:
+            # Queues written before profiles were stored were drained with the default account
+            self.conn.execute(f"ALTER TABLE outbox ADD COLUMN profile TEXT NOT NULL DEFAULT '{DEFAULT_PROFILE}'")
+
+    def enqueue(self, text, image_paths=None, profile=None):
+        """Add a post to the end of the queue and return its ID."""
+        images = [os.path.abspath(path) for path in media_paths(image_paths)]
+        now = time.time()
+        cursor = self.conn.execute(
+            'INSERT INTO outbox (profile, text, images, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+            (profile or active_profile(), text, json.dumps(images), now, now)
+        )
+        return cursor.lastrowid
+
+    def recover(self):
+        """Return items left in 'sending' by a crashed worker to the queue."""
+        cursor = self.conn.execute(
+            "UPDATE outbox SET status = 'pending', updated_at = ? WHERE status = 'sending'",
+            (time.time(),)
+        )
+        return cursor.rowcount
+
+    def claim(self):
+        """Atomically mark the oldest pending item as sending and return it, or None."""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = self.conn.execute(
+                "SELECT * FROM outbox WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE outbox SET status = 'sending', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (time.time(), row['id'])
+                )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        if row is None:
+            return None
+        item = dict(row)
+        item['images'] = json.loads(item['images'])
+        item['attempts'] += 1
+        return item
+
+    def mark_done(self, item_id, tweet_id):
+        """Record a successful post."""
+        self.conn.execute(
+            "UPDATE outbox SET status = 'done', tweet_id = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (tweet_id, time.time(), item_id)
+        )
+
+    def mark_failed(self, item_id, error, retry=True):
+        """Record a failed attempt, returning the item to the queue if it may be retried."""
+        status = 'pending' if retry else 'failed'
+        self.conn.execute(
+            'UPDATE outbox SET status = ?, error = ?, updated_at = ? WHERE id = ?',
+            (status, error, time.time(), item_id)
+        )
+
+    def counts(self):
+        """Return the number of items in each status."""
+        rows = self.conn.execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+def drain(outbox, get_client, follow=False, sleep=time.sleep):
+    """Post queued items in order, each through get_client(profile)'s TermTweetClient.
+
+    An item whose profile has no credentials, or whose post failed permanently
+    (bad credentials, invalid or duplicate text), is marked failed at once. Any
+    other failed item stays at the head of the queue and is retried with backoff
+    so later posts never overtake it; after MAX_ATTEMPTS it is marked failed and
+    skipped. A duplicate refusal on a later attempt means an earlier attempt (e.g.
+    one interrupted by a crash) got through, so the item is marked done. Without
+    follow, returns once the queue is empty. Returns the number of items posted.
+    """
+    posted = 0
+    delay = RETRY_DELAY
+    while True:
+        item = outbox.claim()
+        if item is None:
+            if not follow:
+                return posted
+            sleep(POLL_INTERVAL)
+            continue
+
+        client = get_client(item['profile'])
+        if client is None:
+            error = f"No credentials found for profile '{item['profile']}'."
+            outbox.mark_failed(item['id'], error, retry=False)
+            print(f"❌ [#{item['id']}] {error}")
+            continue
+
+        result = client.tweet(item['text'], item['images'])
+        if result.ok:
+            outbox.mark_done(item['id'], result.tweet_id)
+            print(f"✅ [#{item['id']}] {result.tweet_id}")
+            posted += 1
+            delay = RETRY_DELAY
+            continue
+
+        if result.kind == 'duplicate' and item['attempts'] > 1:
+            outbox.mark_done(item['id'], None)
+            print(f"✅ [#{item['id']}] Already posted by an earlier attempt")
+            posted += 1
+            continue
+        if result.kind in PERMANENT:
+            outbox.mark_failed(item['id'], result.error, retry=False)
+            print(f"❌ [#{item['id']}] {result.error}")
+            continue
+
+        retry = item['attempts'] < MAX_ATTEMPTS
+        outbox.mark_failed(item['id'], result.error, retry=retry)
+        if not retry:
+            print(f"❌ [#{item['id']}] Giving up after {item['attempts']} attempts: {result.error}")
+            continue
+        print(f"⚠️  [#{item['id']}] {result.error} (retrying in {delay:.0f}s)")
+        sleep(delay)
+        delay = min(delay * 2, MAX_RETRY_DELAY)
+
+def run_worker(follow=False):
+    """Drain the outbox from the CLI, allowing only one worker at a time."""
+    try:
+        with FileLock(str(state_dir() / 'outbox.lock'), blocking=False):
+            with Outbox() as outbox:
+                recovered = outbox.recover()
+                if recovered:
+                    print(f"♻️  Resuming {recovered} post(s) interrupted by a previous worker")
+
+                from termtweet.profiles import get_client
+
+                try:
+                    posted = drain(outbox, get_client, follow=follow)
+                except KeyboardInterrupt:
+                    print("Worker stopped.")
+                    return True
+                counts = outbox.counts()
+                print(f"Outbox drained: {posted} posted, {counts.get('failed', 0)} failed in total.")
+                return True
+    except LockUnavailable:
+        print("❌ Another outbox worker is already running.")
+        return False
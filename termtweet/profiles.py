@@ -0,0 +1,64 @@
+"""
+TermTweet Profiles - Post to several accounts at once
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from termtweet.core import DEFAULT_PROFILE, load_credentials, state_dir
+
+# One client per profile, reused for the life of the process
+_clients = {}
+_clients_lock = threading.Lock()
+
+def list_profiles():
+    """Return the names of all configured profiles, 'default' first if it exists."""
+    names = sorted(path.stem for path in (state_dir() / 'profiles').glob('*.env'))
+    if load_credentials(DEFAULT_PROFILE):
+        names.insert(0, DEFAULT_PROFILE)
+    return names
+
+def get_client(profile):
+    """Return the cached TermTweetClient for a profile, building it on first use."""
+    from termtweet.client import TermTweetClient
+
+    with _clients_lock:
+        client = _clients.get(profile)
+        if client is None:
+            creds = load_credentials(profile)
+            if not creds:
+                return None
+            client = _clients[profile] = TermTweetClient(*creds)
+        return client
+
+def post_to_profiles(text, image_paths=None, profiles=None):
+    """Post the same tweet from every profile concurrently. Returns {profile: TweetResult}."""
+    from termtweet.client import TweetResult
+    from termtweet.retry import FATAL
+
+    profiles = profiles or list_profiles()
+
+    def post(profile):
+        client = get_client(profile)
+        if client is None:
+            return TweetResult(text, error=f"No credentials found for profile '{profile}'.", kind=FATAL)
+        return client.tweet(text, image_paths)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(profiles))) as pool:
+        return dict(zip(profiles, pool.map(post, profiles)))
+
+def run_fanout(text, image_paths=None):
+    """Post to all profiles from the CLI, printing one line per account."""
+    profiles = list_profiles()
+    if not profiles:
+        print("❌ No profiles found. Run 'termtweet --setup --profile NAME' to add one.")
+        return False
+
+    print(f"📣 Posting to {len(profiles)} profiles: {', '.join(profiles)}")
+    results = post_to_profiles(text, image_paths, profiles)
+    for profile, result in results.items():
+        if result.ok:
+            print(f"✅ [{profile}] {result.tweet_id}")
+        else:
+            print(f"❌ [{profile}] {result.error}")
+    return all(result.ok for result in results.values())
@@ -0,0 +1,197 @@
+"""
+TermTweet Rate Limit - Host-wide rate limiting driven by x-rate-limit-* headers
+"""
+
+import ipaddress
+import os
+import re
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from termtweet import metrics, trace
+from termtweet.core import state_dir
+from termtweet.lock import FileLock
+from termtweet.storage import load_json, save_json_atomic
+
+# Longest we will block waiting for a window to reset before giving up
+MAX_WAIT = 15 * 60
+# Below this many remaining calls, spread the rest evenly over the window
+LOW_WATER = 5
+# Hosts that TERMTWEET_API_BASE (e.g. the mock server) stands in for
+API_HOSTS = ('api.twitter.com', 'upload.twitter.com', 'api.x.com', 'upload.x.com')
+
+class RateLimitExceeded(Exception):
+    """Raised when the next allowed call is further away than the caller will wait."""
+
+    def __init__(self, endpoint, wait):
+        super().__init__(f"Rate limit for {endpoint} reached; resets in {wait:.0f}s")
+        self.endpoint = endpoint
+        self.wait = wait
+
+def endpoint_key(method, url):
+    """Name the rate-limited endpoint of a request, e.g. 'POST /2/tweets'."""
+    path = urlsplit(url).path
+    if path.endswith('.json'):
+        path = path[:-5]
+    path = re.sub(r'/\d{5,}(?=/|$)', '/:id', path)  # tweet and user IDs
+    return f"{method.upper()} {path}"
+
+def account_key(access_token):
+    """Identify the account behind an access token (its numeric user ID prefix)."""
+    return (access_token or '').split('-', 1)[0] or 'app'
+
+def _paths():
+    directory = state_dir()
+    return directory / 'ratelimit.json', str(directory / 'ratelimit.lock')
+
+def _load(path):
+    return load_json(path, {})
+
+def _save(path, state):
+    now = time.time()
+    # Forget buckets whose window has long passed
+    state = {key: bucket for key, bucket in state.items() if bucket['reset'] > now - 60}
+    save_json_atomic(path, state)
+
+def try_acquire(account, endpoint):
+    """Take one call from the shared bucket if allowed now, else return seconds to wait.
+
+    With no header data yet (or after the window resets) calls go straight
+    through. When the bucket is empty the call waits for the reset; when it is
+    running low, calls are spaced out across the rest of the window.
+    """
+    path, lock_path = _paths()
+    key = f"{account}:{endpoint}"
+    with FileLock(lock_path):
+        state = _load(path)
+        bucket = state.get(key)
+        now = time.time()
+        if bucket is None or bucket['reset'] <= now:
+            return 0
+        if bucket['remaining'] <= 0:
+            return bucket['reset'] - now
+        wait = bucket.get('next', 0) - now
+        if wait > 0:
+            return wait
+        bucket['remaining'] -= 1
+        if bucket['remaining'] < LOW_WATER:
+            bucket['next'] = now + (bucket['reset'] - now) / (bucket['remaining'] + 1)
+        _save(path, state)
+        return 0
+
+def acquire(account, endpoint, max_wait=MAX_WAIT, sleep=time.sleep):
+    """Block until the shared bucket allows one more call, or raise RateLimitExceeded."""
+    while True:
+        wait = try_acquire(account, endpoint)
+        if wait <= 0:
+            return
+        if wait > max_wait:
+            raise RateLimitExceeded(endpoint, wait)
+        sleep(wait)
+
+def record(account, endpoint, status, headers):
+    """Update the shared bucket from a response's status code and rate-limit headers."""
+    record_many(account, [(endpoint, status, headers)])
+
+def _limits(endpoint, status, headers):
+    """Return (remaining, reset) from a response, or None if it says nothing about the limit."""
+    metrics.HTTP_RESPONSES.inc(endpoint=endpoint, code=status)
+    try:
+        remaining = int(headers['x-rate-limit-remaining'])
+        reset = int(headers['x-rate-limit-reset'])
+    except (KeyError, TypeError, ValueError):
+        if status != 429:
+            return None
+        retry_after = headers.get('retry-after')
+        remaining, reset = 0, time.time() + (float(retry_after) if retry_after else 60)
+    if status == 429:
+        remaining = 0
+    metrics.RATE_LIMIT_REMAINING.set(remaining, endpoint=endpoint)
+    return remaining, reset
+
+def record_many(account, responses):
+    """Apply several (endpoint, status, headers) responses in order under one lock and write."""
+    updates = []
+    for endpoint, status, headers in responses:
+        limits = _limits(endpoint, status, headers)
+        if limits:
+            updates.append((f"{account}:{endpoint}",) + limits)
+    if not updates:
+        return
+
+    path, lock_path = _paths()
+    with FileLock(lock_path):
+        state = _load(path)
+        for key, remaining, reset in updates:
+            bucket = state.get(key)
+            next_call = 0
+            if bucket and bucket['reset'] == reset:
+                # Other processes may have spent calls since this response was generated
+                remaining = min(remaining, bucket['remaining'])
+                next_call = bucket.get('next', 0)
+            state[key] = {'remaining': remaining, 'reset': reset, 'next': next_call}
+        _save(path, state)
+
+def api_base():
+    """Return TERMTWEET_API_BASE, or None if unset.
+
+    Signed requests carry the account's OAuth credentials, so the base may only
+    name a loopback address such as the local mock server. Raises ValueError otherwise.
+    """
+    base = os.environ.get('TERMTWEET_API_BASE')
+    if not base:
+        return None
+    parts = urlsplit(base)
+    host = parts.hostname or ''
+    try:
+        loopback = host == 'localhost' or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if parts.scheme not in ('http', 'https') or not loopback:
+        raise ValueError(f"TERMTWEET_API_BASE must be a loopback URL such as http://127.0.0.1:8123, not {base!r}")
+    return base
+
+def redirect(url, base):
+    """Point an API URL at another base URL, keeping its path and query."""
+    parts = urlsplit(url)
+    if parts.hostname not in API_HOSTS:
+        return url
+    target = urlsplit(base)
+    return urlunsplit((target.scheme, target.netloc, parts.path, parts.query, parts.fragment))
+
+class RateLimitedSession(requests.Session):
+    """Session that passes every request through the host-wide rate limiter.
+
+    If TERMTWEET_API_BASE is set, API requests are sent there instead (used to
+    run against the local mock server); it must be a loopback address.
+    """
+
+    def __init__(self, account, max_wait=MAX_WAIT):
+        super().__init__()
+        self.account = account
+        self.max_wait = max_wait
+        self.api_base = api_base()
+
+    def request(self, method, url, *args, **kwargs):
+        if self.api_base:
+            url = redirect(url, self.api_base)
+        endpoint = endpoint_key(method, url)
+        with trace.span('http', endpoint=endpoint) as span:
+            started = time.perf_counter()
+            acquire(self.account, endpoint, self.max_wait)
+            span.set(rate_limit_wait_ms=round((time.perf_counter() - started) * 1000, 3))
+            metrics.IN_FLIGHT.inc()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            finally:
+                metrics.IN_FLIGHT.dec()
+            record(self.account, endpoint, response.status_code, response.headers)
+            if trace.enabled():
+                body = response.request.body
+                span.set(status=response.status_code, request_bytes=len(body) if body else 0,
+                         response_bytes=len(response.content))
+                if response.status_code >= 400:
+                    span.error(f"HTTP {response.status_code}")
+            return response
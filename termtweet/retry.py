@@ -0,0 +1,213 @@
+"""
+TermTweet Retry - Classified retries with backoff, Retry-After waits and a circuit breaker
+"""
+
+import random
+import threading
+import time
+
+from termtweet import trace
+
+ATTEMPTS = 4
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+# Longest Retry-After we will sleep through; matches the rate limiter's MAX_WAIT
+MAX_RETRY_WAIT = 15 * 60
+# Consecutive server errors or connection failures before the breaker opens
+FAILURE_THRESHOLD = 5
+COOLDOWN = 30.0
+
+TRANSIENT = 'transient'        # 5xx, connection resets, timeouts: back off and retry
+RATE_LIMITED = 'rate_limited'  # 429: wait for Retry-After or the window reset
+FATAL = 'fatal'                # auth, permission and other client errors: never retry
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an API that has been failing repeatedly."""
+
+    def __init__(self, failures, wait):
+        super().__init__(f"API unavailable after {failures} failures in a row; "
+                         f"not retrying for another {wait:.0f}s")
+        self.wait = wait
+
+def _chain(error):
+    """Yield an exception and the exceptions it was raised from (tweepy wraps connection errors)."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+def status_code(error):
+    """Return the HTTP status behind an exception, or None if no response was received."""
+    for cause in _chain(error):
+        response = getattr(cause, 'response', None)
+        status = getattr(response, 'status_code', None) or getattr(response, 'status', None)
+        if isinstance(status, int):
+            return status
+    return None
+
+def classify(error):
+    """Return TRANSIENT, RATE_LIMITED or FATAL for an exception from an API call."""
+    import requests
+    from termtweet.ratelimit import RateLimitExceeded
+
+    status = status_code(error)
+    if status is not None:
+        if status == 429:
+            return RATE_LIMITED
+        return TRANSIENT if status >= 500 else FATAL
+    for cause in _chain(error):
+        if isinstance(cause, (RateLimitExceeded, CircuitOpen)):
+            return FATAL  # already waited, or told to stop
+        if isinstance(cause, (ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout)):
+            return TRANSIENT
+    return FATAL
+
+def unsent(error):
+    """Return True if the request behind an exception never reached the server (connect failures)."""
+    import requests
+    from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+    for cause in _chain(error):
+        for candidate in (cause, getattr(cause, 'reason', None)):
+            if isinstance(candidate, (requests.ConnectTimeout, ConnectTimeoutError, NewConnectionError)):
+                return True
+    return False
+
+def retry_after(error, now=None):
+    """Return the seconds a 429 asks us to wait (Retry-After or x-rate-limit-reset), or None."""
+    for cause in _chain(error):
+        headers = getattr(getattr(cause, 'response', None), 'headers', None)
+        if not headers:
+            continue
+        try:
+            if headers.get('retry-after'):
+                return max(0.0, float(headers['retry-after']))
+            if headers.get('x-rate-limit-reset'):
+                return max(0.0, int(headers['x-rate-limit-reset']) - (now or time.time()))
+        except (TypeError, ValueError):
+            pass
+    return None
+
+class CircuitBreaker:
+    """Fail fast once an API keeps failing, then let a single trial call through.
+
+    After threshold consecutive transient failures the breaker opens and calls
+    raise CircuitOpen for cooldown seconds. The next call is a trial: any HTTP
+    response (even a 4xx) closes the breaker, a transient failure opens it
+    again. Safe to share between threads, e.g. across all workers of a batch.
+    """
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'open' if self.clock() - self.opened_at < self.cooldown else 'half_open'
+
+    def allow(self):
+        """Raise CircuitOpen unless a call may go ahead now."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.cooldown - self.clock()
+            if remaining > 0 or self._trial:
+                raise CircuitOpen(self.failures, max(remaining, 0))
+            self._trial = True
+
+    def success(self):
+        with self._lock:
+            self.failures, self.opened_at, self._trial = 0, None, False
+
+    def release(self):
+        """End a trial call that said nothing about the API's health, letting the next one try."""
+        with self._lock:
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.threshold:
+                self.opened_at = self.clock()
+
+class RetryPolicy:
+    """Call a function, retrying transient failures with full-jitter exponential backoff.
+
+    Rate-limited calls wait for the server's Retry-After or window reset instead,
+    and fatal errors (bad credentials, missing permissions, invalid requests) are
+    raised at once. Delays left as None follow the module constants. Use
+    call_once() for requests that must not be repeated once sent.
+    """
+
+    def __init__(self, attempts=None, base_delay=None, max_delay=None, max_wait=MAX_RETRY_WAIT,
+                 breaker=None, sleep=time.sleep):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.breaker = breaker
+        self.sleep = sleep
+
+    def delay(self, attempt, error, kind):
+        """Return how long to wait before retry number attempt."""
+        if kind == RATE_LIMITED:
+            wait = retry_after(error)
+            if wait is not None:
+                return wait
+        base = BASE_DELAY if self.base_delay is None else self.base_delay
+        cap = MAX_DELAY if self.max_delay is None else self.max_delay
+        return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+    def call(self, function, *args, **kwargs):
+        """Return function(*args, **kwargs), retrying as classified; re-raises the last error."""
+        return self._call(function, args, kwargs, lambda error, kind: kind != FATAL)
+
+    def call_once(self, function, *args, **kwargs):
+        """Like call(), for non-idempotent requests such as posting a tweet.
+
+        A read timeout or reset connection may come after the server acted, so
+        only failures where the request was never sent (connect errors) or was
+        explicitly refused (503, 429) are retried.
+        """
+        def retryable(error, kind):
+            return kind == RATE_LIMITED or status_code(error) == 503 or unsent(error)
+        return self._call(function, args, kwargs, retryable)
+
+    def _call(self, function, args, kwargs, retryable):
+        attempts = ATTEMPTS if self.attempts is None else self.attempts
+        attempt = 1
+        while True:
+            if self.breaker is not None:
+                self.breaker.allow()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                kind = classify(e)
+                if self.breaker is not None:
+                    if kind == TRANSIENT:
+                        self.breaker.failure()
+                    elif status_code(e) is not None:
+                        self.breaker.success()  # the API answered, so it is up
+                    else:
+                        self.breaker.release()
+                if not retryable(e, kind) or attempt >= attempts:
+                    raise
+                wait = self.delay(attempt, e, kind)
+                if wait > self.max_wait:
+                    raise
+                trace.current().set(retries=attempt)
+                self.sleep(wait)
+                attempt += 1
+            else:
+                if self.breaker is not None:
+                    self.breaker.success()
+                return result
@@ -0,0 +1,384 @@
+"""
+TermTweet Scheduler - Post at a given time from one long-running process
+"""
+
+import heapq
+import json
+import os
+import re
+import socket
+import sqlite3
+import time
+from datetime import datetime
+
+from termtweet.core import active_profile, media_paths, state_dir
+from termtweet.lock import FileLock, LockUnavailable
+from termtweet.storage import SQLiteStore
+
+# Media is uploaded this long before the due time, so posting is a single API call
+PRELOAD_LEAD = 5 * 60
+# Longest the runner sleeps without checking for posts scheduled by other processes
+RESCAN_INTERVAL = 60.0
+# Posts that fire this much after their due time are reported as late
+LATE_AFTER = 60.0
+
+_UNITS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    due_at REAL NOT NULL,
+    profile TEXT NOT NULL,
+    text TEXT NOT NULL,
+    images TEXT NOT NULL DEFAULT '[]',
+    status TEXT NOT NULL DEFAULT 'pending',
+    tweet_id TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scheduled_status ON scheduled (status, id);
+"""
+
+def parse_time(value, now=None):
+    """Turn '2026-10-20T09:00Z', '2026-10-20 09:00' (local) or '+90m' into a Unix timestamp.
+
+    Relative times take s, m, h or d. Raises ValueError for anything else.
+    """
+    value = value.strip()
+    match = re.fullmatch(r'\+(\d+(?:\.\d+)?)([smhd])', value)
+    if match:
+        return (time.time() if now is None else now) + float(match.group(1)) * _UNITS[match.group(2)]
+    if value[-1:] in ('Z', 'z'):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Unrecognized time '{value}'. Use ISO 8601 like 2026-10-20T09:00Z, or +30m")
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).astimezone().strftime('%Y-%m-%d %H:%M %Z')
+
+def _wake_path():
+    return str(state_dir() / 'scheduler.sock')
+
+def notify():
+    """Wake a running scheduler so it picks up newly scheduled posts at once."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.sendto(b'!', _wake_path())
+    except OSError:
+        pass  # no scheduler running; it will find the post when it starts
+    finally:
+        sock.close()
+
+class Schedule(SQLiteStore):
+    """SQLite store of scheduled posts (WAL mode) under the TermTweet state directory.
+
+    Items move pending -> sending -> done (or failed), like the outbox. Each item
+    remembers the profile it was scheduled from.
+    """
+
+    def __init__(self, path=None):
+        super().__init__(path or state_dir() / 'schedule.db', _SCHEMA)
+        self.conn.row_factory = sqlite3.Row
+
+    def add(self, text, image_paths=None, due_at=None, profile=None):
+        """Schedule one post and return its ID."""
+        return self.add_many([(due_at, text, image_paths)], profile)[0]
+
+    def add_many(self, entries, profile=None):
+        """Schedule (due_at, text, image_paths) entries in one transaction and return their IDs."""
+        profile = profile or active_profile()
+        now = time.time()
+        ids = []
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for due_at, text, image_paths in entries:
+                images = [os.path.abspath(path) for path in media_paths(image_paths)]
+                cursor = self.conn.execute(
+                    'INSERT INTO scheduled (due_at, profile, text, images, created_at, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (due_at, profile, text, json.dumps(images), now, now)
+                )
+                ids.append(cursor.lastrowid)
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return ids
+
+    def pending(self, after_id=0):
+        """Yield (id, due_at, has_images) for pending items added after after_id."""
+        rows = self.conn.execute(
+            "SELECT id, due_at, images != '[]' FROM scheduled WHERE status = 'pending' AND id > ? ORDER BY id",
+            (after_id,)
+        )
+        for row in rows:
+            yield row[0], row[1], bool(row[2])
+
+    def get(self, item_id):
+        """Return a pending item as a dict, or None if it was posted, failed or cancelled."""
+        row = self.conn.execute("SELECT * FROM scheduled WHERE id = ? AND status = 'pending'",
+                                (item_id,)).fetchone()
+        if row is None:
+            return None
+        item = dict(row)
+        item['images'] = json.loads(item['images'])
+        return item
+
+    def claim(self, item_id):
+        """Mark a pending item as sending and return it, or None if it is no longer pending."""
+        cursor = self.conn.execute(
+            "UPDATE scheduled SET status = 'sending', updated_at = ? WHERE id = ? AND status = 'pending'",
+            (time.time(), item_id)
+        )
+        if not cursor.rowcount:
+            return None
+        row = self.conn.execute('SELECT * FROM scheduled WHERE id = ?', (item_id,)).fetchone()
+        item = dict(row)
+        item['images'] = json.loads(item['images'])
+        return item
+
+    def recover(self):
+        """Return items left in 'sending' by a crashed scheduler to pending."""
+        cursor = self.conn.execute(
+            "UPDATE scheduled SET status = 'pending', updated_at = ? WHERE status = 'sending'",
+            (time.time(),)
+        )
+        return cursor.rowcount
+
+    def mark_done(self, item_id, tweet_id):
+        self.conn.execute(
+            "UPDATE scheduled SET status = 'done', tweet_id = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (tweet_id, time.time(), item_id)
+        )
+
+    def mark_failed(self, item_id, error):
+        self.conn.execute(
+            "UPDATE scheduled SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+            (error, time.time(), item_id)
+        )
+
+    def counts(self):
+        """Return the number of items in each status."""
+        rows = self.conn.execute('SELECT status, COUNT(*) FROM scheduled GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+class _Waker:
+    """Sleep for a timeout, returning early when another process calls notify()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.sock = None
+        if hasattr(socket, 'AF_UNIX'):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if os.path.exists(path):
+                    os.unlink(path)  # only one scheduler runs, so this one is stale
+                sock.bind(path)
+                self.sock = sock
+            except OSError:
+                sock.close()  # fall back to rescanning every RESCAN_INTERVAL
+
+    def wait(self, timeout):
+        if self.sock is None:
+            time.sleep(timeout)
+            return
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.recv(16)
+        except socket.timeout:
+            return
+        # Several posts may have been scheduled at once; one rescan covers them all
+        self.sock.setblocking(False)
+        try:
+            while self.sock.recv(16):
+                pass
+        except OSError:
+            pass
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+_PRELOAD, _POST = 0, 1
+
+class Scheduler:
+    """Fire scheduled posts from a heap of (time, action, id) events.
+
+    The runner sleeps until the earliest event instead of polling. Posts with
+    media get a second, earlier event that uploads the media, so the media IDs
+    are in the media cache when the post fires. get_client(profile) returns the
+    TermTweetClient for an item's profile.
+    """
+
+    def __init__(self, schedule, get_client, lead=PRELOAD_LEAD, clock=time.time):
+        self.schedule = schedule
+        self.get_client = get_client
+        self.lead = lead
+        self.clock = clock
+        self.heap = []
+        self.last_id = 0
+        self.posted = 0
+
+    def load(self):
+        """Add events for items scheduled since the last load."""
+        now = self.clock()
+        for item_id, due_at, has_images in self.schedule.pending(self.last_id):
+            self.last_id = max(self.last_id, item_id)
+            if has_images and due_at > now:
+                heapq.heappush(self.heap, (max(now, due_at - self.lead), _PRELOAD, item_id))
+            heapq.heappush(self.heap, (due_at, _POST, item_id))
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def run_due(self):
+        """Handle every event that is due now."""
+        while self.heap and self.heap[0][0] <= self.clock():
+            _, action, item_id = heapq.heappop(self.heap)
+            if action == _PRELOAD:
+                self._preload(item_id)
+            else:
+                self._post(item_id)
+
+    def _preload(self, item_id):
+        item = self.schedule.get(item_id)
+        client = item and self.get_client(item['profile'])
+        if client is None:
+            return
+        for media in client.upload_all(item['images']):
+            if not media.ok:
+                # Not fatal: the post uploads whatever is missing when it fires
+                print(f"⚠️  [#{item_id}] Pre-upload failed: {media.error}", flush=True)
+
+    def _post(self, item_id):
+        item = self.schedule.claim(item_id)
+        if item is None:
+            return
+        client = self.get_client(item['profile'])
+        if client is None:
+            self.schedule.mark_failed(item_id, f"No credentials found for profile '{item['profile']}'.")
+            print(f"❌ [#{item_id}] No credentials found for profile '{item['profile']}'.", flush=True)
+            return
+        result = client.tweet(item['text'], item['images'])
+        late = self.clock() - item['due_at']
+        note = f" (late by {late:.0f}s)" if late > LATE_AFTER else ""
+        if result.ok:
+            self.schedule.mark_done(item_id, result.tweet_id)
+            self.posted += 1
+            print(f"✅ [#{item_id}] {result.tweet_id}{note}", flush=True)
+        else:
+            self.schedule.mark_failed(item_id, result.error)
+            print(f"❌ [#{item_id}] {result.error}{note}", flush=True)
+
+    def run(self, wait, follow=True):
+        """Run until no events are left (or forever with follow), sleeping with wait(seconds)."""
+        while True:
+            self.load()
+            self.run_due()
+            due = self.next_due()
+            if due is None and not follow:
+                return self.posted
+            timeout = RESCAN_INTERVAL if due is None else min(max(0.0, due - self.clock()), RESCAN_INTERVAL)
+            wait(timeout)
+
+def due_time(value, now=None):
+    """Parse a --at or "at" value that must lie in the future; raises ValueError otherwise."""
+    now = time.time() if now is None else now
+    due_at = parse_time(value, now)
+    if due_at <= now:
+        raise ValueError(f"{format_time(due_at)} is in the past.")
+    return due_at
+
+def load_schedule(path):
+    """Load {text, images, due_at} records from a JSONL or CSV file with an "at" column."""
+    from termtweet.batch import make_record, read_rows
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    records = []
+    for index, row in enumerate(read_rows(path), 1):
+        record = make_record(row, base_dir)
+        try:
+            record['due_at'] = due_time(row.get('at') or '')
+        except ValueError as e:
+            raise ValueError(f"Record {index}: {e}")
+        records.append(record)
+    return records
+
+def schedule_post(text, image_paths, at):
+    """Schedule one post from the CLI."""
+    try:
+        due_at = due_time(at)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    with Schedule() as schedule:
+        item_id = schedule.add(text, image_paths, due_at)
+    notify()
+    print(f"🗓️  Scheduled #{item_id} for {format_time(due_at)}. Run 'termtweet --scheduler' to post it.")
+    return True
+
+def schedule_file(path, dry_run=False):
+    """Validate and schedule every record in a schedule file from the CLI."""
+    from termtweet.batch import validate_records
+    from termtweet.dedupe import allowed
+
+    try:
+        records = load_schedule(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read schedule file '{path}': {e}")
+        return False
+    if not records:
+        print(f"❌ Schedule file '{path}' contains no posts.")
+        return False
+
+    problems = validate_records(records, allow_duplicates=allowed())
+    if problems:
+        for index, error in problems:
+            print(f"❌ [{index}] {error}")
+        print("Schedule validation failed. Nothing was scheduled.")
+        return False
+    first, last = min(r['due_at'] for r in records), max(r['due_at'] for r in records)
+    if dry_run:
+        print(f"[DRY RUN] {len(records)} posts are valid, {format_time(first)} to {format_time(last)}.")
+        return True
+
+    with Schedule() as schedule:
+        schedule.add_many((r['due_at'], r['text'], r['images']) for r in records)
+    notify()
+    print(f"🗓️  Scheduled {len(records)} posts, {format_time(first)} to {format_time(last)}.")
+    return True
+
+def run_scheduler(follow=True):
+    """Run the scheduler from the CLI, allowing only one at a time."""
+    from termtweet.profiles import get_client
+
+    try:
+        with FileLock(str(state_dir() / 'scheduler.lock'), blocking=False):
+            with Schedule() as schedule:
+                recovered = schedule.recover()
+                if recovered:
+                    print(f"♻️  Resuming {recovered} post(s) interrupted by a previous scheduler")
+                counts = schedule.counts()
+                print(f"🗓️  Scheduler running with {counts.get('pending', 0)} pending post(s) (Ctrl+C to stop)",
+                      flush=True)
+                waker = _Waker(_wake_path())
+                try:
+                    Scheduler(schedule, get_client).run(waker.wait, follow=follow)
+                except KeyboardInterrupt:
+                    print("Scheduler stopped.")
+                finally:
+                    waker.close()
+                return True
+    except LockUnavailable:
+        print("❌ Another scheduler is already running.")
+        return False
@@ -0,0 +1,54 @@
+"""
+TermTweet Storage - Crash-safe state files under ~/.termtweet
+"""
+
+import json
+import os
+import sqlite3
+
+def load_json(path, default=None):
+    """Return the JSON stored at path, or default if it is missing or unreadable."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def write_atomic(path, data):
+    """Atomically replace path with data (str or bytes), so no reader sees a torn file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def save_json_atomic(path, data):
+    """Atomically write data to path as JSON."""
+    write_atomic(path, json.dumps(data))
+
+def open_db(path, schema, check_same_thread=True):
+    """Open (creating if needed) a WAL-mode SQLite database in autocommit mode and apply schema."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=check_same_thread)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(schema)
+    return conn
+
+class SQLiteStore:
+    """Base for the state stores kept in one SQLite file each; closes it when the context exits."""
+
+    def __init__(self, path, schema, check_same_thread=True):
+        self.path = str(path)
+        self.conn = open_db(self.path, schema, check_same_thread=check_same_thread)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,139 @@
+"""
+TermTweet Stream - Post records piped in on stdin as they arrive
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from termtweet.batch import DEFAULT_CONCURRENCY, make_record
+from termtweet.core import validate_tweet
+
+def iter_records(lines, base_dir=None):
+    """Yield (line_no, record, error) for each non-blank line, reading lazily.
+
+    Lines starting with '{' are JSON objects like batch file rows; any other
+    line is the tweet text itself.
+    """
+    base_dir = base_dir or os.getcwd()
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith('{'):
+            yield line_no, {'text': line, 'images': []}, None
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"invalid JSON ({e})"
+            continue
+        record = make_record(data, base_dir)
+        yield line_no, record, record.get('error')
+
+def _check(record, error):
+    """Return the problems with a parsed line as one message, or None."""
+    if error:
+        return error
+    return '; '.join(validate_tweet(record['text'], record['images'])) or None
+
+def _report(line_no, tweet_id, error, seconds):
+    if error:
+        print(f"❌ [{line_no}] {error}", flush=True)
+    else:
+        print(f"✅ [{line_no}] {tweet_id} ({seconds:.2f}s)", flush=True)
+
+def post_stream(lines, client, max_in_flight=DEFAULT_CONCURRENCY, report=_report):
+    """Post records from an iterable of lines with at most max_in_flight posts at once.
+
+    The next line is only read once a slot is free, so a slow API stalls the
+    reader instead of growing a backlog, and memory stays flat however long the
+    stream runs. Results are passed to report(line_no, tweet_id, error, seconds)
+    as posts finish. Ctrl+C stops reading and waits for the posts in flight; a
+    second Ctrl+C stops waiting. Returns a dict of counts.
+    """
+    stats = {'read': 0, 'posted': 0, 'failed': 0, 'invalid': 0, 'in_flight': 0, 'interrupted': False}
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(max_in_flight)
+
+    def done(line_no, started, future):
+        try:
+            posted = future.result()
+            tweet_id, error = posted.tweet_id, posted.error
+        except Exception as e:
+            tweet_id, error = None, str(e)
+        with lock:
+            stats['in_flight'] -= 1
+            stats['failed' if error else 'posted'] += 1
+            report(line_no, tweet_id, error, time.perf_counter() - started)
+        slots.release()
+
+    pool = ThreadPoolExecutor(max_workers=max_in_flight)
+    try:
+        for line_no, record, error in iter_records(lines):
+            stats['read'] += 1
+            error = _check(record, error)
+            if error:
+                with lock:
+                    stats['invalid'] += 1
+                    report(line_no, None, error, 0.0)
+                continue
+            slots.acquire()
+            with lock:
+                stats['in_flight'] += 1
+            future = pool.submit(client.tweet, record['text'], record['images'])
+            future.add_done_callback(functools.partial(done, line_no, time.perf_counter()))
+    except KeyboardInterrupt:
+        stats['interrupted'] = True
+        print(f"\n⏹️  Stopped reading. Waiting for {stats['in_flight']} posts in flight "
+              "(Ctrl+C again to stop waiting)...", flush=True)
+
+    try:
+        pool.shutdown(wait=True)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False)
+    return stats
+
+def run_stream(stream=None, concurrency=DEFAULT_CONCURRENCY, dry_run=False, creds=None):
+    """Read posts from stdin (or stream) until EOF or Ctrl+C, printing a summary."""
+    stream = stream or sys.stdin
+    lines = iter(stream.readline, '')
+
+    if dry_run:
+        valid = invalid = 0
+        for line_no, record, error in iter_records(lines):
+            error = _check(record, error)
+            if error:
+                invalid += 1
+                _report(line_no, None, error, 0.0)
+            else:
+                valid += 1
+                print(f"✅ [{line_no}] valid: {record['text']}", flush=True)
+        print(f"[DRY RUN] {valid} valid, {invalid} invalid. Nothing was posted.")
+        return invalid == 0
+
+    # Imported here so that --dry-run never loads tweepy
+    from termtweet.client import TermTweetClient
+
+    client = TermTweetClient.from_credentials(creds, pool_size=max(1, concurrency))
+    if not client:
+        print("❌ No credentials found. Run 'termtweet --setup' to configure.")
+        return False
+
+    print(f"📡 Posting lines from stdin, up to {concurrency} at once. Ctrl+C to stop.", flush=True)
+    started = time.perf_counter()
+    with client:
+        stats = post_stream(lines, client, concurrency)
+    elapsed = time.perf_counter() - started
+
+    summary = f"Posted {stats['posted']}/{stats['read']} in {elapsed:.1f}s"
+    if stats['failed'] or stats['invalid']:
+        summary += f" ({stats['failed']} failed, {stats['invalid']} invalid)"
+    if stats['in_flight']:
+        summary += f", {stats['in_flight']} still in flight when stopped"
+    print(summary)
+    return stats['posted'] == stats['read']
@@ -0,0 +1,93 @@
+"""
+TermTweet Text - Weighted tweet length, counted the way the platform counts it
+"""
+
+import re
+import unicodedata
+
+MAX_TWEET_LENGTH = 280
+# Every link is shortened to a t.co URL of this length
+URL_LENGTH = 23
+
+# twitter-text v3: code points in these ranges weigh 1, everything else
+# (CJK, most symbols, emoji) weighs 2. A whole emoji sequence weighs 2.
+_LIGHT_RANGES = '\u0000-\u10ff\u2000-\u200d\u2010-\u201f\u2032-\u2037'
+_HEAVY = re.compile(f'[^{_LIGHT_RANGES}]+')
+
+# These patterns start with a character class or literal, so the regex engine
+# skips straight to candidate positions instead of trying every one.
+_EMOJI_BASE = '[\u2300-\u23ff\u2600-\u27bf\u2b00-\u2bff\U0001f000-\U0001faff]'
+_EMOJI_TAIL = '[\ufe0f\U0001f3fb-\U0001f3ff\U000e0020-\U000e007f]*'
+_EMOJI = re.compile(
+    f'{_EMOJI_BASE}'
+    '(?:(?<=[\U0001f1e6-\U0001f1ff])[\U0001f1e6-\U0001f1ff])?'  # flags are pairs
+    f'{_EMOJI_TAIL}(?:\u200d{_EMOJI_BASE}{_EMOJI_TAIL})*'  # skin tones, ZWJ sequences
+)
+_KEYCAP = re.compile('[0-9#*]\ufe0f?\u20e3')
+
+_TLDS = 'com|net|org|edu|gov|io|co|dev|app|ai|me|ly|gg|tv|info|xyz|uk|de|fr|jp'
+_URL_HINT = re.compile(f'://|\\.(?:{_TLDS})\\b', re.IGNORECASE)
+# The full link pattern only runs from the word where _URL_HINT found a likely link.
+# A link ends at whitespace, minus any trailing punctuation
+_URL_END = r"""(?:\S*[^\s.,:;!?)\]'"])?"""
+_URL = re.compile(
+    rf'https?://{_URL_END}'
+    rf'|(?<![\w@.])(?:[a-z0-9-]+\.)+(?:{_TLDS})\b(?:/{_URL_END})?',
+    re.IGNORECASE
+)
+
+def _unweighted(text):
+    """Length counting only the 1-or-2 code point weights."""
+    if text.isascii():
+        return len(text)
+    return len(text) + sum(map(len, _HEAVY.findall(text)))
+
+def weighted_length(text):
+    """Return the length of text as the platform counts it against the 280 limit."""
+    if text.isascii():
+        length = len(text)
+    else:
+        text = unicodedata.normalize('NFC', text)
+        length = _unweighted(text)
+        if length > len(text):
+            # Heavy code points present: count each emoji sequence as 2 in total
+            for match in _EMOJI.finditer(text):
+                length += 2 - _unweighted(match.group())
+            if '\u20e3' in text:
+                for match in _KEYCAP.finditer(text):
+                    length += 2 - _unweighted(match.group())
+
+    hint = '.' in text and _URL_HINT.search(text)
+    if hint:
+        start = text.rfind(' ', 0, hint.start()) + 1
+        for match in _URL.finditer(text, start):
+            length += URL_LENGTH - _unweighted(match.group())
+    return length
+
+def fits(text, limit=MAX_TWEET_LENGTH):
+    """Return True if text is non-empty and within the weighted limit."""
+    return bool(text) and weighted_length(text) <= limit
+
+def truncate(text, limit=MAX_TWEET_LENGTH):
+    """Return the longest prefix of text whose weighted length is within limit."""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if weighted_length(text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+def validate_many(drafts, limit=MAX_TWEET_LENGTH):
+    """Check an iterable of draft texts and return a list of (index, error) pairs.
+
+    Indexes start at 1, matching the batch file summaries.
+    """
+    problems = []
+    for index, length in enumerate(map(weighted_length, drafts), 1):
+        if length > limit:
+            problems.append((index, f"Tweet text is {length} characters long. Maximum is {limit} characters."))
+        elif length == 0:
+            problems.append((index, "Tweet text is empty."))
+    return problems
@@ -0,0 +1,182 @@
+"""
+TermTweet Thread - Split long text into a numbered thread and post it as replies
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from termtweet.core import media_paths
+from termtweet.text import MAX_TWEET_LENGTH, truncate, weighted_length
+
+# Uploads for this many parts may run ahead of the post chain
+UPLOAD_AHEAD = 4
+
+# A line containing only '---' forces a new part
+_PART_BREAK = re.compile(r'\n[ \t]*---[ \t]*\n')
+# Sentence ends and line breaks, captured so the original separator is kept
+_SENTENCE = re.compile(r'((?<=[.!?])[ \t]+|[ \t]*\n\s*)')
+_WORD = re.compile(r'(\s+)')
+# '--image N:path' attaches an image to part N of a thread
+_PART_IMAGE = re.compile(r'(\d+):(.+)')
+
+def _pack(pieces, budget):
+    """Greedily join [piece, separator, piece, ...] into chunks of at most budget weighted length."""
+    chunks = []
+    current = ''
+    current_length = 0
+    for i in range(0, len(pieces), 2):
+        piece = pieces[i]
+        separator = pieces[i - 1] if i else ''
+        if not piece:
+            continue
+        # Pieces are split on whitespace, so their weighted lengths simply add up
+        piece_length = weighted_length(piece)
+        joined_length = current_length + weighted_length(separator) + piece_length
+        if current and joined_length <= budget:
+            current += separator + piece
+            current_length = joined_length
+            continue
+        if current:
+            chunks.append(current)
+        current, current_length = piece, piece_length
+        if current_length > budget:
+            # A single sentence (or word) that does not fit on its own is split further
+            if _WORD.search(current):
+                parts = _pack(_WORD.split(current), budget)
+            else:
+                parts = []
+                while weighted_length(current) > budget:
+                    head = truncate(current, budget) or current[0]
+                    parts.append(head)
+                    current = current[len(head):]
+                parts.append(current)
+            chunks.extend(parts[:-1])
+            current = parts[-1]
+            current_length = weighted_length(current)
+    if current:
+        chunks.append(current)
+    return chunks
+
+def split_thread(text, limit=MAX_TWEET_LENGTH):
+    """Split text on sentence, then word, boundaries into parts numbered ' i/n'.
+
+    Lengths are weighted the way the platform counts them. Text that already
+    fits in one tweet is returned unchanged as a single part.
+    """
+    text = text.strip()
+    if weighted_length(text) <= limit and not _PART_BREAK.search(text):
+        return [text]
+
+    digits = 1
+    while True:
+        budget = limit - len(f" {'9' * digits}/{'9' * digits}")
+        parts = []
+        for section in _PART_BREAK.split(text):
+            parts.extend(chunk.strip() for chunk in _pack(_SENTENCE.split(section.strip()), budget))
+        parts = [part for part in parts if part]
+        if len(str(len(parts))) <= digits:
+            break
+        digits += 1
+
+    total = len(parts)
+    return [f"{part} {index}/{total}" for index, part in enumerate(parts, 1)]
+
+def part_images(image_paths):
+    """Group thread attachments by part index: 'N:path' goes on part N, a plain path on the first."""
+    images = {}
+    for path in media_paths(image_paths):
+        index = 0
+        match = _PART_IMAGE.fullmatch(str(path))
+        if match and not os.path.exists(path):
+            index, path = int(match.group(1)) - 1, match.group(2)
+        images.setdefault(index, []).append(path)
+    return images
+
+def run_thread(text, image_paths=None, dry_run=False, optimize=False):
+    """Split text into a thread, validate it and post it, printing progress.
+
+    image_paths are plain paths for the first tweet or 'N:path' for tweet N.
+    """
+    from termtweet.core import validate_tweet
+
+    parts = split_thread(text)
+    images = part_images(image_paths)
+    if optimize and images:
+        from termtweet.imaging import optimize_for_cli
+        images = {index: optimize_for_cli(paths) for index, paths in images.items()}
+
+    errors = [f"Image {path} is for tweet {index + 1}, but the thread has {len(parts)} tweets."
+              for index, paths in sorted(images.items()) if not 0 <= index < len(parts)
+              for path in paths]
+    for index, part in enumerate(parts):
+        errors.extend(validate_tweet(part, images.get(index)))
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        return False
+
+    if dry_run:
+        print(f"[DRY RUN] Thread of {len(parts)} tweets:")
+        for part in parts:
+            print(f"--- ({weighted_length(part)} chars)")
+            print(part)
+        for index, paths in sorted(images.items()):
+            for image in paths:
+                print("Image (tweet {}): {}".format(index + 1, image))
+        print("Validation successful! Use without --dry-run to actually post.")
+        return True
+
+    from termtweet.client import TermTweetClient
+
+    client = TermTweetClient.from_credentials()
+    if not client:
+        print("❌ No credentials found. Run 'termtweet --setup' to configure.")
+        return False
+
+    print(f"🧵 Posting thread of {len(parts)} tweets...")
+    with client:
+        results = post_thread(client, parts, images)
+    for index, result in enumerate(results, 1):
+        if result.ok:
+            print(f"✅ [{index}/{len(parts)}] {result.tweet_id}")
+        else:
+            print(f"❌ [{index}/{len(parts)}] {result.error}")
+    return len(results) == len(parts) and results[-1].ok
+
+def post_thread(client, parts, images=None):
+    """Post parts as a reply chain through a TermTweetClient and return TweetResults.
+
+    images maps a part index to its attachments (one path or a list). Uploads for
+    later parts start straight away and run while earlier parts are being posted,
+    so each post only waits for uploads that are not finished yet. Posting stops
+    at the first failure; the failed result is the last one returned.
+    """
+    from termtweet.client import TweetResult
+
+    images = images or {}
+    results = []
+    with ThreadPoolExecutor(max_workers=UPLOAD_AHEAD) as pool:
+        uploads = {index: pool.submit(client.upload_all, media_paths(paths))
+                   for index, paths in sorted(images.items()) if paths}
+
+        previous_id = None
+        for index, text in enumerate(parts):
+            media_ids = []
+            if index in uploads:
+                media = uploads[index].result()
+                failed = [result for result in media if not result.ok]
+                if failed:
+                    results.append(TweetResult(text, error=failed[0].error, kind=failed[0].kind))
+                    break
+                media_ids = [result.media_id for result in media]
+
+            result = client.post(text, media_ids, in_reply_to=previous_id)
+            results.append(result)
+            if not result.ok:
+                break
+            previous_id = result.tweet_id
+
+        for upload in uploads.values():
+            upload.cancel()
+    return results
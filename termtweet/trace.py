@@ -0,0 +1,131 @@
+"""
+TermTweet Trace - Per-phase timing spans written as JSON lines
+
+Tracing is off unless TERMTWEET_TRACE (or the --trace flag) names a file, or
+'-' for stderr. Each finished span is one JSON object with OpenTelemetry field
+names: name, trace_id, span_id, parent_span_id, start/end times in Unix
+nanoseconds, duration_ms, status and attributes. While disabled, span() returns
+a shared no-op object, so instrumented code pays one global lookup per span.
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+
+_target = os.environ.get('TERMTWEET_TRACE') or None
+_output = None
+_lock = threading.Lock()
+_trace_id = os.urandom(16).hex()
+_current = contextvars.ContextVar('termtweet_span', default=None)
+
+class _NoopSpan:
+    """Stand-in returned by span() while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+    def error(self, error):
+        pass
+
+_NOOP = _NoopSpan()
+
+class Span:
+    """A timed operation; use as a context manager."""
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = os.urandom(8).hex()
+        self.parent = None
+        self.failure = None
+
+    def set(self, **attributes):
+        """Attach attributes (byte counts, HTTP status, retries, ...) to the span."""
+        self.attributes.update(attributes)
+
+    def error(self, error):
+        """Mark the span as failed, e.g. from an except block that swallows the error."""
+        self.failure = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._started
+        _current.reset(self._token)
+        if exc_value is not None and self.failure is None:
+            self.error(exc_value)
+        record = {
+            'name': self.name,
+            'trace_id': _trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent.span_id if self.parent else None,
+            'start_time_unix_nano': self.start_ns,
+            'end_time_unix_nano': self.start_ns + int(duration * 1e9),
+            'duration_ms': round(duration * 1000, 3),
+            'status': 'ERROR' if self.failure else 'OK',
+            'attributes': self.attributes,
+        }
+        if self.failure:
+            record['error'] = self.failure
+        _emit(record)
+        return False
+
+def configure(target):
+    """Turn tracing on (a file path, or '-' for stderr) or off (None)."""
+    global _target, _output
+    with _lock:
+        if _output not in (None, sys.stderr):
+            _output.close()
+        _target, _output = target or None, None
+
+def enabled():
+    return _target is not None
+
+def span(name, **attributes):
+    """Start a span named after a phase, e.g. span('upload_media', bytes=1234)."""
+    if _target is None:
+        return _NOOP
+    return Span(name, attributes)
+
+def current():
+    """Return the innermost open span, or a no-op span."""
+    return _current.get() or _NOOP
+
+def wrap(function):
+    """Bind function to the current span, so work submitted to a thread pool nests under it."""
+    if _target is None:
+        return function
+    parent = _current.get()
+
+    def run(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
+
+def _emit(record):
+    global _output
+    line = json.dumps(record, default=str) + '\n'
+    with _lock:
+        if _target is None:
+            return
+        if _output is None:
+            _output = sys.stderr if _target == '-' else open(_target, 'a', encoding='utf-8')
+        _output.write(line)
+        _output.flush()
@@ -0,0 +1,205 @@
+"""
+TermTweet Upload - Chunked, resumable media uploads
+"""
+
+import hashlib
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from termtweet import trace
+from termtweet.core import state_dir, media_type
+from termtweet.retry import RetryPolicy
+from termtweet.storage import load_json, save_json_atomic
+
+CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 5 * 1024 * 1024  # Twitter limit per APPEND
+MAX_SEGMENTS = 1000  # segment_index must be between 0 and 999
+DEFAULT_WORKERS = 4
+DEFAULT_EXPIRY = 24 * 60 * 60
+# Longest we wait for server-side processing of a GIF or video
+PROCESSING_TIMEOUT = 15 * 60
+# STATUS checks back off from 1s up to this, never sooner than check_after_secs
+MAX_CHECK_DELAY = 16
+
+class UploadError(Exception):
+    """Raised when Twitter rejects or fails to process an upload."""
+
+def needs_chunked_upload(path):
+    """Return True for media that should use INIT/APPEND/FINALIZE instead of a single request."""
+    mime = media_type(path)
+    if mime == 'image/gif' or mime.startswith('video/'):
+        return True
+    return os.path.getsize(path) > CHUNK_SIZE
+
+def category_for(path):
+    """Return the upload media_category for a file: tweet_gif, tweet_video or tweet_image."""
+    mime = media_type(path)
+    if mime == 'image/gif':
+        return 'tweet_gif'
+    if mime.startswith('video/'):
+        return 'tweet_video'
+    return 'tweet_image'
+
+def chunk_size_for(total_bytes, chunk_size=CHUNK_SIZE):
+    """Pick a chunk size that keeps the upload within Twitter's segment limit."""
+    min_size = -(-total_bytes // MAX_SEGMENTS)
+    return min(max(chunk_size, min_size), MAX_CHUNK_SIZE)
+
+def _state_path(path, stat, account):
+    """Locate the resume state for this file version and account."""
+    key = f"{account}|{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return state_dir() / 'uploads' / f"{digest}.json"
+
+def _load_state(state_path):
+    """Return saved progress for an unexpired upload, or None."""
+    state = load_json(state_path)
+    if state is None:
+        return None
+    if state.get('expires_at', 0) <= time.time():
+        state_path.unlink(missing_ok=True)
+        return None
+    return state
+
+def _save_state(state_path, state):
+    """Atomically write upload progress so a crash never leaves a torn file."""
+    save_json_atomic(state_path, state)
+
+def _read_segment(path, index, chunk_size):
+    """Read one segment straight from disk without loading the whole file."""
+    with open(path, 'rb') as f:
+        f.seek(index * chunk_size)
+        return f.read(chunk_size)
+
+def _append_segment(api, path, media_id, index, chunk_size, retry):
+    """Send one APPEND segment, retrying only this segment on failure."""
+    data = _read_segment(path, index, chunk_size)
+    with trace.span('upload_segment', index=index, bytes=len(data)) as span:
+        span.set(retries=0)
+        retry.call(api.chunked_upload_append, media_id, (os.path.basename(path), data), index)
+
+def processing(info):
+    """Return True while processing_info says the server is still working on the media."""
+    return bool(info) and info.get('state') in ('pending', 'in_progress')
+
+def processing_error(info):
+    """Return the server's message for media whose processing failed, else None."""
+    if info and info.get('state') == 'failed':
+        return (info.get('error') or {}).get('message') or 'Media processing failed'
+    return None
+
+def check_delay(info, checks):
+    """Seconds until the next STATUS check: backoff from 1s, but never before check_after_secs."""
+    backoff = min(2 ** checks, MAX_CHECK_DELAY)
+    return max(info.get('check_after_secs') or 0, backoff)
+
+def wait_for_processing(api, pending, retry=None, timeout=PROCESSING_TIMEOUT, sleep=time.sleep,
+                        clock=time.monotonic):
+    """Poll media until the server has processed it and return {media_id: error} for failures.
+
+    pending maps media IDs to the processing_info FINALIZE returned. All of them
+    are polled in one loop, each when its next check falls due, so several
+    videos wait as long as the slowest rather than the sum. Media still
+    processing after timeout seconds is reported as failed.
+    """
+    retry = retry or RetryPolicy()
+    started = clock()
+    failures = {}
+    checks = {}
+    due = []
+    for media_id, info in pending.items():
+        if processing(info):
+            checks[media_id] = 0
+            heapq.heappush(due, (started + check_delay(info, 0), media_id))
+        elif processing_error(info):
+            failures[media_id] = processing_error(info)
+
+    while due:
+        when, media_id = due[0]
+        now = clock()
+        if when > now:
+            if when - started > timeout:
+                for _, media_id in due:
+                    failures[media_id] = f"Media still processing after {timeout:.0f}s"
+                break
+            sleep(when - now)
+            continue
+        heapq.heappop(due)
+        with trace.span('media_status', media_id=media_id) as span:
+            try:
+                info = getattr(retry.call(api.get_media_upload_status, media_id), 'processing_info', None)
+            except Exception as e:
+                span.error(e)
+                failures[media_id] = str(e)
+                continue
+            span.set(state=(info or {}).get('state'), progress=(info or {}).get('progress_percent'))
+        if processing(info):
+            checks[media_id] += 1
+            heapq.heappush(due, (clock() + check_delay(info, checks[media_id]), media_id))
+        elif processing_error(info):
+            failures[media_id] = processing_error(info)
+    return failures
+
+def chunked_upload(api, path, workers=DEFAULT_WORKERS, chunk_size=CHUNK_SIZE, media_category=None, retry=None):
+    """Upload a file in segments, wait for any server-side processing and return its media ID."""
+    retry = retry or RetryPolicy()
+    media_id, info = upload_chunks(api, path, workers, chunk_size, media_category, retry)
+    error = wait_for_processing(api, {media_id: info}, retry).get(media_id)
+    if error:
+        raise UploadError(error)
+    return media_id
+
+def upload_chunks(api, path, workers=DEFAULT_WORKERS, chunk_size=CHUNK_SIZE, media_category=None, retry=None):
+    """Upload a file in segments over a tweepy.API handle and return (media ID, processing_info).
+
+    Segments are streamed from disk and sent concurrently. Progress is saved under
+    the state directory after every accepted segment, so calling this again for the
+    same file resumes the upload instead of starting over. Each command is retried
+    on its own through retry (a RetryPolicy), so a failure never resends accepted
+    segments. GIFs and videos are sent with their media_category, so the server
+    processes them asynchronously; pass the processing_info (None when the media
+    is ready at once) to wait_for_processing before attaching the media.
+    """
+    retry = retry or RetryPolicy()
+    media_category = media_category or category_for(path)
+    stat = os.stat(path)
+    account = getattr(api.auth, 'access_token', '') or ''
+    state_path = _state_path(path, stat, account)
+
+    state = _load_state(state_path)
+    if state is None:
+        size = chunk_size_for(stat.st_size, chunk_size)
+        media = retry.call(api.chunked_upload_init, stat.st_size, media_type(path), media_category=media_category)
+        expires = getattr(media, 'expires_after_secs', None) or DEFAULT_EXPIRY
+        state = {
+            'media_id': media.media_id_string,
+            'chunk_size': size,
+            'expires_at': time.time() + expires,
+            'done': [],
+        }
+        _save_state(state_path, state)
+
+    media_id = state['media_id']
+    size = state['chunk_size']
+    segments = -(-stat.st_size // size)
+    done = set(state['done'])
+    pending = [index for index in range(segments) if index not in done]
+    lock = threading.Lock()
+
+    def send(index):
+        _append_segment(api, path, media_id, index, size, retry)
+        with lock:
+            state['done'].append(index)
+            _save_state(state_path, state)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(trace.wrap(send), index) for index in pending]
+        for future in futures:
+            future.result()
+
+    media = retry.call(api.chunked_upload_finalize, media_id)
+    state_path.unlink(missing_ok=True)
+    return media_id, getattr(media, 'processing_info', None)
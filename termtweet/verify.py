@@ -0,0 +1,117 @@
+"""
+TermTweet Verify - Real credential checks against the API, with a cached result
+"""
+
+import hashlib
+import time
+
+from termtweet import trace
+from termtweet.core import state_dir
+from termtweet.lock import FileLock
+from termtweet.storage import load_json, save_json_atomic
+
+# How long a successful check is trusted before --test asks the API again
+VERIFIED_TTL = 24 * 60 * 60
+# How long rejected credentials make posting fail without an API call
+REJECTED_TTL = 60 * 60
+
+def credentials_key(creds):
+    """Identify a set of credentials without storing any of them."""
+    return hashlib.sha256('\0'.join(creds).encode('utf-8')).hexdigest()
+
+def _paths():
+    directory = state_dir()
+    return directory / 'verified.json', str(directory / 'verified.lock')
+
+def _load(path):
+    return load_json(path, {})
+
+def _save(path, state):
+    now = time.time()
+    state = {key: entry for key, entry in state.items() if entry['expires_at'] > now}
+    save_json_atomic(path, state)
+
+def cached(creds, now=None):
+    """Return the unexpired result of the last check of these credentials, or None."""
+    path, _ = _paths()
+    entry = _load(path).get(credentials_key(creds))
+    if entry is None or entry['expires_at'] <= (time.time() if now is None else now):
+        return None
+    return entry
+
+def store(creds, ok, error=None, user_id=None, username=None, access_level=None):
+    """Cache the outcome of a check (or of an API call that proved the credentials bad)."""
+    now = time.time()
+    entry = {
+        'ok': ok,
+        'error': error,
+        'user_id': user_id,
+        'username': username,
+        'access_level': access_level,
+        'checked_at': now,
+        'expires_at': now + (VERIFIED_TTL if ok else REJECTED_TTL),
+    }
+    path, lock_path = _paths()
+    with FileLock(lock_path):
+        state = _load(path)
+        state[credentials_key(creds)] = entry
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _save(path, state)
+    return entry
+
+def rejected(creds):
+    """Return the cached error if these credentials recently failed a check, else None."""
+    entry = cached(creds)
+    return entry['error'] if entry and not entry['ok'] else None
+
+def rejects_credentials(error):
+    """Return True for API errors that mean the credentials themselves are bad (401)."""
+    from termtweet.retry import status_code
+    return status_code(error) == 401
+
+def verify(creds, refresh=False):
+    """Check credentials with a real identity call and return the (cached) result.
+
+    A good result is reused for VERIFIED_TTL unless refresh is set; a bad one is
+    always checked again, since the user has probably just fixed something.
+    Returns a dict with ok, error, user_id, username and access_level. Errors
+    that say nothing about the credentials (timeouts, 5xx) are returned but not
+    cached.
+    """
+    entry = None if refresh else cached(creds)
+    if entry and entry['ok']:
+        return dict(entry, cached=True)
+
+    import requests
+    import tweepy
+    from termtweet.ratelimit import RateLimitedSession, account_key
+    from termtweet.retry import RetryPolicy, status_code
+
+    api_key, api_secret, access_token, access_token_secret, bearer_token = creds
+    client = tweepy.Client(consumer_key=api_key, consumer_secret=api_secret, access_token=access_token,
+                           access_token_secret=access_token_secret, bearer_token=bearer_token,
+                           return_type=requests.Response)
+    client.session = RateLimitedSession(account_key(access_token))
+    with trace.span('verify_credentials') as span:
+        try:
+            response = RetryPolicy().call(client.get_me, user_auth=True)
+        except Exception as e:
+            span.error(e)
+            if status_code(e) in (401, 403):
+                return dict(store(creds, False, error=f"Credentials rejected: {e}"), cached=False)
+            return {'ok': False, 'error': f"Could not reach the API: {e}", 'cached': False}
+        finally:
+            client.session.close()
+
+    user = response.json().get('data') or {}
+    # OAuth 1.0a responses say what the access token may do, e.g. 'read' or 'read-write'
+    access_level = response.headers.get('x-access-level')
+    if access_level and 'write' not in access_level:
+        error = (f"The access token is {access_level}-only. Enable 'Read and Write' permissions "
+                 "for your app, then regenerate the access token.")
+        entry = store(creds, False, error=error, user_id=user.get('id'), username=user.get('username'),
+                      access_level=access_level)
+    else:
+        entry = store(creds, True, user_id=user.get('id'), username=user.get('username'),
+                      access_level=access_level)
+    return dict(entry, cached=False)
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for TermTweet tests
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def termtweet_home(tmp_path, monkeypatch):
+    """Keep all local state (outbox, rate limits, upload progress) out of ~/.termtweet."""
+    home = tmp_path / 'termtweet-home'
+    monkeypatch.setenv('TERMTWEET_HOME', str(home))
+    monkeypatch.delenv('TERMTWEET_PROFILE', raising=False)
+    monkeypatch.delenv('TERMTWEET_ALLOW_DUPLICATES', raising=False)
+    monkeypatch.delenv('TERMTWEET_DEDUPE_HOURS', raising=False)
+    return home
+
+
+# Credentials shaped like real ones, for clients talking to the mock server
+MOCK_CREDS = ('a' * 25, 'b' * 50, '1000-token', 'c' * 45, 'bearer')
+
+
+@pytest.fixture
+def mock_server(monkeypatch):
+    """Yield a factory that starts a MockAPIServer(**options) and points TermTweet at it."""
+    from termtweet import retry
+    from termtweet.mockserver import MockAPIServer
+
+    servers = []
+    monkeypatch.setattr(retry, 'BASE_DELAY', 0)
+
+    def build(**options):
+        server = MockAPIServer(**options).start()
+        servers.append(server)
+        monkeypatch.setenv('TERMTWEET_API_BASE', server.url)
+        return server
+
+    yield build
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def mock_client(mock_server):
+    """Yield a factory for (mock server, TermTweetClient) pairs talking to each other."""
+    from termtweet.client import TermTweetClient
+
+    clients = []
+
+    def build(**options):
+        server = mock_server(**options)
+        client = TermTweetClient(*MOCK_CREDS, media_cache=False)
+        clients.append(client)
+        return server, client
+
+    yield build
+    for client in clients:
+        client.close()
@@ -0,0 +1,161 @@
+"""
+Tests for the asyncio TermTweet API
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('async_lru')
+
+from aiohttp import web
+
+from termtweet import aio
+
+CREDS = ('key', 'secret', '123-token', 'token_secret', 'bearer')
+
+
+class TestPostTweet:
+    """Test async posting."""
+
+    def test_post_tweet(self):
+        """Test that post_tweet returns the new tweet ID."""
+        client = MagicMock()
+        client.create_tweet = AsyncMock(return_value=MagicMock(data={'id': '99'}))
+        assert asyncio.run(aio.post_tweet(client, "hi", ['m1'])) == '99'
+        client.create_tweet.assert_awaited_once_with(text="hi", media_ids=['m1'])
+
+    def test_post_tweet_failure(self):
+        """Test that errors are reported as None like core.post_tweet."""
+        client = MagicMock()
+        client.create_tweet = AsyncMock(side_effect=Exception("503"))
+        assert asyncio.run(aio.post_tweet(client, "hi")) is None
+
+    def test_tweet_many_limits_concurrency(self):
+        """Test that tweet_many keeps at most `concurrency` posts in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def create_tweet(text, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(data={'id': 'id-' + text})
+
+        client = MagicMock()
+        client.create_tweet = create_tweet
+        drafts = [(str(i), None) for i in range(20)]
+        with patch('termtweet.aio.authenticate_twitter', return_value=client):
+            results = asyncio.run(aio.tweet_many(drafts, concurrency=5, creds=CREDS))
+
+        assert [r.tweet_id for r in results] == ['id-' + str(i) for i in range(20)]
+        assert peak == 5
+
+
+class TestUploadMedia:
+    """Test async uploads against a local stand-in for the upload endpoint."""
+
+    def test_upload_media(self, tmp_path):
+        """Test a signed single-request image upload."""
+        image = tmp_path / 'shot.png'
+        image.write_bytes(b'png-bytes')
+        received = {}
+
+        async def handle(request):
+            received['auth'] = request.headers.get('Authorization', '')
+            form = await request.post()
+            received['media'] = form['media'].file.read()
+            return web.json_response({'media_id_string': 'm-1'})
+
+        async def run():
+            app = web.Application()
+            app.router.add_post('/1.1/media/upload.json', handle)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            try:
+                with patch('termtweet.aio.UPLOAD_URL', f'http://127.0.0.1:{port}/1.1/media/upload.json'):
+                    async with aio.create_session(CREDS[2]) as session:
+                        return await aio.upload_media(session, *CREDS[:4], str(image))
+            finally:
+                await runner.cleanup()
+
+        assert asyncio.run(run()) == 'm-1'
+        assert received['auth'].startswith('OAuth ')
+        assert received['media'] == b'png-bytes'
+
+
+
+class TestRateLimitHooks:
+    """Test that the shared rate limiter never blocks the event loop."""
+
+    def test_waits_for_lock_off_the_loop(self):
+        """Test that the loop keeps running while another process holds the limiter lock."""
+        import threading
+        from termtweet.core import state_dir
+        from termtweet.lock import FileLock
+
+        async def handle(request):
+            return web.json_response({})
+
+        async def run():
+            app = web.Application()
+            app.router.add_get('/2/users/me', handle)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticker = asyncio.ensure_future(tick())
+            try:
+                async with aio.create_session(CREDS[2]) as session:
+                    async with session.get(f'http://127.0.0.1:{port}/2/users/me') as response:
+                        assert response.status == 200
+            finally:
+                ticker.cancel()
+                await runner.cleanup()
+            return ticks
+
+        lock = FileLock(str(state_dir() / 'ratelimit.lock')).acquire()
+        threading.Timer(0.3, lock.release).start()
+        assert asyncio.run(run()) >= 10
+
+    def test_batches_response_writes(self):
+        """Test that responses arriving during a write are saved together in the next one."""
+        import time
+        batches = []
+
+        def record_many(account, responses):
+            time.sleep(0.05)
+            batches.append(len(responses))
+
+        async def run():
+            recorder = aio._Recorder('123')
+            await asyncio.gather(*(recorder.add('GET /2/users/me', 200, {}) for _ in range(10)))
+
+        with patch('termtweet.aio.record_many', record_many):
+            asyncio.run(run())
+        assert sum(batches) == 10
+        assert len(batches) < 10
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -10,20 +10,19 @@ import os
 # Add the parent directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from termtweet.core import load_credentials, authenticate_twitter, tweet
+from termtweet.core import load_credentials, authenticate_twitter, tweet, validate_tweet
 
 
 class TestCredentials:
     """Test credential loading functionality."""
 
-    @patch('termtweet.core.Path')
-    @patch('termtweet.core.load_dotenv')
-    def test_load_credentials_missing(self, mock_load_dotenv, mock_path):
+    def test_load_credentials_missing(self, tmp_path, monkeypatch):
         """Test loading credentials when none are available."""
-        # Mock the path to not exist
-        mock_path_instance = MagicMock()
-        mock_path_instance.exists.return_value = False
-        mock_path.return_value = mock_path_instance
+        # No ~/.termtweet/.env, no .env in the working directory, no env vars
+        monkeypatch.chdir(tmp_path)
+        for key in ('TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN',
+                    'TWITTER_ACCESS_TOKEN_SECRET', 'TWITTER_BEARER_TOKEN'):
+            monkeypatch.delenv(key, raising=False)
 
         result = load_credentials()
         assert result is None
@@ -88,6 +87,45 @@ class TestTweet:
         result = tweet("Test tweet")
         assert result is False
 
+    @patch('termtweet.core.authenticate_twitter')
+    @patch('termtweet.core.load_credentials')
+    def test_tweet_multiple_images(self, mock_load_credentials, mock_auth):
+        """Test that all attachments are handed to the client to upload and post together."""
+        from termtweet.client import TweetResult
+
+        mock_load_credentials.return_value = ('key', 'secret', 'token', 'token_secret', 'bearer')
+        client = mock_auth.return_value
+        client.tweet.return_value = TweetResult("Release notes", tweet_id='123', media_ids=['m1', 'm2', 'm3'])
+
+        result = tweet("Release notes", ['a.png', 'b.png', 'c.png'])
+        assert result is True
+        client.tweet.assert_called_once_with("Release notes", ['a.png', 'b.png', 'c.png'])
+        client.__exit__.assert_called_once()
+
+    @patch('termtweet.core.authenticate_twitter')
+    @patch('termtweet.core.load_credentials')
+    def test_tweet_image_upload_failure(self, mock_load_credentials, mock_auth, capsys):
+        """Test that a failed upload is reported and the tweet counts as failed."""
+        from termtweet.client import TweetResult
+
+        mock_load_credentials.return_value = ('key', 'secret', 'token', 'token_secret', 'bearer')
+        mock_auth.return_value.tweet.return_value = TweetResult("Release notes", error="Failed to upload b.png")
+
+        result = tweet("Release notes", ['a.png', 'b.png'])
+        assert result is False
+        assert "Failed to upload b.png" in capsys.readouterr().out
+
+    def test_validate_too_many_images(self, tmp_path):
+        """Test that more than four attachments are rejected."""
+        paths = []
+        for index in range(5):
+            path = tmp_path / f'{index}.png'
+            path.write_bytes(b'png')
+            paths.append(str(path))
+        errors = validate_tweet("hello", paths)
+        assert len(errors) == 1
+        assert "Too many attachments" in errors[0]
+
 
 class TestCLI:
     """Test CLI functionality."""
@@ -106,16 +144,14 @@ class TestCLI:
 
     def test_cli_no_text(self):
         """Test CLI with no text argument."""
+        from termtweet.cli import create_parser, main
+
+        args = create_parser().parse_args([])
         with patch('sys.argv', ['termtweet']):
             with patch('termtweet.cli.create_parser') as mock_parser:
-                mock_parser_instance = MagicMock()
-                mock_parser.return_value = mock_parser_instance
-                mock_parser_instance.parse_args.return_value = MagicMock(text=None, setup=False, test=False)
-
-                from termtweet.cli import main
+                mock_parser.return_value.parse_args.return_value = args
                 main()
-                mock_parser_instance.print_help.assert_called_once()
-
+                mock_parser.return_value.print_help.assert_called_once()
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
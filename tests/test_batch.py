@@ -0,0 +1,115 @@
+"""
+Tests for TermTweet batch posting
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.batch import load_records, validate_records, post_batch, run_batch
+from termtweet.client import TweetResult
+
+CREDS = ('key', 'secret', 'token', 'token_secret', 'bearer')
+
+
+class TestLoadRecords:
+    """Test batch file parsing."""
+
+    def test_load_jsonl(self, tmp_path):
+        """Test loading records from a JSONL file."""
+        batch_file = tmp_path / 'posts.jsonl'
+        batch_file.write_text('{"text": "first"}\n\n{"text": "second", "image": "shot.png"}\n'
+                              '{"text": "third", "image": ["a.png", "b.png"]}\n')
+
+        records = load_records(str(batch_file))
+        assert [r['text'] for r in records] == ['first', 'second', 'third']
+        assert records[0]['images'] == []
+        assert records[1]['images'] == [str(tmp_path / 'shot.png')]
+        assert records[2]['images'] == [str(tmp_path / 'a.png'), str(tmp_path / 'b.png')]
+
+    def test_load_csv(self, tmp_path):
+        """Test loading records from a CSV file."""
+        batch_file = tmp_path / 'posts.csv'
+        batch_file.write_text('text,image\nhello,\nworld,\n')
+
+        records = load_records(str(batch_file))
+        assert records == [{'text': 'hello', 'images': []}, {'text': 'world', 'images': []}]
+
+    def test_wrong_field_types_are_invalid_records(self, tmp_path):
+        """Test that a bad field type is reported for its record instead of aborting the load."""
+        batch_file = tmp_path / 'posts.jsonl'
+        batch_file.write_text('{"text": "ok", "image": null}\n{"text": "a", "image": [null]}\n'
+                              '{"text": 5}\n{"text": "b", "image": 7}\n')
+
+        records = load_records(str(batch_file))
+        assert records[0] == {'text': 'ok', 'images': []}
+        problems = validate_records(records)
+        assert [index for index, _ in problems] == [2, 3, 4]
+        assert "'image' must be" in problems[0][1] and "'text' must be" in problems[1][1]
+
+    def test_load_invalid_json(self, tmp_path):
+        """Test that malformed lines are reported with their line number."""
+        batch_file = tmp_path / 'posts.jsonl'
+        batch_file.write_text('{"text": "ok"}\nnot json\n')
+
+        with pytest.raises(ValueError, match="Line 2"):
+            load_records(str(batch_file))
+
+
+class TestValidateRecords:
+    """Test up-front batch validation."""
+
+    def test_validate_records(self):
+        """Test that every invalid record is reported."""
+        records = [
+            {'text': 'fine', 'images': []},
+            {'text': '', 'images': []},
+            {'text': 'x' * 281, 'images': []},
+            {'text': 'missing image', 'images': ['/nonexistent/image.png']},
+        ]
+        problems = validate_records(records)
+        assert [index for index, _ in problems] == [2, 3, 4]
+
+    def test_validate_duplicate_records(self):
+        """Test that repeated text in one batch is caught unless allowed."""
+        records = [{'text': 'same', 'images': []}, {'text': 'other', 'images': []}, {'text': ' same', 'images': []}]
+        problems = validate_records(records)
+        assert problems == [(3, "Same text as record 1; the second post would be rejected.")]
+        assert validate_records(records, allow_duplicates=True) == []
+
+
+class TestPostBatch:
+    """Test concurrent batch posting."""
+
+    @patch('termtweet.client.TermTweetClient')
+    def test_post_batch_reuses_client(self, mock_client_cls):
+        """Test that one client is built and results keep input order."""
+        client = MagicMock()
+        mock_client_cls.from_credentials.return_value = client
+        client.tweet.side_effect = lambda text, images: TweetResult(
+            text, error="Failed to post tweet." if text == 'bad' else None,
+            tweet_id=None if text == 'bad' else 'id-' + text)
+
+        records = [{'text': t, 'images': []} for t in ('a', 'bad', 'c')]
+        results = post_batch(records, concurrency=3, creds=CREDS)
+
+        mock_client_cls.from_credentials.assert_called_once_with(CREDS, pool_size=3)
+        assert [r['tweet_id'] for r in results] == ['id-a', None, 'id-c']
+        assert results[1]['error'] == "Failed to post tweet."
+
+    @patch('termtweet.batch.post_batch')
+    def test_run_batch_validates_before_posting(self, mock_post_batch, tmp_path):
+        """Test that nothing is posted when any record is invalid."""
+        batch_file = tmp_path / 'posts.jsonl'
+        batch_file.write_text('{"text": "ok"}\n{"text": ""}\n')
+
+        assert run_batch(str(batch_file)) is False
+        mock_post_batch.assert_not_called()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
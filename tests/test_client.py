@@ -0,0 +1,115 @@
+"""
+Tests for the reusable TermTweet client
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.client import TermTweetClient
+
+CREDS = ('key', 'secret', 'token', 'token_secret', 'bearer')
+
+
+class TestTermTweetClient:
+    """Test the pooled client and its result objects."""
+
+    def test_shares_one_session(self):
+        """Test that posting and uploading use the same HTTP session."""
+        client = TermTweetClient(*CREDS)
+        assert client.client.session is client.session
+        assert client.api.session is client.session
+
+    def test_session_survives_tweepy_close(self):
+        """Test that tweepy.API closing the session keeps pooled connections."""
+        client = TermTweetClient(*CREDS)
+        adapter = client.session.get_adapter('https://api.twitter.com')
+        with patch.object(adapter, 'close') as mock_close:
+            client.api.session.close()
+            mock_close.assert_not_called()
+            client.close()
+            mock_close.assert_called_once()
+
+    def test_from_credentials_missing(self):
+        """Test that no client is built without credentials."""
+        with patch('termtweet.client.load_credentials', return_value=None):
+            assert TermTweetClient.from_credentials() is None
+
+    def test_tweet_with_image(self, tmp_path):
+        """Test uploading and posting return structured results."""
+        image = tmp_path / 'shot.png'
+        image.write_bytes(b'png')
+        client = TermTweetClient(*CREDS)
+        client.api = MagicMock()
+        client.api.media_upload.return_value = MagicMock(media_id_string='m1', expires_after_secs=86400)
+        client.client = MagicMock()
+        client.client.create_tweet.return_value = MagicMock(data={'id': 't1'})
+
+        result = client.tweet("hello", str(image))
+        assert result.ok
+        assert result.tweet_id == 't1'
+        assert result.media_ids == ['m1']
+        client.client.create_tweet.assert_called_once_with(text="hello", media_ids=['m1'])
+
+    def test_tweet_upload_failure(self, tmp_path):
+        """Test that a failed upload skips posting and reports the error."""
+        image = tmp_path / 'shot.png'
+        image.write_bytes(b'png')
+        client = TermTweetClient(*CREDS)
+        client.api = MagicMock()
+        client.api.media_upload.side_effect = Exception("boom")
+        client.client = MagicMock()
+
+        result = client.tweet("hello", str(image))
+        assert not result.ok
+        assert "boom" in result.error and result.kind == 'fatal'
+        client.client.create_tweet.assert_not_called()
+
+    def test_repeat_upload_uses_media_cache(self, tmp_path):
+        """Test that the same file is uploaded once and its media ID reused."""
+        image = tmp_path / 'logo.png'
+        image.write_bytes(b'png')
+        client = TermTweetClient(*CREDS)
+        client.api = MagicMock()
+        client.api.media_upload.return_value = MagicMock(media_id_string='m1', expires_after_secs=86400)
+        client.client = MagicMock()
+        client.client.create_tweet.return_value = MagicMock(data={'id': 't1'})
+
+        assert client.tweet("one", str(image)).media_ids == ['m1']
+        assert client.tweet("two", str(image)).media_ids == ['m1']
+        client.api.media_upload.assert_called_once()
+
+        # A rejected post drops the cached ID so the next attempt uploads again
+        client.client.create_tweet.side_effect = Exception("media_id invalid")
+        assert not client.tweet("three", str(image)).ok
+        client.client.create_tweet.side_effect = None
+        client.tweet("four", str(image))
+        assert client.api.media_upload.call_count == 2
+
+    def test_duplicate_refused_locally(self, tmp_path):
+        """Test that text the account already posted never reaches the API."""
+        image = tmp_path / 'shot.png'
+        image.write_bytes(b'png')
+        client = TermTweetClient(*CREDS)
+        client.api = MagicMock()
+        client.api.media_upload.return_value = MagicMock(media_id_string='m1', expires_after_secs=86400)
+        client.client = MagicMock()
+        client.client.create_tweet.return_value = MagicMock(data={'id': 't1'})
+
+        assert client.tweet("Release  2.0", str(image)).ok
+        result = client.tweet("Release 2.0 ", str(image))
+        assert not result.ok and 'Duplicate' in result.error and result.kind == 'duplicate'
+        assert not client.post("Release 2.0").ok
+        client.client.create_tweet.assert_called_once()
+        client.api.media_upload.assert_called_once()
+
+        assert client.tweet("Release 2.0", allow_duplicate=True).ok
+        assert client.client.create_tweet.call_count == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,92 @@
+"""
+Tests for the TermTweet daemon and its socket protocol
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import socket
+import threading
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.client import TweetResult
+from termtweet.daemon import forward_tweet, send
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Run a DaemonServer with a mock client on a temporary socket."""
+    from termtweet.daemon import DaemonServer
+
+    client = MagicMock()
+    client.tweet.side_effect = lambda text, images, allow_duplicate=None: (
+        TweetResult(text, error="Failed to post tweet: 403") if text == "bad"
+        else TweetResult(text, tweet_id='42', media_ids=['m'] * len(images)))
+    path = str(tmp_path / 'd.sock')
+    server = DaemonServer(path, client)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path, client
+    server.shutdown()
+    server.server_close()
+
+
+class TestDaemon:
+    """Test forwarding posts to a running daemon."""
+
+    def test_forward_tweet(self, daemon, tmp_path):
+        """Test that a forwarded tweet is posted by the daemon's client."""
+        path, client = daemon
+        reply = forward_tweet("hello", 'shot.png', path=path)
+        assert reply == {'ok': True, 'tweet_id': '42', 'error': None}
+        client.tweet.assert_called_once_with("hello", [os.path.abspath('shot.png')], allow_duplicate=None)
+
+    def test_forward_allow_duplicate(self, daemon):
+        """Test that --allow-duplicate reaches the daemon's client."""
+        path, client = daemon
+        forward_tweet("hello", path=path, allow_duplicate=True)
+        assert client.tweet.call_args.kwargs['allow_duplicate'] is True
+
+    def test_forward_error(self, daemon):
+        """Test that posting errors come back to the caller."""
+        path, _ = daemon
+        reply = forward_tweet("bad", path=path)
+        assert reply['ok'] is False
+        assert "403" in reply['error']
+
+    def test_ping_and_unknown_op(self, daemon):
+        """Test the ping and error replies."""
+        path, _ = daemon
+        assert send({'op': 'ping'}, path) == {'ok': True}
+        assert send({'op': 'nope'}, path)['ok'] is False
+
+    def test_malformed_requests_get_a_reply(self, daemon):
+        """Test that requests the daemon cannot act on are answered with an error."""
+        path, client = daemon
+        for request in (["tweet"], {'op': 'tweet'}, {'op': 'tweet', 'text': 5},
+                        {'op': 'tweet', 'text': "hi", 'images': "shot.png"}):
+            reply = send(request, path)
+            assert reply['ok'] is False and reply['error'].startswith("Invalid request")
+        client.tweet.side_effect = RuntimeError("boom")
+        assert send({'op': 'tweet', 'text': "hi"}, path) == {'ok': False, 'error': "Daemon error: boom"}
+
+    def test_socket_is_owner_only(self, daemon):
+        """Test that the socket is never created readable or writable by others."""
+        path, _ = daemon
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_no_daemon_running(self, tmp_path):
+        """Test that callers fall back when no daemon is listening."""
+        assert forward_tweet("hello", path=str(tmp_path / 'missing.sock')) is None
+        stale = tmp_path / 'stale.sock'
+        stale.write_text('')
+        assert forward_tweet("hello", path=str(stale)) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,124 @@
+"""
+Tests for the TermTweet duplicate-post index
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.dedupe import BloomFilter, DedupeIndex, allowed, normalize, text_digest
+
+
+class TestNormalize:
+    """Test what counts as the same text."""
+
+    def test_whitespace_and_unicode(self):
+        """Test that spacing and Unicode composition do not matter."""
+        assert normalize("  Hello\n  world ") == "Hello world"
+        assert text_digest("café") == text_digest("café")
+        assert text_digest("Hello") != text_digest("hello")
+
+    def test_allowed(self, monkeypatch):
+        """Test the explicit and environment overrides."""
+        assert not allowed()
+        monkeypatch.setenv('TERMTWEET_ALLOW_DUPLICATES', '1')
+        assert allowed()
+        assert not allowed(False)
+
+
+class TestBloomFilter:
+    """Test the in-memory filter."""
+
+    def test_no_false_negatives(self):
+        """Test that every added digest is reported present and few others are."""
+        bloom = BloomFilter.for_capacity(1000)
+        digests = [text_digest(f"post {i}") for i in range(1000)]
+        for digest in digests:
+            bloom.add(digest)
+        assert all(digest in bloom for digest in digests)
+        false_positives = sum(text_digest(f"other {i}") in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestDedupeIndex:
+    """Test the persistent per-account index."""
+
+    def test_seen_per_account(self, tmp_path):
+        """Test that posts are remembered for the account that made them only."""
+        with DedupeIndex(tmp_path / 'posted.db') as index:
+            assert not index.seen('1', "hello")
+            index.add('1', "hello")
+            index.add('1', "hello")
+            assert index.seen('1', "hello  ")
+            assert not index.seen('2', "hello")
+
+    def test_persists_and_forgets(self, tmp_path):
+        """Test that history survives reopening and deleted posts can be forgotten."""
+        path = tmp_path / 'posted.db'
+        with DedupeIndex(path) as index:
+            index.add('1', "first")
+            index.add('1', "second")
+        with DedupeIndex(path) as index:
+            assert index.seen('1', "first")
+            index.forget('1', "first")
+            assert not index.seen('1', "first")
+            assert index.seen('1', "second")
+
+    def test_other_process_additions(self, tmp_path):
+        """Test that a filter saved before another writer's posts is rebuilt."""
+        path = tmp_path / 'posted.db'
+        with DedupeIndex(path) as index:
+            index.add('1', "first")
+        with DedupeIndex(path) as reader, DedupeIndex(path) as writer:
+            assert not reader.seen('1', "second")
+            writer.add('1', "second")
+            writer.save()
+        with DedupeIndex(path) as index:
+            assert index.seen('1', "first") and index.seen('1', "second")
+
+    def test_open_index_sees_other_writers(self, tmp_path):
+        """Test that a long-lived index picks up posts another process adds later."""
+        path = tmp_path / 'posted.db'
+        with DedupeIndex(path) as daemon, DedupeIndex(path) as cli:
+            assert not daemon.seen('1', "from the cli")
+            cli.add('1', "from the cli")
+            assert daemon.seen('1', "from the cli")
+
+    def test_retention_window(self, tmp_path):
+        """Test that text may be posted again once the window has passed since it was last posted."""
+        with DedupeIndex(tmp_path / 'posted.db', retention=100) as index:
+            index.add('1', "daily standup", now=1000)
+            assert index.seen('1', "daily standup", now=1099)
+            assert not index.seen('1', "daily standup", now=1100)
+            index.add('1', "daily standup", now=1100)
+            assert index.seen('1', "daily standup", now=1150)
+
+    def test_prune(self, tmp_path):
+        """Test that old posts are deleted and the filter is rebuilt without them."""
+        with DedupeIndex(tmp_path / 'posted.db', retention=100) as index:
+            index.add('1', "old", now=1000)
+            index.add('1', "new", now=1050)
+            assert index.prune(now=1120) == 1
+            assert index._counters('1')[1] == 1
+            assert text_digest("old") not in index._bloom('1')
+            assert index.seen('1', "new", now=1120)
+
+    def test_retention_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('TERMTWEET_DEDUPE_HOURS', '2')
+        assert DedupeIndex(tmp_path / 'posted.db').retention == 2 * 60 * 60
+
+    def test_filter_grows(self, tmp_path):
+        """Test that the filter is rebuilt larger once it fills up."""
+        with DedupeIndex(tmp_path / 'posted.db') as index:
+            texts = [f"post number {i}" for i in range(1500)]
+            for text in texts:
+                index.add('1', text)
+            assert all(index.seen('1', text) for text in texts)
+            assert index._bloom('1').capacity >= 1500
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
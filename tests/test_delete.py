@@ -0,0 +1,139 @@
+"""
+Tests for TermTweet bulk delete
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import time
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.client import TweetResult
+from termtweet.delete import Checkpoint, PostIDError, delete_posts, read_ids, run_delete, select_from_timeline
+
+
+@pytest.fixture
+def server(mock_client):
+    """Return (mock server, TermTweetClient) talking to each other."""
+    return mock_client()
+
+
+class TestReadIds:
+    """Test parsing ID lists."""
+
+    def test_ids_and_export_records(self):
+        lines = ['# cleanup\n', '123\n', '\n', '{"id": "456", "text": "hello"}\n']
+        assert list(read_ids(lines)) == [('123', None), ('456', 'hello')]
+
+    def test_rejects_garbage(self):
+        with pytest.raises(ValueError, match="Not a post ID"):
+            list(read_ids(['https://x.com/status/1\n']))
+        with pytest.raises(PostIDError, match="Not a post record"):
+            list(read_ids(['{"text": "no id"}\n']))
+
+
+class TestSelectFromTimeline:
+    """Test filtering the account's timeline."""
+
+    def test_filters(self, server):
+        mock, client = server
+        now = time.time()
+        mock.add_tweet("old test post", created_at=now - 3 * 86400)
+        mock.add_tweet("TEST post from yesterday", created_at=now - 86400)
+        mock.add_tweet("real announcement", created_at=now - 3600)
+        mock.add_tweet("another test", created_at=now - 60)
+
+        texts = [text for _, text in select_from_timeline(client, matching="test")]
+        assert texts == ["another test", "TEST post from yesterday", "old test post"]
+        texts = [text for _, text in select_from_timeline(client, before=now - 7200, after=now - 2 * 86400)]
+        assert texts == ["TEST post from yesterday"]
+
+
+class TestDeletePosts:
+    """Test the bounded, checkpointed delete pool."""
+
+    def test_deletes_and_resumes(self, server, tmp_path):
+        """Test that deleted IDs are checkpointed and skipped by a later run."""
+        mock, client = server
+        ids = [mock.add_tweet(f"post {i}")['id'] for i in range(6)]
+        log = tmp_path / 'deleted.log'
+
+        with Checkpoint(client.account, log) as checkpoint:
+            stats = delete_posts(client, [(tweet_id, None) for tweet_id in ids[:3]], checkpoint, 2,
+                                 report=lambda *args: None)
+        assert stats == {'deleted': 3, 'failed': 0, 'skipped': 0}
+        assert sorted(log.read_text().split()) == sorted(ids[:3])
+
+        mock.requests.clear()
+        with Checkpoint(client.account, log) as checkpoint:
+            stats = delete_posts(client, [(tweet_id, None) for tweet_id in ids], checkpoint, 2,
+                                 report=lambda *args: None)
+        assert stats == {'deleted': 3, 'failed': 0, 'skipped': 3}
+        assert sum(mock.requests.values()) == 3
+        assert mock.tweets == {}
+
+    def test_filter_delete_while_paging(self, server, tmp_path):
+        """Test that deleting during timeline paging does not skip posts."""
+        mock, client = server
+        for i in range(7):
+            mock.add_tweet(f"test {i}")
+        real_page = client.timeline_page
+        client.timeline_page = lambda **kwargs: real_page(max_results=2, **kwargs)
+
+        with Checkpoint(client.account, tmp_path / 'deleted.log') as checkpoint:
+            stats = delete_posts(client, select_from_timeline(client, matching="test"), checkpoint, 3,
+                                 report=lambda *args: None)
+        assert stats['deleted'] == 7 and mock.tweets == {}
+
+    def test_bounded_and_failures(self, tmp_path):
+        """Test that failures are reported and not checkpointed."""
+        client = MagicMock()
+        client.delete.side_effect = lambda tweet_id, text: TweetResult(
+            '', error="403 Forbidden") if tweet_id == '2' else TweetResult('', tweet_id=tweet_id)
+        reports = []
+        with Checkpoint('1', tmp_path / 'deleted.log') as checkpoint:
+            stats = delete_posts(client, [('1', None), ('2', None)], checkpoint, 1,
+                                 report=lambda *args: reports.append(args))
+            assert '2' not in checkpoint and '1' in checkpoint
+        assert stats == {'deleted': 1, 'failed': 1, 'skipped': 0}
+
+    def test_forgets_deleted_text(self, server):
+        """Test that deleting a post lets the same text be posted again."""
+        mock, client = server
+        assert client.tweet("oops").ok
+        tweet_id = next(iter(mock.tweets))
+        assert not client.tweet("oops").ok
+        assert client.delete(tweet_id, "oops").ok
+        assert client.tweet("oops").ok
+
+
+
+class TestRunDelete:
+    """Test how the CLI reports failures."""
+
+    CREDS = ('a' * 25, 'b' * 50, '1000-token', 'c' * 45, 'bearer')
+
+    def test_bad_id_file(self, mock_server, tmp_path, capsys):
+        mock_server()
+        ids = tmp_path / 'ids.txt'
+        ids.write_text('123\nnot-an-id\n')
+        with patch('termtweet.client.load_credentials', return_value=self.CREDS):
+            assert run_delete(str(ids)) is False
+            assert run_delete(str(tmp_path / 'missing.txt')) is False
+        out = capsys.readouterr().out
+        assert "Could not read post IDs: Not a post ID: not-an-id" in out
+        assert out.count("Could not read post IDs") == 2
+
+    def test_api_failure_while_listing(self, mock_server, capsys):
+        mock_server(reject_credentials=True)
+        with patch('termtweet.client.load_credentials', return_value=self.CREDS):
+            assert run_delete(matching="test") is False
+        out = capsys.readouterr().out
+        assert "Could not list posts" in out and "Could not read post IDs" not in out
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
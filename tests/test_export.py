@@ -0,0 +1,84 @@
+"""
+Tests for TermTweet timeline export
+"""
+
+import pytest
+import json
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.export import cursor_path, export_timeline, load_cursor
+
+
+@pytest.fixture
+def server(mock_client):
+    """Return (mock server, TermTweetClient) with a few posts already on the timeline."""
+    mock, client = mock_client()
+    for i in range(5):
+        mock.add_tweet(f"post {i}")
+    return mock, client
+
+
+def exported(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestExport:
+    """Test paging, streaming and the since_id cursor."""
+
+    def test_full_then_incremental(self, server, tmp_path):
+        """Test that a second run fetches only posts published since the first."""
+        mock, client = server
+        output = tmp_path / 'posts.jsonl'
+        real_page = client.timeline_page
+        client.timeline_page = lambda **kwargs: real_page(max_results=2, **kwargs)
+
+        assert export_timeline(client, str(output)) == 5
+        records = exported(output)
+        assert [r['text'] for r in records] == [f"post {i}" for i in range(4, -1, -1)]
+        assert 'public_metrics' in records[0] and 'created_at' in records[0]
+        assert load_cursor(cursor_path(client.account, str(output))) == {'since_id': records[0]['id']}
+
+        mock.add_tweet("post 5")
+        mock.requests.clear()
+        assert export_timeline(client, str(output)) == 1
+        assert exported(output)[-1]['text'] == "post 5"
+        assert sum(mock.requests.values()) == 1
+
+        assert export_timeline(client, str(output)) == 0
+
+    def test_resumes_after_interruption(self, server, tmp_path):
+        """Test that a failed run continues from its saved page token."""
+        mock, client = server
+        output = tmp_path / 'posts.jsonl'
+        pages = []
+        real_page = client.timeline_page
+
+        def flaky_page(**kwargs):
+            if len(pages) == 1:
+                pages.append('failed')
+                raise ConnectionError("dropped")
+            pages.append(kwargs)
+            return real_page(max_results=2, **kwargs)
+
+        client.timeline_page = flaky_page
+        with pytest.raises(ConnectionError):
+            export_timeline(client, str(output))
+        assert len(exported(output)) == 2
+
+        assert export_timeline(client, str(output)) == 3
+        assert pages[-2]['pagination_token'] is not None
+        assert sorted(r['text'] for r in exported(output)) == [f"post {i}" for i in range(5)]
+
+    def test_separate_cursor_per_file(self, server, tmp_path):
+        """Test that exporting to a new file starts from the beginning."""
+        _, client = server
+        assert export_timeline(client, str(tmp_path / 'a.jsonl')) == 5
+        assert export_timeline(client, str(tmp_path / 'b.jsonl')) == 5
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,95 @@
+"""
+Tests for TermTweet image pre-processing
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Image = pytest.importorskip('PIL.Image')
+
+from termtweet.imaging import MAX_DIMENSION, optimize_all, optimize_for_cli, optimize_image
+
+
+def make_image(path, size=(800, 600), mode='RGB', **save_options):
+    """Write a noisy image, so encoders cannot compress it to nothing."""
+    image = Image.effect_noise(size, 64).convert(mode)
+    image.save(path, **save_options)
+    return str(path)
+
+
+class TestOptimizeImage:
+    """Test resizing, re-encoding and metadata stripping."""
+
+    def test_resizes_and_strips_metadata(self, tmp_path):
+        exif = Image.Exif()
+        exif[0x010e] = "GPS and camera details"
+        path = make_image(tmp_path / 'big.png', size=(MAX_DIMENSION + 1000, 500), exif=exif)
+
+        output = optimize_image(path)
+        assert output != path
+        with Image.open(output) as image:
+            assert max(image.size) == MAX_DIMENSION
+            assert not dict(image.getexif())
+        assert os.path.getsize(output) < os.path.getsize(path)
+
+    def test_never_enlarges_jpeg(self, tmp_path):
+        plain = make_image(tmp_path / 'plain.jpg', quality=40)
+        assert optimize_image(plain) == plain
+
+        exif = Image.Exif()
+        exif[0x010e] = "GPS and camera details" * 50
+        tagged = make_image(tmp_path / 'tagged.jpg', quality=40, exif=exif)
+        output = optimize_image(tagged)
+        assert os.path.getsize(output) < os.path.getsize(tagged)
+        with Image.open(output) as image, Image.open(plain) as original:
+            assert not dict(image.getexif())
+            assert image.size == original.size
+
+    def test_keeps_transparency(self, tmp_path):
+        image = Image.effect_noise((400, 300), 64).convert('RGBA')
+        image.putalpha(Image.linear_gradient('L').resize((400, 300)))
+        path = str(tmp_path / 'logo.png')
+        image.save(path)
+        with Image.open(optimize_image(path)) as image:
+            assert image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+
+    def test_reuses_earlier_output(self, tmp_path):
+        path = make_image(tmp_path / 'shot.png')
+        first = optimize_image(path)
+        mtime = os.stat(first).st_mtime_ns
+        assert optimize_image(path) == first
+        assert os.stat(first).st_mtime_ns == mtime
+
+    def test_gifs_and_unreadable_files_unchanged(self, tmp_path):
+        gif = make_image(tmp_path / 'anim.gif', mode='P')
+        broken = tmp_path / 'broken.png'
+        broken.write_bytes(b'not an image')
+        assert optimize_image(gif) == gif
+        assert optimize_image(str(broken)) == str(broken)
+
+
+class TestOptimizeAll:
+    """Test optimizing several images at once."""
+
+    def test_pool_keeps_order_and_duplicates(self, tmp_path):
+        paths = [make_image(tmp_path / f'{i}.png') for i in range(3)]
+        video = str(tmp_path / 'clip.mp4')
+        results = optimize_all([paths[0], video, paths[1], paths[2], paths[0]], workers=2)
+        assert results[1] == video
+        assert results[0] == results[4] == optimize_image(paths[0])
+        assert len(set(results)) == 4
+
+    def test_cli_reports_savings(self, tmp_path, capsys):
+        path = make_image(tmp_path / 'shot.png')
+        missing = str(tmp_path / 'missing.png')
+        results = optimize_for_cli([path, missing])
+        assert results[0] != path and results[1] == missing
+        assert "Optimized shot.png" in capsys.readouterr().out
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
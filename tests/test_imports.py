@@ -0,0 +1,56 @@
+"""
+Import-time regression checks for the TermTweet CLI
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only posting paths may load
+HEAVY_MODULES = ('tweepy', 'requests', 'oauthlib', 'dotenv')
+
+
+def imported_modules(*args, env=None):
+    """Run the CLI under -X importtime and return the top-level modules it imported."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'termtweet.cli'] + list(args),
+        cwd=ROOT, capture_output=True, text=True, env=env
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        name = line.rsplit('|', 1)[1].strip()
+        modules.add(name.split('.')[0])
+    return result, modules
+
+
+class TestLazyImports:
+    """Test that non-posting CLI paths stay free of network dependencies."""
+
+    @pytest.mark.parametrize('args', [
+        ('--help',),
+        ('--version',),
+        ('Hello from a pre-commit hook', '--dry-run'),
+    ])
+    def test_no_heavy_imports(self, args):
+        """Test that --help, --version and --dry-run never import tweepy or dotenv."""
+        result, modules = imported_modules(*args)
+        assert result.returncode == 0, result.stderr
+        assert 'termtweet' in modules
+        assert not modules.intersection(HEAVY_MODULES)
+
+    def test_enqueue_has_no_heavy_imports(self, tmp_path):
+        """Test that queueing a post only touches the local outbox."""
+        env = dict(os.environ, TERMTWEET_HOME=str(tmp_path))
+        result, modules = imported_modules('Queued from CI', '--enqueue', env=env)
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / 'outbox.db').exists()
+        assert not modules.intersection(HEAVY_MODULES)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,77 @@
+"""
+Tests for the TermTweet media ID cache
+"""
+
+import pytest
+from unittest.mock import patch
+import sys
+import os
+import time
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.mediacache import EXPIRY_MARGIN, MediaCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with MediaCache(tmp_path / 'media.db', max_entries=2) as cache:
+        yield cache
+
+
+def make_file(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestMediaCache:
+    """Test lookups, expiry and eviction."""
+
+    def test_keyed_by_content(self, cache, tmp_path):
+        cache.put('111', make_file(tmp_path, 'a.png', b'logo'), 'm1')
+        assert cache.get('111', make_file(tmp_path, 'copy.png', b'logo')) == 'm1'
+        assert cache.get('111', make_file(tmp_path, 'b.png', b'banner')) is None
+
+    def test_keyed_by_account(self, cache, tmp_path):
+        path = make_file(tmp_path, 'a.png', b'logo')
+        cache.put('111', path, 'm1')
+        assert cache.get('222', path) is None
+
+    def test_changed_file_misses(self, cache, tmp_path):
+        path = make_file(tmp_path, 'a.png', b'logo')
+        cache.put('111', path, 'm1')
+        make_file(tmp_path, 'a.png', b'new logo')
+        assert cache.get('111', path) is None
+
+    def test_expires_before_server_lifetime(self, cache, tmp_path):
+        path = make_file(tmp_path, 'a.png', b'logo')
+        cache.put('111', path, 'm1', expires_after=EXPIRY_MARGIN + 60)
+        assert cache.get('111', path) == 'm1'
+        with patch('termtweet.mediacache.time.time', return_value=time.time() + 120):
+            assert cache.get('111', path) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, cache, tmp_path):
+        paths = [make_file(tmp_path, f'{i}.png', bytes([i])) for i in range(3)]
+        now = time.time()
+        with patch('termtweet.mediacache.time.time', side_effect=[now, now + 1, now + 2, now + 3]):
+            cache.put('111', paths[0], 'm0')
+            cache.put('111', paths[1], 'm1')
+            assert cache.get('111', paths[0]) == 'm0'  # now more recent than m1
+            cache.put('111', paths[2], 'm2')
+        assert len(cache) == 2
+        assert cache.get('111', paths[1]) is None
+        assert cache.get('111', paths[0]) == 'm0'
+        assert cache.get('111', paths[2]) == 'm2'
+
+    def test_discard(self, cache, tmp_path):
+        path = make_file(tmp_path, 'a.png', b'logo')
+        cache.put('111', path, 'm1')
+        cache.discard('111', ['m1'])
+        assert cache.get('111', path) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,126 @@
+"""
+Tests for TermTweet metrics
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+import urllib.request
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import metrics
+from termtweet.metrics import Counter, Gauge, Histogram, Registry
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.REGISTRY.reset()
+    yield
+    metrics.REGISTRY.reset()
+
+
+class TestRegistry:
+    """Test the metric types and the text format."""
+
+    def test_render(self):
+        registry = Registry()
+        posts = registry.register(Counter('posts_total', "Posts.", ('result',)))
+        in_flight = registry.register(Gauge('in_flight', "In flight."))
+        latency = registry.register(Histogram('post_seconds', "Latency.", buckets=(0.1, 1.0)))
+        posts.inc(result='ok')
+        posts.inc(2, result='ok')
+        in_flight.inc()
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        text = registry.render()
+        assert '# TYPE posts_total counter\nposts_total{result="ok"} 3\n' in text
+        assert 'in_flight 1\n' in text
+        assert 'post_seconds_bucket{le="0.1"} 1\n' in text
+        assert 'post_seconds_bucket{le="1"} 2\n' in text
+        assert 'post_seconds_bucket{le="+Inf"} 3\n' in text
+        assert 'post_seconds_sum 5.55\n' in text
+        assert 'post_seconds_count 3\n' in text
+
+    def test_label_mismatch(self):
+        with pytest.raises(ValueError, match="takes labels"):
+            Counter('x_total', "X.", ('result',)).inc(kind='oops')
+
+    def test_escapes_label_values(self):
+        counter = Counter('x_total', "X.", ('endpoint',))
+        counter.inc(endpoint='GET "/2"\n')
+        assert 'x_total{endpoint="GET \\"/2\\"\\n"} 1' in counter.render()
+
+    def test_failure_classifies_exceptions(self):
+        metrics.failure('post', ConnectionResetError("reset"))
+        metrics.failure('post', 'duplicate')
+        assert metrics.FAILURES.value(operation='post', kind='transient') == 1
+        assert metrics.FAILURES.value(operation='post', kind='duplicate') == 1
+
+
+class TestExposition:
+    """Test the HTTP endpoint and the textfile."""
+
+    def test_http_endpoint(self):
+        metrics.POSTS.inc(result='ok')
+        server = metrics.configure('127.0.0.1:0')
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+                assert 'termtweet_posts_total{result="ok"} 1' in response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_textfile(self, tmp_path):
+        path = tmp_path / 'termtweet.prom'
+        metrics.UPLOADS.inc(result='cached')
+        metrics.write_textfile(str(path))
+        assert 'termtweet_uploads_total{result="cached"} 1' in path.read_text()
+        assert not list(tmp_path.glob('*.tmp'))
+
+
+class TestInstrumentation:
+    """Test that posting through the client records metrics."""
+
+    def test_client_against_mock_server(self, mock_client):
+        _, client = mock_client()
+        assert client.tweet("metrics ok").ok
+        assert not client.tweet("metrics ok").ok
+        assert not client.tweet("x" * 300).ok
+
+        assert metrics.POSTS.value(result='ok') == 1
+        assert metrics.POSTS.value(result='failed') == 2
+        assert metrics.FAILURES.value(operation='post', kind='duplicate') == 1
+        assert metrics.FAILURES.value(operation='post', kind='invalid') == 1
+        assert metrics.HTTP_RESPONSES.value(endpoint='POST /2/tweets', code=201) == 1
+        assert metrics.POST_SECONDS.value()[0] == 1
+        assert metrics.IN_FLIGHT.value() == 0
+
+    def test_rate_limit_gauge(self):
+        from termtweet.ratelimit import record
+
+        record('1000', 'POST /2/tweets', 200, {'x-rate-limit-remaining': '42', 'x-rate-limit-reset': '9999999999'})
+        record('1000', 'POST /2/tweets', 429, {})
+        assert metrics.RATE_LIMIT_REMAINING.value(endpoint='POST /2/tweets') == 0
+        assert metrics.HTTP_RESPONSES.value(endpoint='POST /2/tweets', code=429) == 1
+
+    def test_upload_failure(self):
+        from termtweet.client import TermTweetClient
+
+        client = TermTweetClient.__new__(TermTweetClient)
+        client.media_cache = None
+        client.retry = MagicMock()
+        client.retry.call.side_effect = PermissionError("403 Forbidden")
+        assert not client.upload_media(__file__).ok
+        assert metrics.UPLOADS.value(result='failed') == 1
+        assert metrics.FAILURES.value(operation='upload', kind='fatal') == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
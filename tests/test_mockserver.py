@@ -0,0 +1,87 @@
+"""
+Tests for the local mock API server used by the benchmarks
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.ratelimit import RateLimitedSession, redirect
+
+
+class TestMockServer:
+    """Test that TermTweet runs end to end against the mock server."""
+
+    def test_redirect(self):
+        assert redirect('https://upload.twitter.com/1.1/media/upload.json?command=STATUS',
+                        'http://127.0.0.1:8123') == 'http://127.0.0.1:8123/1.1/media/upload.json?command=STATUS'
+        assert redirect('https://example.com/x', 'http://127.0.0.1:8123') == 'https://example.com/x'
+
+    @pytest.mark.parametrize('base', ['https://evil.example', 'http://10.0.0.1:8123', 'ftp://127.0.0.1'])
+    def test_only_loopback_bases(self, base, monkeypatch):
+        monkeypatch.setenv('TERMTWEET_API_BASE', base)
+        with pytest.raises(ValueError, match="loopback"):
+            RateLimitedSession('1000')
+        for base in ('http://localhost:8123', 'http://[::1]:8123'):
+            monkeypatch.setenv('TERMTWEET_API_BASE', base)
+            assert RateLimitedSession('1000').api_base == base
+
+    def test_tweet_with_image(self, mock_client, tmp_path):
+        server, termtweet = mock_client()
+        image = tmp_path / 'shot.png'
+        image.write_bytes(b'png' * 100)
+        result = termtweet.tweet("hello", str(image))
+        assert result.ok and len(result.media_ids) == 1
+        assert server.requests == {'POST /1.1/media/upload.json': 1, 'POST /2/tweets': 1}
+        assert server.tweets[result.tweet_id]['edit_history_tweet_ids'] == [result.tweet_id]
+
+    def test_chunked_upload(self, mock_client, tmp_path):
+        server, termtweet = mock_client()
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'\0' * (3 * 1024 * 1024))
+        assert termtweet.upload_media(str(video)).ok
+        # INIT, three APPENDs and FINALIZE
+        assert server.requests['POST /1.1/media/upload.json'] == 5
+
+    def test_video_processing(self, mock_client, tmp_path, monkeypatch):
+        """Test that a video is polled until processed before the tweet is posted."""
+        from termtweet import upload
+        monkeypatch.setattr(upload, 'MAX_CHECK_DELAY', 0)
+
+        server, termtweet = mock_client(processing_checks=2, check_after_secs=0)
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'\0' * 1024)
+        result = termtweet.tweet("watch this", str(video))
+        assert result.ok and len(result.media_ids) == 1
+        assert server.requests['GET /1.1/media/upload.json'] == 2
+        assert server.requests['POST /2/tweets'] == 1
+
+    def test_errors(self, mock_client):
+        from termtweet.retry import ATTEMPTS, CircuitBreaker, RetryPolicy
+
+        server, termtweet = mock_client(error_rate=1.0)
+        termtweet.retry = RetryPolicy(breaker=CircuitBreaker(threshold=ATTEMPTS), sleep=lambda seconds: None)
+        result = termtweet.post("hello")
+        assert not result.ok and '503' in result.error
+        assert server.requests['POST /2/tweets'] == ATTEMPTS
+
+        # The breaker is now open: further posts fail without reaching the server
+        result = termtweet.post("hello again")
+        assert not result.ok and 'API unavailable' in result.error
+        assert server.requests['POST /2/tweets'] == ATTEMPTS
+
+    def test_rate_limit_headers(self, mock_client):
+        import requests
+
+        server, _ = mock_client(rate_limit=2)
+        url = f"{server.url}/2/tweets"
+        responses = [requests.post(url, json={'text': 'x'}) for _ in range(3)]
+        assert [response.status_code for response in responses] == [201, 201, 429]
+        assert [response.headers['x-rate-limit-remaining'] for response in responses] == ['1', '0', '0']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,145 @@
+"""
+Tests for the durable TermTweet outbox
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import outbox as outbox_module
+from termtweet.client import TweetResult
+from termtweet.outbox import Outbox, drain
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    with Outbox(tmp_path / 'outbox.db') as box:
+        yield box
+
+
+class TestOutbox:
+    """Test queue storage and state transitions."""
+
+    def test_claims_in_order(self, outbox):
+        """Test that items are claimed oldest first and only once."""
+        first = outbox.enqueue("first")
+        second = outbox.enqueue("second", "shot.png")
+
+        item = outbox.claim()
+        assert item['id'] == first
+        assert outbox.claim()['id'] == second
+        assert outbox.claim() is None
+        assert outbox.counts() == {'sending': 2}
+
+    def test_survives_reopen_and_recovers(self, tmp_path):
+        """Test that a crashed worker's in-flight item is posted again after restart."""
+        with Outbox(tmp_path / 'outbox.db') as box:
+            box.enqueue("queued before the crash")
+            box.claim()
+
+        with Outbox(tmp_path / 'outbox.db') as box:
+            assert box.claim() is None
+            assert box.recover() == 1
+            item = box.claim()
+            assert item['text'] == "queued before the crash"
+            assert item['attempts'] == 2
+
+    def test_remembers_profile(self, outbox, monkeypatch):
+        """Test that items keep the profile that was active when they were queued."""
+        monkeypatch.setenv('TERMTWEET_PROFILE', 'brand')
+        outbox.enqueue("from brand")
+        outbox.enqueue("from ops", profile='ops')
+        assert [outbox.claim()['profile'] for _ in range(2)] == ['brand', 'ops']
+
+    def test_upgrades_queue_without_profiles(self, tmp_path):
+        """Test that items queued by an older version are posted from the default profile."""
+        import sqlite3
+        conn = sqlite3.connect(str(tmp_path / 'outbox.db'))
+        conn.execute("CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL, "
+                     "images TEXT NOT NULL DEFAULT '[]', status TEXT NOT NULL DEFAULT 'pending', "
+                     "attempts INTEGER NOT NULL DEFAULT 0, tweet_id TEXT, error TEXT, "
+                     "created_at REAL NOT NULL, updated_at REAL NOT NULL)")
+        conn.execute("INSERT INTO outbox (text, created_at, updated_at) VALUES ('old', 0, 0)")
+        conn.commit()
+        conn.close()
+
+        with Outbox(tmp_path / 'outbox.db') as box:
+            assert box.claim()['profile'] == 'default'
+
+
+class TestDrain:
+    """Test the worker loop."""
+
+    def test_drain_posts_in_order(self, outbox):
+        """Test that every item is posted and marked done."""
+        for text in ("a", "b", "c"):
+            outbox.enqueue(text)
+        client = MagicMock()
+        client.tweet.side_effect = lambda text, images: TweetResult(text, tweet_id='t-' + text)
+
+        assert drain(outbox, lambda profile: client) == 3
+        assert [c.args[0] for c in client.tweet.call_args_list] == ["a", "b", "c"]
+        assert outbox.counts() == {'done': 3}
+
+    def test_failed_item_blocks_until_given_up(self, outbox, monkeypatch):
+        """Test that a failing head item is retried before later items, then skipped."""
+        monkeypatch.setattr(outbox_module, 'MAX_ATTEMPTS', 2)
+        outbox.enqueue("bad")
+        outbox.enqueue("good")
+        client = MagicMock()
+        client.tweet.side_effect = lambda text, images: (
+            TweetResult(text, error="503", kind='transient') if text == "bad" else TweetResult(text, tweet_id='1'))
+        sleeps = []
+
+        assert drain(outbox, lambda profile: client, sleep=sleeps.append) == 1
+        assert [c.args[0] for c in client.tweet.call_args_list] == ["bad", "bad", "good"]
+        assert sleeps == [outbox_module.RETRY_DELAY]
+        assert outbox.counts() == {'done': 1, 'failed': 1}
+
+    def test_permanent_failure_not_retried(self, outbox):
+        """Test that fatal, invalid and duplicate failures fail the item at once, without backoff."""
+        for kind in ('fatal', 'invalid', 'duplicate'):
+            outbox.enqueue(kind)
+        client = MagicMock()
+        client.tweet.side_effect = lambda text, images: TweetResult(text, error=text, kind=text)
+        sleeps = []
+
+        assert drain(outbox, lambda profile: client, sleep=sleeps.append) == 0
+        assert client.tweet.call_count == 3
+        assert sleeps == []
+        assert outbox.counts() == {'failed': 3}
+
+    def test_duplicate_after_crash_is_done(self, outbox):
+        """Test that a recovered item refused as a duplicate counts as posted, not failed."""
+        item_id = outbox.enqueue("posted before the crash")
+        outbox.claim()
+        assert outbox.recover() == 1
+        client = MagicMock()
+        client.tweet.return_value = TweetResult("posted before the crash", error="duplicate", kind='duplicate')
+
+        assert drain(outbox, lambda profile: client) == 1
+        assert outbox.counts() == {'done': 1}
+        row = outbox.conn.execute('SELECT error FROM outbox WHERE id = ?', (item_id,)).fetchone()
+        assert row['error'] is None
+
+    def test_posts_from_each_items_profile(self, outbox):
+        """Test that each item is posted through its own profile's client."""
+        outbox.enqueue("a", profile='brand')
+        outbox.enqueue("b", profile='default')
+        outbox.enqueue("c", profile='gone')
+        clients = {name: MagicMock() for name in ('brand', 'default')}
+        for name, client in clients.items():
+            client.tweet.side_effect = lambda text, images: TweetResult(text, tweet_id='1')
+
+        assert drain(outbox, clients.get) == 2
+        assert clients['brand'].tweet.call_args.args[0] == "a"
+        assert clients['default'].tweet.call_args.args[0] == "b"
+        assert outbox.counts() == {'done': 2, 'failed': 1}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
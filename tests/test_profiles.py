@@ -0,0 +1,147 @@
+"""
+Tests for TermTweet profiles and multi-account fan-out
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import threading
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import core, profiles
+from termtweet.client import TweetResult
+from termtweet.core import load_credentials, profile_path, read_env_file
+
+KEYS = ('TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN',
+        'TWITTER_ACCESS_TOKEN_SECRET', 'TWITTER_BEARER_TOKEN')
+
+
+def write_profile(name, token):
+    """Write a complete credentials file for a profile."""
+    path = profile_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(''.join(f"{key}={token}-{key.lower()}\n" for key in KEYS))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    """Start every test with no credential env vars and no cached clients."""
+    for key in KEYS:
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setattr(profiles, '_clients', {})
+
+
+class TestProfileConfig:
+    """Test loading and caching of profile credentials."""
+
+    def test_named_profile(self):
+        write_profile('brand', '111')
+        creds = load_credentials('brand')
+        assert creds[2] == '111-twitter_access_token'
+
+    def test_missing_profile(self):
+        assert load_credentials('nobody') is None
+
+    def test_named_profile_ignores_env_vars(self, monkeypatch):
+        write_profile('brand', '111')
+        monkeypatch.setenv('TWITTER_ACCESS_TOKEN', 'from-env')
+        assert load_credentials('brand')[2] == '111-twitter_access_token'
+        write_profile('default', '222')
+        assert load_credentials()[2] == 'from-env'
+
+    def test_active_profile_from_env(self, monkeypatch):
+        write_profile('brand', '111')
+        monkeypatch.setenv('TERMTWEET_PROFILE', 'brand')
+        assert load_credentials()[2] == '111-twitter_access_token'
+
+    def test_does_not_modify_environ(self):
+        write_profile('default', '222')
+        assert load_credentials() is not None
+        assert 'TWITTER_API_KEY' not in os.environ
+
+    def test_file_parsed_once_until_modified(self):
+        path = write_profile('brand', '111')
+        with patch('dotenv.dotenv_values', wraps=core._lazy('dotenv_values')) as parse:
+            with patch.dict(core.__dict__, {'dotenv_values': parse}):
+                read_env_file(path)
+                read_env_file(path)
+                assert parse.call_count == 1
+
+                write_profile('brand', '333')
+                stat = os.stat(path)
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                assert read_env_file(path)['TWITTER_ACCESS_TOKEN'] == '333-twitter_access_token'
+                assert parse.call_count == 2
+
+
+class TestFanout:
+    """Test posting the same tweet from several profiles."""
+
+    def test_list_profiles(self):
+        write_profile('zeta', '1')
+        write_profile('alpha', '2')
+        assert profiles.list_profiles() == ['alpha', 'zeta']
+        write_profile('default', '3')
+        assert profiles.list_profiles() == ['default', 'alpha', 'zeta']
+
+    @patch('termtweet.client.TermTweetClient')
+    def test_one_client_per_profile(self, mock_client_class):
+        write_profile('brand', '111')
+        assert profiles.get_client('brand') is profiles.get_client('brand')
+        assert mock_client_class.call_count == 1
+        assert profiles.get_client('nobody') is None
+
+    @patch('termtweet.client.TermTweetClient')
+    def test_posts_concurrently(self, mock_client_class):
+        names = ['a', 'b', 'c']
+        for name in names:
+            write_profile(name, name)
+        barrier = threading.Barrier(len(names), timeout=5)
+
+        def build(*creds):
+            client = MagicMock()
+            client.tweet.side_effect = lambda text, images: (
+                barrier.wait(), TweetResult(text, tweet_id=creds[2]))[1]
+            return client
+
+        mock_client_class.side_effect = build
+        results = profiles.post_to_profiles("Launch!", profiles=names)
+
+        # Every post was in flight at the same time, or the barrier would time out
+        assert {name: result.tweet_id for name, result in results.items()} == {
+            'a': 'a-twitter_access_token', 'b': 'b-twitter_access_token', 'c': 'c-twitter_access_token'}
+
+    def test_missing_profile_reported(self):
+        results = profiles.post_to_profiles("Launch!", profiles=['nobody'])
+        assert not results['nobody'].ok
+        assert 'nobody' in results['nobody'].error
+
+    @patch('termtweet.profiles.post_to_profiles')
+    def test_run_fanout_partial_failure(self, mock_post, capsys):
+        write_profile('a', '1')
+        write_profile('b', '2')
+        mock_post.return_value = {'a': TweetResult("x", tweet_id='1'), 'b': TweetResult("x", error="403")}
+        assert profiles.run_fanout("x") is False
+        out = capsys.readouterr().out
+        assert '✅ [a] 1' in out and '❌ [b] 403' in out
+
+    @patch('termtweet.profiles.post_to_profiles')
+    def test_enqueue_queues_one_post_per_profile(self, mock_post, monkeypatch):
+        from termtweet.cli import main
+        from termtweet.outbox import Outbox
+
+        write_profile('a', '1')
+        write_profile('b', '2')
+        monkeypatch.setattr(sys, 'argv', ['termtweet', 'Launch!', '--all-profiles', '--enqueue'])
+        main()
+        mock_post.assert_not_called()
+        with Outbox() as outbox:
+            assert [outbox.claim()['profile'] for _ in range(2)] == ['a', 'b']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,113 @@
+"""
+Tests for the host-wide rate limiter
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import time
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import ratelimit
+from termtweet.ratelimit import acquire, record, endpoint_key, account_key, RateLimitExceeded
+
+
+class Slept(Exception):
+    """Raised by the fake sleep so a blocked acquire() returns control to the test."""
+
+
+def fake_sleep(calls):
+    def sleep(seconds):
+        calls.append(seconds)
+        raise Slept()
+    return sleep
+
+
+def response(remaining, reset, status=200):
+    """Return the (status, headers) of a response carrying rate-limit headers."""
+    return status, {'x-rate-limit-remaining': str(remaining), 'x-rate-limit-reset': str(reset)}
+
+
+class TestEndpointKeys:
+    """Test how requests map onto rate-limit buckets."""
+
+    def test_endpoint_key(self):
+        assert endpoint_key('post', 'https://api.twitter.com/2/tweets') == 'POST /2/tweets'
+        assert endpoint_key('POST', 'https://upload.twitter.com/1.1/media/upload.json') == 'POST /1.1/media/upload'
+        assert endpoint_key('DELETE', 'https://api.twitter.com/2/tweets/12345') == 'DELETE /2/tweets/:id'
+
+    def test_account_key(self):
+        assert account_key('1787235158300753920-tsyCqj4N94') == '1787235158300753920'
+        assert account_key(None) == 'app'
+
+
+class TestAcquire:
+    """Test the shared token bucket."""
+
+    def test_unknown_endpoint_is_not_delayed(self):
+        """Test that calls go straight through before any headers are seen."""
+        sleeps = []
+        acquire('me', 'POST /2/tweets', sleep=fake_sleep(sleeps))
+        assert sleeps == []
+
+    def test_bucket_is_shared_through_the_state_file(self):
+        """Test that calls taken by one process are visible to the next."""
+        reset = int(time.time()) + 600
+        record('me', 'POST /2/tweets', *response(50, reset))
+        acquire('me', 'POST /2/tweets')
+        acquire('me', 'POST /2/tweets')
+        # A stale header from an earlier request does not restore spent calls
+        record('me', 'POST /2/tweets', *response(50, reset))
+        state = ratelimit._load(ratelimit._paths()[0])
+        assert state['me:POST /2/tweets']['remaining'] == 48
+
+    def test_empty_bucket_waits_for_reset(self):
+        """Test that an exhausted bucket sleeps until the window resets."""
+        record('me', 'POST /2/tweets', *response(5, int(time.time()) + 30, status=429))
+        sleeps = []
+        with pytest.raises(Slept):
+            acquire('me', 'POST /2/tweets', sleep=fake_sleep(sleeps))
+        assert 25 < sleeps[0] <= 30
+
+    def test_wait_beyond_limit_raises(self):
+        """Test that callers are not blocked longer than max_wait."""
+        record('me', 'POST /2/tweets', *response(0, int(time.time()) + 3600))
+        with pytest.raises(RateLimitExceeded):
+            acquire('me', 'POST /2/tweets', max_wait=60)
+
+    def test_low_bucket_is_paced(self):
+        """Test that the last few calls are spread over the rest of the window."""
+        record('me', 'POST /2/tweets', *response(2, int(time.time()) + 100))
+        acquire('me', 'POST /2/tweets')
+        sleeps = []
+        with pytest.raises(Slept):
+            acquire('me', 'POST /2/tweets', sleep=fake_sleep(sleeps))
+        assert 40 < sleeps[0] <= 50
+
+    def test_accounts_do_not_share_buckets(self):
+        """Test that another account's exhausted bucket does not block this one."""
+        record('other', 'POST /2/tweets', *response(0, int(time.time()) + 3600))
+        acquire('me', 'POST /2/tweets', max_wait=0)
+
+
+
+class TestRateLimitedSession:
+    """Test that sessions feed every response into the shared state."""
+
+    def test_session_records_headers(self):
+        """Test that a request updates the bucket for its endpoint."""
+        session = ratelimit.RateLimitedSession('me')
+        reset = int(time.time()) + 600
+        status, headers = response(7, reset)
+        with patch('requests.Session.request', return_value=MagicMock(status_code=status, headers=headers)) as mock_request:
+            session.request('POST', 'https://api.twitter.com/2/tweets', json={'text': 'hi'})
+            mock_request.assert_called_once()
+        state = ratelimit._load(ratelimit._paths()[0])
+        assert state['me:POST /2/tweets'] == {'remaining': 7, 'reset': reset, 'next': 0}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
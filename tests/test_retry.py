@@ -0,0 +1,172 @@
+"""
+Tests for TermTweet retries and the circuit breaker
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+import time
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.retry import (ATTEMPTS, FATAL, RATE_LIMITED, TRANSIENT, CircuitBreaker, CircuitOpen,
+                             RetryPolicy, classify, retry_after)
+
+
+class HTTPError(Exception):
+    """Stand-in for tweepy's HTTPException: carries a requests-style response."""
+
+    def __init__(self, status, headers=None):
+        super().__init__(f"{status} error")
+        self.response = MagicMock(status_code=status, headers=headers or {})
+
+
+def flaky(*errors, result='ok'):
+    """Return a mock that raises each error in turn, then returns result."""
+    return MagicMock(side_effect=list(errors) + [result])
+
+
+class TestClassify:
+    """Test which failures are worth retrying."""
+
+    def test_http_statuses(self):
+        assert classify(HTTPError(503)) == TRANSIENT
+        assert classify(HTTPError(429)) == RATE_LIMITED
+        assert classify(HTTPError(401)) == FATAL
+        assert classify(HTTPError(403)) == FATAL
+
+    def test_wrapped_connection_errors(self):
+        """Test that a connection reset wrapped by tweepy is still transient."""
+        try:
+            try:
+                raise ConnectionResetError("reset by peer")
+            except ConnectionResetError as e:
+                raise RuntimeError(f"Failed to send request: {e}")
+        except RuntimeError as wrapped:
+            assert classify(wrapped) == TRANSIENT
+        assert classify(ValueError("bad input")) == FATAL
+
+    def test_retry_after(self):
+        assert retry_after(HTTPError(429, {'retry-after': '7'})) == 7.0
+        assert retry_after(HTTPError(429, {'x-rate-limit-reset': '1010'}), now=1000) == 10
+        assert retry_after(HTTPError(429)) is None
+
+
+class TestRetryPolicy:
+    """Test backoff and give-up behaviour."""
+
+    def test_retries_transient_then_succeeds(self):
+        sleeps = []
+        function = flaky(HTTPError(503), ConnectionResetError())
+        assert RetryPolicy(sleep=sleeps.append).call(function, 'x', key=1) == 'ok'
+        assert function.call_count == 3
+        function.assert_called_with('x', key=1)
+        # Full jitter: never longer than the exponential cap
+        assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+
+    def test_fatal_is_not_retried(self):
+        function = flaky(HTTPError(403))
+        with pytest.raises(HTTPError):
+            RetryPolicy(sleep=lambda seconds: None).call(function)
+        assert function.call_count == 1
+
+    def test_gives_up_after_attempts(self):
+        function = MagicMock(side_effect=HTTPError(502))
+        with pytest.raises(HTTPError):
+            RetryPolicy(sleep=lambda seconds: None).call(function)
+        assert function.call_count == ATTEMPTS
+
+    def test_rate_limit_waits_for_retry_after(self):
+        sleeps = []
+        function = flaky(HTTPError(429, {'retry-after': '12'}))
+        assert RetryPolicy(sleep=sleeps.append).call(function) == 'ok'
+        assert sleeps == [12.0]
+
+    def test_call_once_does_not_repeat_sent_requests(self):
+        """Test that a post is not retried when the server may already have acted."""
+        import requests
+        from urllib3.exceptions import NewConnectionError
+
+        policy = RetryPolicy(sleep=lambda seconds: None)
+        for error in (ConnectionResetError("reset"), requests.ReadTimeout("read timed out"), HTTPError(500)):
+            function = flaky(error)
+            with pytest.raises(type(error)):
+                policy.call_once(function)
+            assert function.call_count == 1
+
+        try:
+            raise requests.ConnectionError("refused") from NewConnectionError(None, "refused")
+        except requests.ConnectionError as e:
+            refused = e
+        function = flaky(refused, HTTPError(503), HTTPError(429, {'retry-after': '0'}))
+        assert policy.call_once(function) == 'ok'
+        assert function.call_count == 4
+
+    def test_rate_limit_too_far_away(self):
+        function = flaky(HTTPError(429, {'x-rate-limit-reset': str(int(time.time()) + 3600)}))
+        with pytest.raises(HTTPError):
+            RetryPolicy(sleep=lambda seconds: None).call(function)
+        assert function.call_count == 1
+
+
+class TestCircuitBreaker:
+    """Test fail-fast after repeated failures."""
+
+    def test_opens_and_recovers(self):
+        now = [0.0]
+        breaker = CircuitBreaker(threshold=2, cooldown=10, clock=lambda: now[0])
+        policy = RetryPolicy(attempts=1, breaker=breaker, sleep=lambda seconds: None)
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                policy.call(MagicMock(side_effect=HTTPError(500)))
+        assert breaker.state == 'open'
+
+        untouched = MagicMock()
+        with pytest.raises(CircuitOpen):
+            policy.call(untouched)
+        untouched.assert_not_called()
+
+        # After the cooldown one trial call goes through and closes the breaker
+        now[0] = 11
+        assert breaker.state == 'half_open'
+        assert policy.call(MagicMock(return_value='ok')) == 'ok'
+        assert breaker.state == 'closed'
+
+    def test_trial_ending_in_client_error_closes(self):
+        """Test that a 4xx trial call does not leave the breaker stuck half-open."""
+        now = [0.0]
+        breaker = CircuitBreaker(threshold=1, cooldown=10, clock=lambda: now[0])
+        policy = RetryPolicy(attempts=1, breaker=breaker, sleep=lambda seconds: None)
+        with pytest.raises(HTTPError):
+            policy.call(MagicMock(side_effect=HTTPError(500)))
+
+        now[0] = 11
+        with pytest.raises(HTTPError):
+            policy.call(MagicMock(side_effect=HTTPError(403)))
+        assert breaker.state == 'closed'
+        now[0] = 1000
+        assert policy.call(MagicMock(return_value='ok')) == 'ok'
+
+    def test_trial_ending_without_response_is_released(self):
+        """Test that a trial that never reached the API lets the next call try."""
+        now = [0.0]
+        breaker = CircuitBreaker(threshold=1, cooldown=10, clock=lambda: now[0])
+        policy = RetryPolicy(attempts=1, breaker=breaker, sleep=lambda seconds: None)
+        with pytest.raises(HTTPError):
+            policy.call(MagicMock(side_effect=HTTPError(500)))
+        now[0] = 11
+        with pytest.raises(ValueError):
+            policy.call(MagicMock(side_effect=ValueError("bad input")))
+        assert policy.call(MagicMock(return_value='ok')) == 'ok'
+
+    def test_client_errors_do_not_trip(self):
+        breaker = CircuitBreaker(threshold=1)
+        with pytest.raises(HTTPError):
+            RetryPolicy(breaker=breaker).call(MagicMock(side_effect=HTTPError(403)))
+        assert breaker.state == 'closed'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
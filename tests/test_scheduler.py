@@ -0,0 +1,182 @@
+"""
+Tests for TermTweet scheduled posting
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import scheduler
+from termtweet.client import MediaResult, TweetResult
+from termtweet.scheduler import Schedule, Scheduler, load_schedule, parse_time, schedule_file
+
+
+@pytest.fixture
+def schedule(tmp_path):
+    with Schedule(tmp_path / 'schedule.db') as store:
+        yield store
+
+
+class FakeClock:
+    """Clock whose wait() jumps straight to the requested time."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.waits = []
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, seconds):
+        self.waits.append(seconds)
+        self.now += seconds
+
+
+def make_client(log, clock):
+    """Build a mock client that logs (action, argument, time) for every call."""
+    client = MagicMock()
+    client.upload_all.side_effect = lambda images: log.append(('upload', images, clock())) or [
+        MediaResult(path, media_id='m1') for path in images]
+    client.tweet.side_effect = lambda text, images: log.append(('tweet', text, clock())) or TweetResult(
+        text, tweet_id='t1')
+    return client
+
+
+class TestParseTime:
+    """Test the --at time formats."""
+
+    def test_formats(self):
+        expected = datetime(2026, 10, 20, 9, 0, tzinfo=timezone.utc).timestamp()
+        assert parse_time('2026-10-20T09:00Z') == expected
+        assert parse_time('2026-10-20T11:00+02:00') == expected
+        assert parse_time('+90m', now=1000) == 1000 + 90 * 60
+        assert parse_time('+2d', now=0) == 2 * 24 * 60 * 60
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="Unrecognized time"):
+            parse_time('next tuesday')
+
+
+class TestScheduler:
+    """Test the heap-driven runner."""
+
+    def test_fires_in_due_order_without_polling(self, schedule):
+        """Test that posts fire in time order, sleeping straight to each one."""
+        clock = FakeClock()
+        schedule.add("third", due_at=1300, profile='default')
+        schedule.add("first", due_at=1010, profile='default')
+        schedule.add("second", due_at=1100, profile='default')
+        log = []
+        runner = Scheduler(schedule, lambda profile: make_client(log, clock), clock=clock)
+
+        assert runner.run(clock.wait, follow=False) == 3
+        assert log == [('tweet', "first", 1010), ('tweet', "second", 1100), ('tweet', "third", 1300)]
+        # Sleeps go straight to the next due time, capped by the rescan interval
+        assert clock.waits == [10, 60, 30, 60, 60, 60, 20]
+        assert schedule.counts() == {'done': 3}
+
+    def test_preloads_media_before_due(self, schedule, tmp_path):
+        """Test that media is uploaded PRELOAD_LEAD before the post fires."""
+        clock = FakeClock()
+        image = tmp_path / 'shot.png'
+        image.write_bytes(b'png')
+        schedule.add("with media", str(image), due_at=2000, profile='default')
+        log = []
+        runner = Scheduler(schedule, lambda profile: make_client(log, clock), lead=300, clock=clock)
+
+        runner.load()
+        assert runner.next_due() == 1700
+        runner.run(clock.wait, follow=False)
+        assert log == [('upload', [str(image)], 1700), ('tweet', "with media", 2000)]
+
+    def test_overdue_and_cancelled(self, schedule):
+        """Test that overdue posts fire at once and non-pending ones are skipped."""
+        clock = FakeClock()
+        schedule.add("overdue", due_at=500, profile='default')
+        cancelled = schedule.add("cancelled", due_at=900, profile='default')
+        schedule.mark_failed(cancelled, "cancelled")
+        log = []
+        Scheduler(schedule, lambda profile: make_client(log, clock), clock=clock).run(clock.wait, follow=False)
+        assert log == [('tweet', "overdue", 1000)]
+
+    def test_failed_post_and_missing_profile(self, schedule):
+        """Test that failures are recorded per item."""
+        clock = FakeClock()
+        schedule.add("boom", due_at=1000, profile='default')
+        schedule.add("nobody", due_at=1000, profile='ghost')
+        client = MagicMock()
+        client.tweet.return_value = TweetResult("boom", error="403 Forbidden")
+        runner = Scheduler(schedule, lambda profile: client if profile == 'default' else None, clock=clock)
+        runner.run(clock.wait, follow=False)
+        assert schedule.counts() == {'failed': 2}
+
+    def test_notify_wakes_runner(self, tmp_path):
+        """Test that scheduling from another process interrupts the runner's sleep."""
+        waker = scheduler._Waker(scheduler._wake_path())
+        if waker.sock is None:
+            pytest.skip("Unix datagram sockets unavailable")
+        try:
+            timer = threading.Timer(0.1, scheduler.notify)
+            timer.start()
+            started = time.monotonic()
+            waker.wait(5)
+            assert time.monotonic() - started < 2
+        finally:
+            waker.close()
+
+
+class TestScheduleFile:
+    """Test loading and validating schedule files."""
+
+    def test_load_and_schedule(self, tmp_path):
+        path = tmp_path / 'campaign.jsonl'
+        path.write_text('{"text": "one", "at": "2030-01-01T09:00Z"}\n'
+                        '{"text": "two", "at": "2030-01-02T09:00Z", "image": "a.png"}\n')
+        records = load_schedule(str(path))
+        assert records[1]['images'] == [str(tmp_path / 'a.png')]
+        assert records[0]['due_at'] == parse_time('2030-01-01T09:00Z')
+
+    def test_missing_time(self, tmp_path, capsys):
+        path = tmp_path / 'campaign.csv'
+        path.write_text('text,at\nhello,\n')
+        assert schedule_file(str(path)) is False
+        assert "Record 1" in capsys.readouterr().out
+
+    def test_past_time_rejected(self, tmp_path, capsys):
+        path = tmp_path / 'campaign.jsonl'
+        path.write_text('{"text": "late", "at": "2020-01-01T09:00Z"}\n')
+        assert schedule_file(str(path)) is False
+        assert "is in the past" in capsys.readouterr().out
+
+    def test_schedules_valid_file(self, tmp_path):
+        path = tmp_path / 'campaign.csv'
+        path.write_text('text,at\nhello,2030-01-01T09:00Z\nworld,+1h\n')
+        assert schedule_file(str(path)) is True
+        with Schedule() as store:
+            assert store.counts() == {'pending': 2}
+
+
+class TestCommand:
+    """Test --at on the command line."""
+
+    @pytest.mark.parametrize('flag', ['--thread', '--all-profiles'])
+    def test_at_rejected_with_immediate_modes(self, flag, monkeypatch, capsys):
+        from termtweet.cli import main
+
+        monkeypatch.setattr(sys, 'argv', ['termtweet', 'hello', flag, '--at', '+1h'])
+        with pytest.raises(SystemExit):
+            main()
+        assert "--at cannot be combined" in capsys.readouterr().out
+        with Schedule() as store:
+            assert store.counts() == {}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
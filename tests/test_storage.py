@@ -0,0 +1,53 @@
+"""
+Tests for TermTweet state file helpers
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.storage import SQLiteStore, load_json, save_json_atomic, write_atomic
+
+
+class TestJSON:
+    """Test atomic JSON state files."""
+
+    def test_round_trip_creates_directories(self, tmp_path):
+        path = tmp_path / 'nested' / 'state.json'
+        save_json_atomic(path, {'since_id': '42'})
+        assert load_json(path) == {'since_id': '42'}
+        assert os.listdir(path.parent) == ['state.json']
+
+    def test_missing_or_torn_file_gives_default(self, tmp_path):
+        path = tmp_path / 'state.json'
+        assert load_json(path, {}) == {}
+        path.write_text('{"since_id": ')
+        assert load_json(path) is None
+
+    def test_write_bytes_and_text(self, tmp_path):
+        path = tmp_path / 'out.bin'
+        write_atomic(path, b'\x89PNG')
+        assert path.read_bytes() == b'\x89PNG'
+        write_atomic(str(path), 'text')
+        assert path.read_text() == 'text'
+
+
+
+class TestSQLiteStore:
+    """Test the shared SQLite store setup."""
+
+    def test_wal_schema_and_close(self, tmp_path):
+        path = tmp_path / 'state' / 'test.db'
+        with SQLiteStore(path, 'CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY);') as store:
+            assert store.path == str(path)
+            assert store.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            store.conn.execute('INSERT INTO items VALUES (1)')
+        with SQLiteStore(path, 'CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY);') as store:
+            assert store.conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
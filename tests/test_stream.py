@@ -0,0 +1,153 @@
+"""
+Tests for TermTweet stdin streaming
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import io
+import sys
+import os
+import threading
+import time
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.stream import iter_records, post_stream, run_stream
+from termtweet.client import TweetResult
+
+
+class TestIterRecords:
+    """Test parsing of streamed lines."""
+
+    def test_text_and_json_lines(self, tmp_path):
+        """Test that plain lines are text and '{' lines are JSON records."""
+        lines = ['deployed v1\n', '\n', '{"text": "with image", "image": "shot.png"}\n', '{broken\n']
+        records = list(iter_records(lines, base_dir=str(tmp_path)))
+
+        assert records[0] == (1, {'text': 'deployed v1', 'images': []}, None)
+        assert records[1] == (3, {'text': 'with image', 'images': [str(tmp_path / 'shot.png')]}, None)
+        assert records[2][0] == 4 and records[2][1] is None
+        assert 'invalid JSON' in records[2][2]
+
+    def test_reads_lazily(self):
+        """Test that lines are only consumed as records are requested."""
+        consumed = []
+
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"line {i}\n"
+
+        records = iter_records(lines())
+        next(records)
+        assert consumed == [0]
+
+
+class TestPostStream:
+    """Test bounded, backpressured posting."""
+
+    def test_posts_and_counts(self):
+        """Test that valid lines are posted and invalid ones reported."""
+        client = MagicMock()
+        client.tweet.side_effect = lambda text, images: TweetResult(text, tweet_id=f"id-{text}")
+        reports = []
+
+        stats = post_stream(['one\n', 'x' * 281 + '\n', 'two\n'], client, 2,
+                            report=lambda *args: reports.append(args))
+
+        assert stats['read'] == 3 and stats['posted'] == 2 and stats['invalid'] == 1
+        assert stats['in_flight'] == 0
+        assert sorted(r[1] for r in reports if r[1]) == ['id-one', 'id-two']
+        assert any(r[0] == 2 and 'Maximum' in r[2] for r in reports)
+
+    def test_failed_posts_counted(self):
+        """Test that API errors and exceptions count as failures."""
+        client = MagicMock()
+        client.tweet.side_effect = [TweetResult('a', error='403 Forbidden'), RuntimeError('boom')]
+
+        stats = post_stream(['a\n', 'b\n'], client, 1, report=lambda *args: None)
+        assert stats['failed'] == 2 and stats['posted'] == 0
+
+    def test_backpressure(self):
+        """Test that a slow API stops the reader from pulling more lines."""
+        release = threading.Event()
+        consumed = []
+        peak = [0]
+        active = [0]
+        lock = threading.Lock()
+
+        def slow_tweet(text, images):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            release.wait()
+            with lock:
+                active[0] -= 1
+            return TweetResult(text, tweet_id='1')
+
+        def lines():
+            for i in range(100):
+                consumed.append(i)
+                yield f"post {i}\n"
+
+        client = MagicMock()
+        client.tweet.side_effect = slow_tweet
+        worker = threading.Thread(target=post_stream, args=(lines(), client, 3),
+                                  kwargs={'report': lambda *args: None})
+        worker.start()
+        time.sleep(0.2)
+        # Three posts in flight and one line read while waiting for a slot
+        assert len(consumed) == 4
+        release.set()
+        worker.join(5)
+        assert len(consumed) == 100 and peak[0] <= 3
+
+    def test_interrupt_drains_in_flight(self):
+        """Test that Ctrl+C stops reading but lets in-flight posts finish."""
+        def lines():
+            yield 'first\n'
+            yield 'second\n'
+            raise KeyboardInterrupt
+
+        def tweet(text, images):
+            time.sleep(0.05)
+            return TweetResult(text, tweet_id='1')
+
+        client = MagicMock()
+        client.tweet.side_effect = tweet
+        stats = post_stream(lines(), client, 2, report=lambda *args: None)
+
+        assert stats['interrupted']
+        assert stats['posted'] == 2 and stats['in_flight'] == 0
+
+
+class TestRunStream:
+    """Test the --stdin entry point."""
+
+    def test_dry_run(self, capsys):
+        """Test that a dry run validates without loading a client."""
+        with patch('termtweet.client.TermTweetClient') as mock_client:
+            assert run_stream(io.StringIO('fine\n\n' + 'x' * 281 + '\n'), dry_run=True) is False
+            mock_client.assert_not_called()
+        output = capsys.readouterr().out
+        assert '1 valid, 1 invalid' in output
+
+    def test_no_credentials(self, capsys):
+        """Test that a missing configuration is reported."""
+        with patch('termtweet.client.TermTweetClient.from_credentials', return_value=None):
+            assert run_stream(io.StringIO('hello\n')) is False
+        assert 'No credentials' in capsys.readouterr().out
+
+    def test_summary(self, capsys):
+        """Test that EOF flushes and prints a summary."""
+        client = MagicMock()
+        client.__enter__.return_value = client
+        client.tweet.side_effect = lambda text, images: TweetResult(text, tweet_id='42')
+        with patch('termtweet.client.TermTweetClient.from_credentials', return_value=client):
+            assert run_stream(io.StringIO('a\nb\n'), concurrency=2) is True
+        assert 'Posted 2/2' in capsys.readouterr().out
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,69 @@
+"""
+Tests for TermTweet weighted tweet length
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.text import MAX_TWEET_LENGTH, fits, truncate, validate_many, weighted_length
+
+
+class TestWeightedLength:
+    """Test that lengths match the platform's counting rules."""
+
+    @pytest.mark.parametrize('text, expected', [
+        ("hello world", 11),
+        ("v1.2.3 is out.", 14),
+        ("Notes: https://example.com/releases/2024/very/long/path.", 7 + 23 + 1),
+        ("(see example.com)", 5 + 23 + 1),
+        ("mail me at dev@example.com", 26),
+        ("https://a.io https://b.io", 23 + 1 + 23),
+        ("日本語", 6),
+        ("café", 4),
+        ("cafe\u0301", 4),  # NFC folds e + combining accent into one code point
+        ("“quoted” — ok", 13),
+        ("👍", 2),
+        ("👍🏽", 2),
+        ("👨‍👩‍👧‍👦", 2),
+        ("🇺🇸🇬🇧", 4),
+        ("❤️", 2),
+        ("1️⃣ go", 5),
+        ("日本 https://a.jp/x?y=1!", 2 * 2 + 1 + 23 + 1),
+    ])
+    def test_weighted_length(self, text, expected):
+        assert weighted_length(text) == expected
+
+    def test_long_url_fits(self):
+        text = "x" * 250 + " https://example.com/" + "a" * 100
+        assert len(text) > MAX_TWEET_LENGTH
+        assert fits(text)
+
+    def test_cjk_limit_is_140(self):
+        assert fits("中" * 140)
+        assert not fits("中" * 141)
+        assert not fits("")
+
+    def test_truncate(self):
+        assert truncate("中" * 200, 10) == "中" * 5
+        assert truncate("short", 10) == "short"
+
+
+class TestValidateMany:
+    """Test bulk validation of drafts."""
+
+    def test_reports_by_index(self):
+        problems = validate_many(["ok", "", "a" * 281, "中" * 140, "🎉" * 141])
+        assert [index for index, _ in problems] == [2, 3, 5]
+        assert "empty" in problems[0][1]
+        assert "281" in problems[1][1]
+
+    def test_accepts_generators(self):
+        assert validate_many(f"draft {i}" for i in range(1000)) == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
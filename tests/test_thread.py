@@ -0,0 +1,135 @@
+"""
+Tests for TermTweet thread mode
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import threading
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet.client import MediaResult, TweetResult
+from termtweet.text import weighted_length
+from termtweet.thread import split_thread, post_thread, run_thread
+
+
+class TestSplitThread:
+    """Test splitting long text into numbered parts."""
+
+    def test_short_text_unchanged(self):
+        """Test that text that fits in one tweet is not numbered."""
+        assert split_thread("Just one tweet.") == ["Just one tweet."]
+
+    def test_parts_fit_and_are_numbered(self):
+        """Test that every part fits and carries its position."""
+        text = " ".join(f"Sentence number {i} of the changelog." for i in range(60))
+        parts = split_thread(text)
+        assert len(parts) > 1
+        assert all(len(part) <= 280 for part in parts)
+        assert [part.rsplit(' ', 1)[1] for part in parts] == [f"{i}/{len(parts)}" for i in range(1, len(parts) + 1)]
+        # Sentences are never cut in the middle
+        assert all(part.rsplit(' ', 1)[0].endswith('.') for part in parts)
+
+    def test_long_words_and_forced_breaks(self):
+        """Test splitting of sentences without boundaries and '---' part breaks."""
+        parts = split_thread("intro\n---\n" + "x" * 600)
+        assert parts[0] == "intro 1/4"
+        assert all(len(part) <= 280 for part in parts)
+        assert "".join(part.rsplit(' ', 1)[0] for part in parts[1:]) == "x" * 600
+
+    def test_weighted_lengths(self):
+        """Test that links count as 23 and CJK text as double when splitting."""
+        links = " ".join(f"https://example.com/{'a' * 80}/{i}" for i in range(10))
+        assert split_thread(links) == [links]
+
+        parts = split_thread("中" * 300)
+        assert len(parts) == 3
+        assert all(weighted_length(part) <= 280 for part in parts)
+
+
+class TestRunThread:
+    """Test validation before a thread is posted."""
+
+    @pytest.mark.parametrize('text', ["", "  \n\t "])
+    def test_empty_text_rejected(self, text, capsys):
+        with patch('termtweet.client.TermTweetClient.from_credentials') as from_credentials:
+            assert run_thread(text) is False
+        from_credentials.assert_not_called()
+        assert "Tweet text is empty." in capsys.readouterr().out
+
+    def test_cli_images_on_later_part(self, tmp_path):
+        """Test that --image N:path attaches an image to tweet N of the thread."""
+        from termtweet.cli import main
+
+        hero, chart = tmp_path / 'hero.png', tmp_path / 'chart.png'
+        hero.write_bytes(b'png')
+        chart.write_bytes(b'png')
+        text = "First part.\n---\nSecond part.\n---\nThird part."
+        client = MagicMock()
+        client.__enter__.return_value = client
+        client.upload_all.side_effect = lambda paths: [MediaResult(path, media_id=f'm-{os.path.basename(path)}')
+                                                       for path in paths]
+        client.post.side_effect = lambda text, media_ids, in_reply_to=None: TweetResult(
+            text, tweet_id=str(len(client.post.call_args_list)), media_ids=media_ids)
+
+        argv = ['termtweet', '--thread', text, '--image', str(hero), '--image', f'3:{chart}']
+        with patch('sys.argv', argv), \
+                patch('termtweet.client.TermTweetClient.from_credentials', return_value=client):
+            main()
+        assert [c.args[1] for c in client.post.call_args_list] == [['m-hero.png'], [], ['m-chart.png']]
+
+    def test_image_for_missing_part_rejected(self, tmp_path, capsys):
+        chart = tmp_path / 'chart.png'
+        chart.write_bytes(b'png')
+        with patch('termtweet.client.TermTweetClient.from_credentials') as from_credentials:
+            assert run_thread("Just one part.", [f'5:{chart}']) is False
+        from_credentials.assert_not_called()
+        assert "is for tweet 5, but the thread has 1 tweets." in capsys.readouterr().out
+
+
+class TestPostThread:
+    """Test posting a thread as a reply chain."""
+
+    def test_replies_chain_and_uploads_run_ahead(self):
+        """Test that each part replies to the previous one and later uploads start early."""
+        client = MagicMock()
+        third_upload_started = threading.Event()
+
+        def upload_all(paths):
+            if paths == ['c.png']:
+                third_upload_started.set()
+            return [MediaResult(path, media_id='m-' + path) for path in paths]
+
+        def post(text, media_ids, in_reply_to=None):
+            # The first post happens only once the upload for part 3 is already running
+            assert third_upload_started.wait(5)
+            return TweetResult(text, tweet_id='t-' + text, media_ids=media_ids)
+
+        client.upload_all.side_effect = upload_all
+        client.post.side_effect = post
+
+        results = post_thread(client, ['a', 'b', 'c'], {0: 'a.png', 2: 'c.png'})
+        assert [r.tweet_id for r in results] == ['t-a', 't-b', 't-c']
+        calls = client.post.call_args_list
+        assert calls[0].args == ('a', ['m-a.png'])
+        assert calls[0].kwargs == {'in_reply_to': None}
+        assert calls[1].kwargs == {'in_reply_to': 't-a'}
+        assert calls[2].args == ('c', ['m-c.png'])
+        assert calls[2].kwargs == {'in_reply_to': 't-b'}
+
+    def test_stops_at_first_failure(self):
+        """Test that the chain stops when a part fails to post."""
+        client = MagicMock()
+        client.post.side_effect = [TweetResult('a', tweet_id='1'), TweetResult('b', error='boom')]
+
+        results = post_thread(client, ['a', 'b', 'c'])
+        assert len(results) == 2
+        assert results[-1].error == 'boom'
+        assert client.post.call_count == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,88 @@
+"""
+Tests for TermTweet tracing spans
+"""
+
+import pytest
+from unittest.mock import patch
+import json
+import threading
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import trace
+
+
+@pytest.fixture
+def spans(tmp_path):
+    """Enable tracing to a temporary file and return a function that reads the spans back."""
+    path = tmp_path / 'trace.jsonl'
+    trace.configure(str(path))
+
+    def read():
+        if not path.exists():
+            return []
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    yield read
+    trace.configure(None)
+
+
+class TestTrace:
+    """Test span recording and the disabled fast path."""
+
+    def test_disabled_is_noop(self, tmp_path):
+        trace.configure(None)
+        with trace.span('anything', size=1) as span:
+            span.set(more=2)
+        assert span is trace.current()
+        assert trace.wrap(len) is len
+
+    def test_nested_spans(self, spans):
+        with trace.span('outer', kind='test') as outer:
+            with trace.span('inner') as inner:
+                inner.set(bytes=10)
+        inner_record, outer_record = spans()
+        assert inner_record['name'] == 'inner' and inner_record['attributes'] == {'bytes': 10}
+        assert inner_record['parent_span_id'] == outer.span_id
+        assert outer_record['parent_span_id'] is None
+        assert inner_record['trace_id'] == outer_record['trace_id']
+        assert outer_record['end_time_unix_nano'] >= outer_record['start_time_unix_nano']
+        assert outer_record['status'] == 'OK'
+
+    def test_errors_recorded(self, spans):
+        with trace.span('swallowed') as span:
+            span.error(ValueError("bad media"))
+        with pytest.raises(KeyError):
+            with trace.span('raised'):
+                raise KeyError('id')
+        swallowed, raised = spans()
+        assert swallowed['status'] == 'ERROR' and swallowed['error'] == "ValueError: bad media"
+        assert raised['status'] == 'ERROR' and raised['error'].startswith('KeyError')
+
+    def test_wrap_nests_thread_work(self, spans):
+        def work():
+            with trace.span('worker'):
+                pass
+
+        with trace.span('parent') as parent:
+            thread = threading.Thread(target=trace.wrap(work))
+            thread.start()
+            thread.join()
+        assert spans()[0]['parent_span_id'] == parent.span_id
+
+    def test_core_tweet_span(self, mock_server, spans):
+        from termtweet.core import tweet
+
+        mock_server()
+        creds = ('a' * 25, 'b' * 50, '1000-token', 'c' * 45, 'bearer')
+        with patch('termtweet.core.load_credentials', return_value=creds):
+            assert tweet("hello") is True
+        names = [record['name'] for record in spans()]
+        assert names.count('tweet') == 1 and 'post_tweet' in names
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,183 @@
+"""
+Tests for chunked, resumable media uploads
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import json
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import retry, upload
+from termtweet.upload import (category_for, check_delay, chunked_upload, chunk_size_for, needs_chunked_upload,
+                              wait_for_processing)
+
+
+@pytest.fixture
+def state_home(termtweet_home, monkeypatch):
+    """Retry without backoff and return the state directory uploads resume from."""
+    monkeypatch.setattr(retry, 'BASE_DELAY', 0)
+    return termtweet_home
+
+
+def make_api():
+    """Build a mock tweepy.API that accepts every chunked upload command."""
+    api = MagicMock()
+    api.auth.access_token = 'token'
+    api.chunked_upload_init.return_value = MagicMock(media_id_string='m1', expires_after_secs=3600)
+    api.chunked_upload_finalize.return_value = MagicMock(processing_info=None)
+    return api
+
+
+def appended(api):
+    """Return {segment_index: bytes} for every APPEND the mock API received."""
+    return {c.args[2]: c.args[1][1] for c in api.chunked_upload_append.call_args_list}
+
+
+class TestChunkedUpload:
+    """Test INIT/APPEND/FINALIZE uploads."""
+
+    def test_uploads_every_segment(self, state_home, tmp_path):
+        """Test that the file is split into segments and finalized."""
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'abcdefghij')
+
+        api = make_api()
+        assert chunked_upload(api, str(video), chunk_size=4) == 'm1'
+        assert appended(api) == {0: b'abcd', 1: b'efgh', 2: b'ij'}
+        api.chunked_upload_finalize.assert_called_once_with('m1')
+        assert not list((state_home / 'uploads').glob('*.json'))
+
+    def test_retries_only_failed_segment(self, state_home, tmp_path):
+        """Test that a failed APPEND is retried without resending other segments."""
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'abcdefgh')
+
+        api = make_api()
+        failures = {1: 1}
+
+        def append(media_id, media, index):
+            if failures.get(index):
+                failures[index] -= 1
+                raise ConnectionResetError("connection reset")
+        api.chunked_upload_append.side_effect = append
+
+        chunked_upload(api, str(video), chunk_size=4)
+        indexes = [c.args[2] for c in api.chunked_upload_append.call_args_list]
+        assert sorted(indexes) == [0, 1, 1]
+
+    def test_resumes_interrupted_upload(self, state_home, tmp_path):
+        """Test that a second call skips INIT and segments already accepted."""
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'abcdefghij')
+
+        def append(media_id, media, index):
+            if index == 2:
+                raise Exception("dropped")
+
+        api = make_api()
+        api.chunked_upload_append.side_effect = append
+        with pytest.raises(Exception, match="dropped"):
+            chunked_upload(api, str(video), chunk_size=4)
+
+        state_file, = (state_home / 'uploads').glob('*.json')
+        assert sorted(json.loads(state_file.read_text())['done']) == [0, 1]
+
+        resumed = make_api()
+        assert chunked_upload(resumed, str(video), chunk_size=4) == 'm1'
+        resumed.chunked_upload_init.assert_not_called()
+        assert appended(resumed) == {2: b'ij'}
+
+
+class FakeClock:
+    """Clock whose sleep() advances time instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def status_api(clock, ready_at, failed=()):
+    """Build a mock API whose STATUS reports each media as in progress until its ready_at time."""
+    api = MagicMock()
+    api.checks = []
+
+    def status(media_id):
+        api.checks.append((media_id, clock()))
+        if media_id in failed:
+            info = {'state': 'failed', 'error': {'message': 'Unsupported codec'}}
+        elif clock() >= ready_at[media_id]:
+            info = {'state': 'succeeded', 'progress_percent': 100}
+        else:
+            info = {'state': 'in_progress', 'check_after_secs': 5}
+        return MagicMock(processing_info=info)
+    api.get_media_upload_status.side_effect = status
+    return api
+
+
+class TestProcessing:
+    """Test waiting for server-side GIF and video processing."""
+
+    def test_sends_media_category(self, state_home, tmp_path):
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'abcd')
+        api = make_api()
+        chunked_upload(api, str(video))
+        assert api.chunked_upload_init.call_args.kwargs['media_category'] == 'tweet_video'
+        assert category_for('anim.gif') == 'tweet_gif' and category_for('shot.png') == 'tweet_image'
+
+    def test_waits_concurrently(self):
+        """Test that several media are polled together, each on its own schedule."""
+        clock = FakeClock()
+        api = status_api(clock, {'v1': 12, 'v2': 30})
+        pending = {media_id: {'state': 'pending', 'check_after_secs': 5} for media_id in ('v1', 'v2')}
+        assert wait_for_processing(api, pending, sleep=clock.sleep, clock=clock) == {}
+        # Both wait out check_after_secs, then back off; the total is the slowest, not the sum
+        assert [when for media_id, when in api.checks if media_id == 'v1'] == [5, 10, 15]
+        assert [when for media_id, when in api.checks if media_id == 'v2'] == [5, 10, 15, 23, 39]
+        assert clock.now == 39
+
+    def test_failure_and_timeout(self):
+        clock = FakeClock()
+        api = status_api(clock, {'bad': 0, 'slow': 10 ** 6}, failed={'bad'})
+        pending = {'bad': {'state': 'pending'}, 'slow': {'state': 'pending'},
+                   'ready': {'state': 'succeeded'}}
+        failures = wait_for_processing(api, pending, timeout=60, sleep=clock.sleep, clock=clock)
+        assert failures == {'bad': 'Unsupported codec', 'slow': 'Media still processing after 60s'}
+        assert clock.now <= 60
+
+    def test_check_delay(self):
+        assert check_delay({'check_after_secs': 5}, 0) == 5
+        assert check_delay({}, 3) == 8
+        assert check_delay({'check_after_secs': 1}, 10) == upload.MAX_CHECK_DELAY
+
+
+class TestChunkHelpers:
+    """Test chunk sizing and upload path selection."""
+
+    def test_chunk_size_respects_segment_limit(self):
+        """Test that large files get bigger chunks to stay under 1000 segments."""
+        assert chunk_size_for(10, 4) == 4
+        assert chunk_size_for(1500 * 1024 * 1024) > upload.CHUNK_SIZE
+        assert chunk_size_for(1500 * 1024 * 1024) * upload.MAX_SEGMENTS >= 1500 * 1024 * 1024
+
+    def test_needs_chunked_upload(self, tmp_path):
+        """Test that GIFs and videos always use the chunked path."""
+        small = tmp_path / 'small.png'
+        small.write_bytes(b'x')
+        gif = tmp_path / 'anim.gif'
+        gif.write_bytes(b'x')
+        assert not needs_chunked_upload(str(small))
+        assert needs_chunked_upload(str(gif))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,112 @@
+"""
+Tests for TermTweet credential verification
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termtweet import verify
+from termtweet.core import CREDENTIAL_KEYS, test_credentials as check_credentials
+
+CREDS = ('a' * 25, 'b' * 50, '1000-token', 'c' * 45, 'bearer')
+
+
+class TestVerify:
+    """Test the identity check and its cache."""
+
+    def test_verified_and_cached(self, mock_server):
+        mock = mock_server()
+        result = verify.verify(CREDS)
+        assert result['ok'] and not result['cached']
+        assert (result['user_id'], result['username'], result['access_level']) == ('1', 'mock', 'read-write')
+
+        assert verify.verify(CREDS)['cached']
+        assert mock.requests == {'GET /2/users/me': 1}
+        assert not verify.verify(CREDS, refresh=True)['cached']
+        assert mock.requests == {'GET /2/users/me': 2}
+
+    def test_cache_expires(self, mock_server):
+        mock_server()
+        verify.verify(CREDS)
+        assert verify.cached(CREDS) is not None
+        assert verify.cached(CREDS, now=verify.cached(CREDS)['expires_at']) is None
+
+    def test_rejected_credentials(self, mock_server):
+        mock_server(reject_credentials=True)
+        result = verify.verify(CREDS)
+        assert not result['ok'] and '401' in result['error']
+        assert verify.rejected(CREDS) == result['error']
+        # Other credentials are unaffected
+        assert verify.rejected(CREDS[:4] + ('other',)) is None
+
+    def test_read_only_token(self, mock_server):
+        mock_server(access_level='read')
+        result = verify.verify(CREDS)
+        assert not result['ok'] and 'read-only' in result['error']
+        assert verify.rejected(CREDS)
+
+    def test_server_errors_not_cached(self, mock_server):
+        mock_server(error_rate=1.0)
+        result = verify.verify(CREDS)
+        assert not result['ok'] and 'Could not reach' in result['error']
+        assert verify.cached(CREDS) is None
+
+
+class TestFailFast:
+    """Test that posting paths refuse known-bad credentials without an API call."""
+
+    def test_client_refuses_rejected_credentials(self, mock_server):
+        from termtweet.client import TermTweetClient
+
+        mock = mock_server(reject_credentials=True)
+        verify.verify(CREDS)
+        mock.requests.clear()
+        with TermTweetClient(*CREDS, media_cache=False) as client:
+            result = client.tweet("hello")
+        assert not result.ok and 'termtweet --test' in result.error
+        assert mock.requests == {}
+
+    def test_401_while_posting_is_remembered(self, mock_server):
+        from termtweet.client import TermTweetClient
+
+        mock = mock_server(reject_credentials=True)
+        with TermTweetClient(*CREDS, media_cache=False) as client:
+            assert not client.post("first").ok
+            assert client.rejected
+        with TermTweetClient(*CREDS, media_cache=False) as client:
+            assert not client.post("second").ok
+        assert mock.requests == {'POST /2/tweets': 1}
+
+    def test_401_from_one_shot_calls_is_remembered(self, mock_server, tmp_path):
+        from termtweet import core
+
+        mock_server(reject_credentials=True)
+        assert core.post_tweet(core.authenticate_twitter(*CREDS), "first") is None
+        assert '401' in verify.rejected(CREDS)
+
+        other = CREDS[:4] + ('other',)
+        image = tmp_path / 'shot.png'
+        image.write_bytes(b'png-bytes')
+        assert core.upload_media(*other[:4], str(image), bearer_token=other[4]) is None
+        assert '401' in verify.rejected(other)
+
+
+class TestCommand:
+    """Test the --test output."""
+
+    def test_reports_cached_check(self, mock_server, monkeypatch, capsys):
+        mock_server()
+        for key, value in zip(CREDENTIAL_KEYS, CREDS):
+            monkeypatch.setenv(key, value)
+        assert check_credentials() is True
+        assert "Authentication successful as @mock!" in capsys.readouterr().out
+        assert check_credentials() is True
+        assert "use --recheck" in capsys.readouterr().out
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
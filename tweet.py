@@ -13,6 +13,8 @@ except ImportError:
     sys.exit(1)
 from dotenv import load_dotenv
 
+from termtweet.text import MAX_TWEET_LENGTH, weighted_length
+
 def load_credentials():
     """Load Twitter API credentials from environment variables."""
     load_dotenv()
@@ -97,8 +99,8 @@ def main():
     tweet_text = sys.argv[1]
     image_path = sys.argv[2] if len(sys.argv) > 2 else None
 
-    # Validate tweet length
-    if len(tweet_text) > 280:
+    # Validate tweet length (links, CJK and emoji are weighted)
+    if weighted_length(tweet_text) > MAX_TWEET_LENGTH:
         print("Error: Tweet text exceeds 280 characters.")
         sys.exit(1)
 